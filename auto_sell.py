@@ -1,5 +1,5 @@
-import time 
-import autoit 
+from clock import get_clock 
+from input_backend import get_input_backend 
 
 class AutoSellManager :
 
@@ -35,11 +35,11 @@ class AutoSellManager :
             return False 
         try :
             item_x ,item_y =self .coordinates ['first_item']
-            autoit .mouse_move (item_x ,item_y ,self .move_speed )
-            time .sleep (self .click_delay )
-            autoit .mouse_click ('left')
+            get_input_backend ().mouse_move (item_x ,item_y ,self .move_speed )
+            get_clock ().sleep (self .click_delay )
+            get_input_backend ().mouse_click ('left')
             self .apply_mouse_delay ()
-            time .sleep (self .click_delay )
+            get_clock ().sleep (self .click_delay )
             return True 
         except Exception as e :
             print (f'Error clicking first item: {e }')
@@ -51,11 +51,11 @@ class AutoSellManager :
             return False 
         try :
             sell_x ,sell_y =self .coordinates ['sell_button']
-            autoit .mouse_move (sell_x ,sell_y ,self .move_speed )
-            time .sleep (self .click_delay )
-            autoit .mouse_click ('left')
+            get_input_backend ().mouse_move (sell_x ,sell_y ,self .move_speed )
+            get_clock ().sleep (self .click_delay )
+            get_input_backend ().mouse_click ('left')
             self .apply_mouse_delay ()
-            time .sleep (self .click_delay )
+            get_clock ().sleep (self .click_delay )
             return True 
         except Exception as e :
             print (f'Error clicking sell button: {e }')
@@ -67,11 +67,11 @@ class AutoSellManager :
             return False 
         try :
             confirm_x ,confirm_y =self .coordinates ['confirm_button']
-            autoit .mouse_move (confirm_x ,confirm_y ,self .move_speed )
-            time .sleep (self .click_delay )
-            autoit .mouse_click ('left')
+            get_input_backend ().mouse_move (confirm_x ,confirm_y ,self .move_speed )
+            get_clock ().sleep (self .click_delay )
+            get_input_backend ().mouse_click ('left')
             self .apply_mouse_delay ()
-            time .sleep (self .click_delay )
+            get_clock ().sleep (self .click_delay )
             return True 
         except Exception as e :
             print (f'Error clicking confirm button: {e }')
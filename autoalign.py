@@ -1,31 +1,32 @@
-import autoit 
-import time 
+from clock import get_clock 
 from screeninfo import get_monitors 
+from input_backend import get_input_backend 
 
 def auto_align_camera (delay =2 ,emergency_stop_check =None ):
     for _ in range (int (delay *10 )):
         if emergency_stop_check and emergency_stop_check ():
             return 
-        time .sleep (0.1 )
+        get_clock ().sleep (0.1 )
     if emergency_stop_check and emergency_stop_check ():
         return 
-    if autoit .win_exists ('Roblox'):
-        autoit .win_activate ('Roblox')
-        time .sleep (0.3 )
+    backend =get_input_backend ()
+    if backend .win_exists ('Roblox'):
+        backend .win_activate ('Roblox')
+        get_clock ().sleep (0.3 )
     else :
         return 
     if emergency_stop_check and emergency_stop_check ():
         return 
-    autoit .send ('{ESC}')
-    time .sleep (1.0 )
+    backend .send ('{ESC}')
+    get_clock ().sleep (1.0 )
     if emergency_stop_check and emergency_stop_check ():
         return 
-    autoit .send ('r')
-    time .sleep (2.0 )
+    backend .send ('r')
+    get_clock ().sleep (2.0 )
     if emergency_stop_check and emergency_stop_check ():
         return 
-    autoit .send ('{ENTER}')
-    time .sleep (0.5 )
+    backend .send ('{ENTER}')
+    get_clock ().sleep (0.5 )
     if emergency_stop_check and emergency_stop_check ():
         return 
     try :
@@ -37,27 +38,27 @@ def auto_align_camera (delay =2 ,emergency_stop_check =None ):
     center_x =screen_width //2 
     start_y =int (screen_height *0.2 )
     end_y =int (screen_height *0.8 )
-    autoit .mouse_move (x =center_x ,y =start_y ,speed =0 )
-    time .sleep (0.1 )
+    backend .mouse_move (x =center_x ,y =start_y ,speed =0 )
+    get_clock ().sleep (0.1 )
     if emergency_stop_check and emergency_stop_check ():
         return 
-    autoit .mouse_down ('right')
-    time .sleep (0.1 )
+    backend .mouse_down ('right')
+    get_clock ().sleep (0.1 )
     if emergency_stop_check and emergency_stop_check ():
-        autoit .mouse_up ('right')
+        backend .mouse_up ('right')
         return 
-    autoit .mouse_move (x =center_x ,y =end_y ,speed =10 )
-    time .sleep (0.1 )
-    autoit .mouse_up ('right')
+    backend .mouse_move (x =center_x ,y =end_y ,speed =10 )
+    get_clock ().sleep (0.1 )
+    backend .mouse_up ('right')
     if emergency_stop_check and emergency_stop_check ():
         return 
-    time .sleep (0.15 )
+    get_clock ().sleep (0.15 )
     if emergency_stop_check and emergency_stop_check ():
         return 
-    autoit .mouse_wheel ('up',10 )
-    time .sleep (0.15 )
+    backend .mouse_wheel ('up',10 )
+    get_clock ().sleep (0.15 )
     if emergency_stop_check and emergency_stop_check ():
         return 
-    autoit .mouse_wheel ('down',10 )
+    backend .mouse_wheel ('down',10 )
 if __name__ =='__main__':
     auto_align_camera ()
\ No newline at end of file
@@ -0,0 +1,312 @@
+from collections import OrderedDict, deque, namedtuple
+
+import numpy as np
+
+
+MAX_SCRATCH_SHAPES = 4
+
+
+def remember_shape(cache, shape, buffers):
+    # The reel loop alternates between the search window and full-strip fallbacks, so a few shapes are kept at once.
+    if len(cache) >= MAX_SCRATCH_SHAPES:
+        cache.popitem(last=False)
+    cache[shape] = buffers
+
+
+class ColorMatcher:
+
+    def __init__(self, target_color, tolerance):
+        self.target_color = tuple(int(c) for c in target_color[:3])
+        self.tolerance = int(tolerance)
+
+    def match(self, pixels):
+        raise NotImplementedError
+
+    def first_match(self, pixels):
+        mask = self.match(pixels)
+        index = int(mask.argmax())
+        if not mask.flat[index]:
+            return None
+        row, col = divmod(index, mask.shape[1])
+        return (col, row)
+
+
+class PackedColorMatcher(ColorMatcher):
+
+    def __init__(self, target_color, tolerance):
+        super().__init__(target_color, tolerance)
+        lower = [max(c - self.tolerance, 0) for c in self.target_color]
+        upper = [min(c + self.tolerance, 255) for c in self.target_color]
+        self.lower = np.array(lower, dtype=np.uint8)
+        self.span = np.array([hi - lo for lo, hi in zip(lower, upper)], dtype=np.uint8)
+        self._scratch = OrderedDict()
+
+    def _buffers(self, height, width):
+        scratch = self._scratch.get((height, width))
+        if scratch is None:
+            count = height * width
+            flags = np.zeros(count * 3 + 1, dtype=np.uint8)
+            scratch = (np.tile(self.lower, count), np.tile(self.span, count), np.empty(count * 3, dtype=np.uint8), flags, np.ndarray(shape=(count,), dtype='<u4', buffer=flags, strides=(3,)), np.empty(count, dtype='<u4'), np.empty((height, width), dtype=bool), np.empty((height, width, 3), dtype=np.uint8))
+            remember_shape(self._scratch, (height, width), scratch)
+        else:
+            self._scratch.move_to_end((height, width))
+        return scratch
+
+    def match(self, pixels):
+        height, width = pixels.shape[0], pixels.shape[1]
+        lower_tiled, span_tiled, offsets, flags, words, packed, mask, contiguous = self._buffers(height, width)
+        if pixels.shape[2] != 3 or not pixels.flags.c_contiguous:
+            np.copyto(contiguous, pixels[:, :, :3])
+            pixels = contiguous
+        # Subtracting the lower bound with uint8 wraparound turns lo <= p <= hi into a single
+        # p - lo <= hi - lo test per byte; the three per-channel flags of a pixel are then read
+        # back as one packed 24-bit word and compared against 0x010101.
+        np.subtract(pixels.reshape(-1), lower_tiled, out=offsets)
+        np.less_equal(offsets, span_tiled, out=flags[:-1].view(bool))
+        np.bitwise_and(words, 0x00FFFFFF, out=packed)
+        np.equal(packed.reshape(height, width), 0x010101, out=mask)
+        return mask
+
+
+class LutColorMatcher(ColorMatcher):
+
+    def __init__(self, target_color, tolerance):
+        super().__init__(target_color, tolerance)
+        values = np.arange(256, dtype=np.int16)
+        self.luts = [np.abs(values - channel) <= self.tolerance for channel in self.target_color]
+        self._scratch = OrderedDict()
+
+    def _buffers(self, height, width):
+        scratch = self._scratch.get((height, width))
+        if scratch is None:
+            scratch = (np.empty((height, width), dtype=bool), np.empty((height, width), dtype=bool))
+            remember_shape(self._scratch, (height, width), scratch)
+        else:
+            self._scratch.move_to_end((height, width))
+        return scratch
+
+    def match(self, pixels):
+        mask, channel = self._buffers(pixels.shape[0], pixels.shape[1])
+        lut_r, lut_g, lut_b = self.luts
+        np.take(lut_r, pixels[:, :, 0], out=mask, mode='clip')
+        np.take(lut_g, pixels[:, :, 1], out=channel, mode='clip')
+        np.logical_and(mask, channel, out=mask)
+        np.take(lut_b, pixels[:, :, 2], out=channel, mode='clip')
+        np.logical_and(mask, channel, out=mask)
+        return mask
+
+
+COLOR_MATCHERS = {'packed': PackedColorMatcher, 'lut': LutColorMatcher}
+
+
+def create_color_matcher(target_color, tolerance, method='packed'):
+    return COLOR_MATCHERS.get(method, PackedColorMatcher)(target_color, tolerance)
+
+
+def fit_line(samples):
+    # Least-squares fit over (time, position) samples: the velocity, and the fitted position at the newest sample.
+    if not samples:
+        return 0.0, None
+    times = [t for t, _ in samples]
+    positions = [p for _, p in samples]
+    mean_t = sum(times) / len(times)
+    mean_p = sum(positions) / len(positions)
+    spread = sum((t - mean_t) ** 2 for t in times)
+    if spread <= 0:
+        return 0.0, positions[-1]
+    slope = sum((t - mean_t) * (p - mean_p) for t, p in zip(times, positions)) / spread
+    return slope, mean_p + slope * (times[-1] - mean_t)
+
+
+BarState = namedtuple('BarState', ['found', 'left', 'right', 'center', 'width', 'velocity', 'timestamp'])
+
+
+class BarTracker:
+
+    def __init__(self, matcher=None, history_size=6, max_history_gap=0.25):
+        self.matcher = matcher
+        self.history = deque(maxlen=max(2, int(history_size)))
+        self.max_history_gap = max_history_gap
+        self.last_state = None
+        self.last_mask = None
+        self._columns = None
+        self._positions = None
+
+    def set_matcher(self, matcher):
+        self.matcher = matcher
+        self.reset()
+
+    def reset(self):
+        self.history.clear()
+        self.last_state = None
+
+    def _column_buffers(self, width):
+        if self._columns is None or self._columns.shape[0] != width:
+            self._columns = np.empty(width, dtype=bool)
+            self._positions = np.arange(width, dtype=np.float64)
+        return (self._columns, self._positions)
+
+    def estimate_velocity(self):
+        return fit_line(self.history)[0]
+
+    def measure(self, pixels, origin_x):
+        mask = self.matcher.match(pixels)
+        self.last_mask = mask
+        columns, positions = self._column_buffers(mask.shape[1])
+        np.any(mask, axis=0, out=columns)
+        left = int(columns.argmax())
+        if not columns[left]:
+            return None
+        right = columns.shape[0] - 1 - int(columns[::-1].argmax())
+        count = int(np.count_nonzero(columns[left:right + 1]))
+        center = origin_x + float(np.dot(columns[left:right + 1], positions[left:right + 1])) / count
+        return (origin_x + left, origin_x + right, center)
+
+    def record(self, measurement, timestamp):
+        if measurement is None:
+            self.last_state = BarState(False, None, None, None, 0, self.estimate_velocity(), timestamp)
+            return self.last_state
+        left, right, center = measurement
+        if self.history and timestamp - self.history[-1][0] > self.max_history_gap:
+            self.history.clear()
+        self.history.append((timestamp, center))
+        self.last_state = BarState(True, left, right, center, right - left + 1, self.estimate_velocity(), timestamp)
+        return self.last_state
+
+    def update(self, pixels, origin_x, timestamp):
+        return self.record(self.measure(pixels, origin_x), timestamp)
+
+
+class BarSearchWindow:
+
+    def __init__(self, margin=48, max_lookahead=0.1, step=32):
+        self.margin = int(margin)
+        self.max_lookahead = max_lookahead
+        self.step = max(1, int(step))
+        self.width = 0
+        self.window_scans = 0
+        self.full_scans = 0
+        self.fallbacks = 0
+
+    def region(self, strip, last_state, now):
+        x1, y1, x2, y2 = strip
+        if last_state is None or not last_state.found:
+            self.full_scans += 1
+            return strip
+        travel = last_state.velocity * min(max(now - last_state.timestamp, 0.0), self.max_lookahead)
+        left = int(last_state.left + min(travel, 0.0)) - self.margin
+        right = int(last_state.right + max(travel, 0.0)) + 1 + self.margin
+        # The width only grows in whole steps, so the frame ring and colour matcher keep reusing one buffer shape.
+        needed = -(-(right - left) // self.step) * self.step
+        self.width = max(self.width, needed)
+        if self.width >= x2 - x1:
+            self.full_scans += 1
+            return strip
+        left -= (self.width - (right - left)) // 2
+        left = min(max(left, x1), x2 - self.width)
+        self.window_scans += 1
+        return (left, y1, left + self.width, y2)
+
+    def needs_full_scan(self, measurement, window, strip):
+        if window[0] == strip[0] and window[2] == strip[2]:
+            return False
+        if measurement is None:
+            return True
+        left, right, _ = measurement
+        clipped_left = left <= window[0] and window[0] > strip[0]
+        clipped_right = right >= window[2] - 1 and window[2] < strip[2]
+        return clipped_left or clipped_right
+
+
+class ReelStripSampler:
+
+    def __init__(self, rows=2, verify_interval=0.5):
+        self.rows = max(1, int(rows))
+        self.verify_interval = verify_interval
+        self.band = None
+        self.last_verified = float('-inf')
+        self.last_miss_check = float('-inf')
+        self.reselections = 0
+
+    def reset(self):
+        self.band = None
+        self.last_verified = float('-inf')
+        self.last_miss_check = float('-inf')
+
+    def select_band(self, mask, now):
+        self.last_verified = now
+        columns = mask.any(axis=0)
+        if not columns.any():
+            return self.band
+        # Rows whose match profile agrees with the whole strip separate bar and background best.
+        agreement = np.count_nonzero(mask == columns, axis=1)
+        count = min(self.rows, mask.shape[0])
+        totals = np.convolve(agreement, np.ones(count, dtype=np.int64), mode='valid')
+        band = (int(totals.argmax()), count)
+        if band != self.band:
+            self.reselections += 1
+        self.band = band
+        return band
+
+    def verification_due(self, now):
+        return self.band is None or now - self.last_verified >= self.verify_interval
+
+    def apply(self, region, strip):
+        offset, count = self.band
+        top = strip[1] + offset
+        return (region[0], top, region[2], min(top + count, strip[3]))
+
+    def allow_miss_check(self, now):
+        if now - self.last_miss_check < self.verify_interval / 4:
+            return False
+        self.last_miss_check = now
+        return True
+
+
+class ReelCompletionDetector:
+
+    def __init__(self, check_interval=0.1, bar_absent_timeout=5.0, max_duration=9.0, panel_tolerance=40, panel_fraction=0.5):
+        self.check_interval = check_interval
+        self.bar_absent_timeout = bar_absent_timeout
+        self.max_duration = max_duration
+        self.panel_tolerance = panel_tolerance
+        self.panel_fraction = panel_fraction
+        self.start(0.0)
+
+    def start(self, now):
+        self.started = now
+        self.next_check = now
+        self.bar_seen_at = now
+        self.panel_baseline = None
+        self.reason = None
+
+    def checks_due(self, now):
+        return now >= self.next_check
+
+    def panel_changed(self, pixels):
+        row = pixels.reshape(-1, pixels.shape[-1])[:, :3].astype(np.int16)
+        if self.panel_baseline is None or self.panel_baseline.shape != row.shape:
+            self.panel_baseline = row
+            return False
+        changed = np.abs(row - self.panel_baseline).max(axis=1) > self.panel_tolerance
+        return float(changed.mean()) >= self.panel_fraction
+
+    def _finish(self, reason):
+        self.reason = reason
+        return reason
+
+    def update(self, now, bar_found, border_white=None, panel_pixels=None):
+        if bar_found:
+            self.bar_seen_at = now
+        if border_white is not None or panel_pixels is not None:
+            self.next_check = now + self.check_interval
+        if border_white:
+            return self._finish('border')
+        # The panel row is only trusted once the bar is gone, so scenery moving behind it mid-game cannot end the reel.
+        if panel_pixels is not None and self.panel_changed(panel_pixels) and not bar_found:
+            return self._finish('panel')
+        if now - self.bar_seen_at >= self.bar_absent_timeout:
+            return self._finish('bar_absent')
+        if now - self.started >= self.max_duration:
+            return self._finish('timeout')
+        return None
@@ -0,0 +1,57 @@
+import argparse
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bar_detection import LutColorMatcher, PackedColorMatcher
+
+STRIP_SIZES = {'1920x1080': (22, 406), '2560x1440': (26, 473), '3840x2160': (33, 626)}
+
+
+def legacy_search(img_array, target_color, tolerance):
+    target_r, target_g, target_b = target_color[:3]
+    r_diff = np.abs(img_array[:, :, 0].astype(np.int16) - target_r) <= tolerance
+    g_diff = np.abs(img_array[:, :, 1].astype(np.int16) - target_g) <= tolerance
+    b_diff = np.abs(img_array[:, :, 2].astype(np.int16) - target_b) <= tolerance
+    matches = r_diff & g_diff & b_diff
+    match_coords = np.where(matches)
+    if len(match_coords[0]) > 0:
+        return (match_coords[1][0], match_coords[0][0])
+    return None
+
+
+def make_strip(height, width, bar_color, rng):
+    strip = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+    bar_left = width // 3
+    strip[:, bar_left:bar_left + width // 8] = bar_color
+    return strip
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare reel bar colour matchers')
+    parser.add_argument('--number', type=int, default=2000)
+    parser.add_argument('--tolerance', type=int, default=5)
+    args = parser.parse_args()
+    rng = np.random.default_rng(0)
+    bar_color = (92, 164, 212)
+    print(f"{'strip':<12}{'legacy us':>12}{'lut us':>12}{'packed us':>12}{'speedup':>10}")
+    for name, (height, width) in STRIP_SIZES.items():
+        strip = make_strip(height, width, bar_color, rng)
+        lut_matcher = LutColorMatcher(bar_color, args.tolerance)
+        packed_matcher = PackedColorMatcher(bar_color, args.tolerance)
+        expected = legacy_search(strip, bar_color, args.tolerance)
+        assert lut_matcher.first_match(strip) == expected
+        assert packed_matcher.first_match(strip) == expected
+        legacy = timeit.timeit(lambda: legacy_search(strip, bar_color, args.tolerance), number=args.number)
+        lut = timeit.timeit(lambda: lut_matcher.first_match(strip), number=args.number)
+        packed = timeit.timeit(lambda: packed_matcher.first_match(strip), number=args.number)
+        scale = 1e6 / args.number
+        print(f'{name:<12}{legacy * scale:>12.1f}{lut * scale:>12.1f}{packed * scale:>12.1f}{legacy / packed:>9.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reel_control import REEL_CONTROLLERS, create_reel_controller
+from reel_simulator import load_calibration_coordinates, run_game
+
+
+def play(job):
+    controller, tolerance, seed, options = job
+    return run_game(create_reel_controller(controller), seed, tolerance=tolerance, **options)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare reel controllers on the headless reel simulator')
+    parser.add_argument('--games', type=int, default=500)
+    parser.add_argument('--controllers', default=','.join(REEL_CONTROLLERS))
+    parser.add_argument('--tolerances', default='5')
+    parser.add_argument('--calibration', help='fishscopeconfig.json to take reel coordinates from')
+    parser.add_argument('--tick-rate', type=float, default=60.0)
+    parser.add_argument('--capture-latency', type=float, default=0.01)
+    parser.add_argument('--input-latency', type=float, default=0.03)
+    parser.add_argument('--visible-when', choices=['in_zone', 'always'], default='in_zone')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+    options = {'coordinates': load_calibration_coordinates(args.calibration), 'tick_rate': args.tick_rate, 'capture_latency': args.capture_latency, 'input_latency': args.input_latency, 'visible_when': args.visible_when}
+    print(f"{'controller':<15}{'tol':>5}{'won':>8}{'lost':>8}{'timeout':>9}{'win s':>8}{'clicks':>8}{'games/min':>11}")
+    with multiprocessing.Pool(max(1, args.jobs)) as pool:
+        for controller in args.controllers.split(','):
+            for tolerance in (int(t) for t in args.tolerances.split(',')):
+                jobs = [(controller, tolerance, seed, options) for seed in range(args.games)]
+                start = time.perf_counter()
+                results = pool.map(play, jobs, chunksize=max(1, args.games // (4 * max(1, args.jobs))))
+                elapsed = time.perf_counter() - start
+                outcomes = Counter(r['result'] for r in results)
+                wins = [r['duration'] for r in results if r['result'] == 'won']
+                win_time = sum(wins) / len(wins) if wins else 0.0
+                clicks = sum(r['clicks'] for r in results) / len(results)
+                share = lambda key: 100.0 * outcomes[key] / len(results)
+                print(f"{controller:<15}{tolerance:>5}{share('won'):>7.1f}%{share('lost'):>7.1f}%{share('timeout'):>8.1f}%{win_time:>8.2f}{clicks:>8.1f}{len(results) / elapsed * 60:>11.0f}")
+
+
+if __name__ == '__main__':
+    main()
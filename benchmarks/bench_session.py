@@ -0,0 +1,70 @@
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from session_simulator import run_session
+
+
+def parse_setting(text):
+    key, _, value = text.partition('=')
+    try:
+        return key, json.loads(value)
+    except ValueError:
+        return key, value
+
+
+def play(job):
+    seed, options = job
+    return run_session(seed=seed, **options)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the full macro loop against a simulated game and report throughput')
+    parser.add_argument('--hours', type=float, default=1.0, help='simulated hours per session')
+    parser.add_argument('--sessions', type=int, default=1)
+    parser.add_argument('--calibration', help='fishscopeconfig.json to run the session with')
+    parser.add_argument('--set', action='append', default=[], metavar='KEY=VALUE', help='override a MouseAutomation attribute, e.g. --set reel_controller=predictive')
+    parser.add_argument('--bite-time', type=float, nargs=2, default=(1.5, 8.0), metavar=('MIN', 'MAX'))
+    parser.add_argument('--soft-lock-rate', type=float, default=0.02)
+    parser.add_argument('--capture-latency', type=float, default=0.004)
+    parser.add_argument('--input-latency', type=float, default=0.03)
+    parser.add_argument('--visible-when', choices=['in_zone', 'always'], default='in_zone')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--verbose', action='store_true', help='show the macro log (single session only)')
+    args = parser.parse_args()
+    game_options = {'bite_time': tuple(args.bite_time), 'soft_lock_rate': args.soft_lock_rate, 'capture_latency': args.capture_latency, 'input_latency': args.input_latency, 'visible_when': args.visible_when}
+    options = {'hours': args.hours, 'settings': dict(parse_setting(s) for s in args.set), 'game_options': game_options, 'config_file': args.calibration, 'verbose': args.verbose and args.sessions == 1}
+    jobs = [(seed, options) for seed in range(args.sessions)]
+    if args.sessions == 1:
+        results = [play(jobs[0])]
+    else:
+        with multiprocessing.Pool(max(1, min(args.jobs, args.sessions))) as pool:
+            results = pool.map(play, jobs)
+    hours = sum(r['hours'] for r in results)
+    totals = {key: sum(r['stats'][key] for r in results) for key in results[0]['stats']}
+    failsafes = sum(r['failsafes'] for r in results)
+    sells = sum(r['sells'] for r in results)
+    stage_time = {}
+    phase_time = {}
+    for r in results:
+        for stage, share in r['stage_share'].items():
+            stage_time[stage] = stage_time.get(stage, 0.0) + share * r['hours']
+        for phase, share in r['phase_share'].items():
+            phase_time[phase] = phase_time.get(phase, 0.0) + share * r['hours']
+    sell_hours = sum(stage_time.get(stage, 0.0) for stage in ('pre_sell', 'selling', 'post_sell'))
+    wall = sum(r['wall_seconds'] for r in results)
+    print(f"{len(results)} session(s), {hours:.2f} simulated hours in {wall:.1f}s of CPU")
+    print(f"fish/hour        {totals['won'] / hours:8.1f}   ({totals['won']} caught of {totals['bites']} bites, {totals['lost']} lost, {totals['timeout']} timed out)")
+    print(f"failsafe rate    {100.0 * failsafes / max(totals['casts'], 1):7.2f}%   ({failsafes} failsafes, {totals['soft_locks']} soft locks, {totals['casts']} casts)")
+    print(f"sell overhead    {100.0 * sell_hours / hours:7.2f}%   ({sells} sells, {sell_hours * 3600 / sells if sells else 0.0:.1f}s each)")
+    print('time share per phase:')
+    for phase, seconds in sorted(phase_time.items(), key=lambda item: -item[1]):
+        print(f"  {phase:<16}{100.0 * seconds / hours:7.2f}%")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+import argparse
+import os
+import re
+import sys
+import time
+
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from glyph_recognizer import GlyphAtlas, GlyphRecognizer
+from ocr_preprocess import OCR_CHANNELS, OcrPreprocessor
+
+
+def capture_label(path):
+    # "Shiny Salmon.png", "Shiny Salmon (2).png" and "Shiny Salmon_2.png" are all labelled "Shiny Salmon".
+    name = os.path.splitext(os.path.basename(path))[0]
+    return re.sub(r'(\s*\(\d+\)|_\d+)$', '', name).strip()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build a glyph template atlas from catch panel captures named after the text they show')
+    parser.add_argument('captures', nargs='+', help='PNG captures of the fish_caught_desc region')
+    parser.add_argument('--out', default='glyph_atlas.json')
+    parser.add_argument('--update', action='store_true', help='add to an existing atlas instead of starting a new one')
+    parser.add_argument('--channel', choices=OCR_CHANNELS, default='luma')
+    parser.add_argument('--threshold', default='auto')
+    args = parser.parse_args()
+    atlas = GlyphAtlas.load(args.out) if args.update else GlyphAtlas()
+    recognizer = GlyphRecognizer(atlas, OcrPreprocessor(args.channel, args.threshold, scale=1, padding=0))
+    samples = [(np.asarray(Image.open(path).convert('RGB')), capture_label(path)) for path in args.captures]
+    skipped = [label for pixels, label in samples if not recognizer.learn(pixels, label)]
+    for label in skipped:
+        print(f'Skipped {label}: glyph count does not match the label')
+    atlas.save(args.out)
+    print(f'{len(atlas)} templates for {len(set(atlas.chars))} characters written to {args.out}')
+    correct = 0
+    timings = []
+    for pixels, label in samples:
+        started = time.perf_counter()
+        text, confidence = recognizer.recognize(pixels)
+        timings.append(time.perf_counter() - started)
+        correct += text == label
+        if text != label:
+            print(f'Misread {label!r} as {text!r} (confidence {confidence:.2f})')
+    print(f'{correct}/{len(samples)} captures read back correctly, {np.mean(timings) * 1000:.2f} ms mean, {max(timings) * 1000:.2f} ms max')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,33 @@
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from latency_histogram import LATENCY_STAGES, dump_histograms, load_histograms, merge_histograms
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare and merge latency_histograms.json files from different sessions or machines')
+    parser.add_argument('files', nargs='+')
+    parser.add_argument('--merge', metavar='OUT', help='write the merged histograms of all files to OUT')
+    args = parser.parse_args()
+    merged = {}
+    print(f"{'file':<28}{'stage':<10}{'count':>9}{'mean':>9}{'p50':>9}{'p90':>9}{'p99':>9}{'p99.9':>9}{'max':>9}  (ms)")
+    for path in args.files:
+        with open(path, 'r') as f:
+            label = json.load(f).get('machine') or os.path.basename(path)
+        histograms = load_histograms(path)
+        stages = [stage for stage in LATENCY_STAGES if stage in histograms] + sorted(set(histograms) - set(LATENCY_STAGES))
+        for stage in stages:
+            s = histograms[stage].summary()
+            print(f"{label[:27]:<28}{stage:<10}{s['count']:>9}{s['mean_ms']:>9.2f}{s['p50_ms']:>9.2f}{s['p90_ms']:>9.2f}{s['p99_ms']:>9.2f}{s['p999_ms']:>9.2f}{s['max_ms']:>9.2f}")
+        merge_histograms(merged, histograms)
+    if args.merge:
+        dump_histograms(merged, args.merge, machine='merged', sources=args.files)
+        print(f'Merged histograms written to {args.merge}')
+
+
+if __name__ == '__main__':
+    main()
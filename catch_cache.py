@@ -0,0 +1,127 @@
+import json
+import os
+from collections import OrderedDict
+
+import numpy as np
+
+from ocr_preprocess import OcrPreprocessor
+
+HASH_SHAPE = (12, 48)
+
+
+def block_means(mask, rows, cols):
+    height, width = mask.shape
+    ys = np.arange(rows) * height // rows
+    xs = np.arange(cols) * width // cols
+    sums = np.add.reduceat(np.add.reduceat(mask.astype(np.float32), ys, axis=0), xs, axis=1)
+    counts = np.diff(np.append(ys, height))[:, None] * np.diff(np.append(xs, width))[None, :]
+    return sums / np.maximum(counts, 1)
+
+
+def text_hash(mask, shape=HASH_SHAPE):
+    # Average hash of the text bounding box, so where the name sits in the panel does not matter.
+    rows = np.flatnonzero(mask.any(axis=1))
+    cols = np.flatnonzero(mask.any(axis=0))
+    if not rows.size or not cols.size:
+        return None
+    mask = mask[rows[0]:rows[-1] + 1, cols[0]:cols[-1] + 1]
+    means = block_means(mask, *shape)
+    bits = (means > means.mean()).ravel()
+    return int.from_bytes(np.packbits(bits).tobytes(), 'big'), mask.shape[1] / mask.shape[0]
+
+
+def hamming(a, b):
+    return bin(a ^ b).count('1')
+
+
+class CatchCache:
+
+    def __init__(self, capacity=512, max_distance=0.04, max_aspect_change=0.06, hash_shape=HASH_SHAPE, preprocessor=None):
+        self.capacity = capacity
+        self.hash_shape = tuple(hash_shape)
+        self.bits = self.hash_shape[0] * self.hash_shape[1]
+        self.max_distance = int(max_distance * self.bits)
+        self.max_aspect_change = max_aspect_change
+        self.preprocessor = preprocessor or OcrPreprocessor(scale=1, padding=0)
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.dirty = False
+
+    def __len__(self):
+        return len(self.entries)
+
+    def key(self, pixels):
+        return text_hash(self.preprocessor.text_mask(pixels), self.hash_shape)
+
+    def nearest(self, key):
+        value, aspect = key
+        best = None
+        best_distance = self.max_distance + 1
+        for stored, entry in self.entries.items():
+            if abs(entry['aspect'] - aspect) > self.max_aspect_change * aspect:
+                continue
+            distance = hamming(stored, value)
+            if distance < best_distance:
+                best, best_distance = stored, distance
+        return best
+
+    def lookup(self, key, valid=None):
+        stored = self.nearest(key) if key else None
+        if stored is not None and valid is not None and not valid(self.entries[stored]['result']):
+            # Fish data changed since this entry was written.
+            del self.entries[stored]
+            self.dirty = True
+            stored = None
+        if stored is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(stored)
+        self.hits += 1
+        return self.entries[stored]['result']
+
+    def store(self, key, result):
+        if not key:
+            return
+        value, aspect = key
+        stored = self.nearest(key)
+        if stored is not None and self.entries[stored]['result'] == tuple(result):
+            self.entries.move_to_end(stored)
+            return
+        if stored is not None:
+            # A near-identical crop that resolved differently means the old entry was wrong.
+            del self.entries[stored]
+        self.entries[value] = {'aspect': aspect, 'result': tuple(result)}
+        while len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+        self.dirty = True
+
+    def signature(self):
+        return {'hash_shape': list(self.hash_shape), 'channel': self.preprocessor.channel, 'threshold': self.preprocessor.threshold, 'denoise': self.preprocessor.denoise}
+
+    def save(self, path):
+        # Oldest first, so loading the list back restores the LRU order.
+        data = self.signature()
+        data['entries'] = [{'hash': format(value, 'x'), 'aspect': round(entry['aspect'], 4), 'fish_name': entry['result'][0], 'mutation': entry['result'][1]} for value, entry in self.entries.items()]
+        with open(path, 'w') as f:
+            json.dump(data, f)
+        self.dirty = False
+
+    def load(self, path):
+        if not os.path.exists(path):
+            return False
+        with open(path, 'r') as f:
+            data = json.load(f)
+        if {key: data.get(key) for key in self.signature()} != self.signature():
+            # Hashes taken with other preprocessing settings cannot be compared with new ones.
+            return False
+        self.entries.clear()
+        for entry in data.get('entries', [])[-self.capacity:]:
+            self.entries[int(entry['hash'], 16)] = {'aspect': float(entry['aspect']), 'result': (entry['fish_name'], entry.get('mutation'))}
+        self.dirty = False
+        return True
+
+    def summary_line(self):
+        total = self.hits + self.misses
+        rate = self.hits / total * 100 if total else 0.0
+        return f'{self.hits}/{total} catches served from cache ({rate:.0f}%) | {len(self.entries)}/{self.capacity} entries'
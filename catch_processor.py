@@ -0,0 +1,142 @@
+import threading
+from collections import deque, namedtuple
+
+from clock import get_clock
+
+CatchJob = namedtuple('CatchJob', ['image', 'context', 'queued_at'])
+
+
+class CatchProcessor:
+
+    def __init__(self, handler, synchronous=False, max_pending=16, clock=None):
+        self.handler = handler
+        self.synchronous = synchronous
+        self._clock = clock
+        self.max_pending = max(1, int(max_pending))
+        self._queue = deque()
+        self._wake = threading.Event()
+        self._submitted = 0
+        self._completed = 0
+        self._stopping = False
+        self._thread = None
+        self._lock = threading.Lock()
+        self.last_result = None
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.processed = 0
+        self.dropped = 0
+        self.errors = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.total_duration = 0.0
+        self.max_duration = 0.0
+
+    def clock(self):
+        return self._clock() if self._clock is not None else get_clock().perf_counter()
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        with self._lock:
+            self._stopping = False
+            # A worker still finishing a catch after stop() is kept on, so there is never a second one running the handler.
+            if self.running:
+                self._wake.set()
+                return
+            self._thread = threading.Thread(target=self._run, name='CatchProcessor', daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=5.0):
+        # Catches already queued are still worth a webhook, so give the worker a chance to drain first.
+        self.flush(timeout)
+        with self._lock:
+            self._stopping = True
+            thread = self._thread
+        self._wake.set()
+        if thread is not None:
+            thread.join(timeout=1.0)
+            if thread.is_alive():
+                print('Catch processor is still busy with a catch and will stop once it finishes')
+        unprocessed = 0
+        while True:
+            try:
+                self._queue.popleft()
+            except IndexError:
+                break
+            unprocessed += 1
+        # Discarded catches never complete, while one still being handled will.
+        self._submitted -= unprocessed
+        if unprocessed:
+            print(f'Catch processor stopped with {unprocessed} unprocessed catches')
+
+    def submit(self, image, context=None):
+        job = CatchJob(image, context or {}, self.clock())
+        if self.synchronous:
+            self._execute(job)
+            return job
+        if not self.running:
+            self.start()
+        if len(self._queue) >= self.max_pending:
+            self.dropped += 1
+            print('Catch processor is falling behind, dropping catch')
+            return None
+        self._submitted += 1
+        self._queue.append(job)
+        self._wake.set()
+        return job
+
+    def flush(self, timeout=5.0):
+        clock = get_clock()
+        deadline = clock.perf_counter() + timeout
+        while self.running and self._completed < self._submitted:
+            if clock.perf_counter() >= deadline:
+                return False
+            clock.sleep(0.01)
+        return True
+
+    def pending(self):
+        return len(self._queue)
+
+    def _execute(self, job):
+        started = self.clock()
+        try:
+            self.last_result = self.handler(job.image, job.context)
+        except Exception as e:
+            self.errors += 1
+            print(f'Error processing catch: {e}')
+        finished = self.clock()
+        wait = started - job.queued_at
+        duration = finished - started
+        self.processed += 1
+        self.total_wait += wait
+        self.total_duration += duration
+        self.max_wait = max(self.max_wait, wait)
+        self.max_duration = max(self.max_duration, duration)
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if self._stopping:
+                    self._thread = None
+                    return
+            self._wake.wait()
+            self._wake.clear()
+            while self._queue and not self._stopping:
+                try:
+                    job = self._queue.popleft()
+                except IndexError:
+                    break
+                self._execute(job)
+                self._completed += 1
+
+    def summary(self):
+        count = max(self.processed, 1)
+        return {'processed': self.processed, 'pending': self.pending(), 'dropped': self.dropped, 'errors': self.errors, 'wait_mean_ms': self.total_wait / count * 1000.0, 'wait_max_ms': self.max_wait * 1000.0, 'duration_mean_ms': self.total_duration / count * 1000.0, 'duration_max_ms': self.max_duration * 1000.0}
+
+    def summary_line(self):
+        s = self.summary()
+        mode = 'sync' if self.synchronous else 'async'
+        return f"{s['processed']} catches ({mode}) | queue wait {s['wait_mean_ms']:.0f}/{s['wait_max_ms']:.0f} ms | processing {s['duration_mean_ms']:.0f}/{s['duration_max_ms']:.0f} ms | pending {s['pending']} | dropped {s['dropped']} | errors {s['errors']}"
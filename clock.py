@@ -0,0 +1,74 @@
+import threading
+import time
+
+
+class SystemClock:
+    name = 'system'
+    precise = False
+
+    def time(self):
+        return time.time()
+
+    def perf_counter(self):
+        return time.perf_counter()
+
+    def sleep(self, seconds):
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def wait(self, event, timeout=None):
+        return event.wait(timeout)
+
+
+class SimulatedClock:
+    name = 'simulated'
+    precise = True
+
+    def __init__(self, start=0.0, epoch=None):
+        self._now = float(start)
+        self.epoch = time.time() if epoch is None else float(epoch)
+        self._lock = threading.Lock()
+        self.listeners = []
+
+    def add_listener(self, callback):
+        self.listeners.append(callback)
+
+    def time(self):
+        return self.epoch + self._now
+
+    def perf_counter(self):
+        return self._now
+
+    def advance(self, seconds):
+        if seconds <= 0:
+            return self._now
+        with self._lock:
+            self._now += seconds
+            now = self._now
+        for callback in self.listeners:
+            callback(now)
+        return now
+
+    def sleep(self, seconds):
+        self.advance(seconds)
+
+    def wait(self, event, timeout=None):
+        # Nothing else moves simulated time, so a wait either finds the event set or runs out its timeout.
+        if event.is_set():
+            return True
+        if timeout is not None:
+            self.advance(timeout)
+        return event.is_set()
+
+
+_clock = SystemClock()
+
+
+def get_clock():
+    return _clock
+
+
+def set_clock(clock):
+    global _clock
+    _clock = clock if clock is not None else SystemClock()
+    return _clock
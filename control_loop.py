@@ -0,0 +1,103 @@
+from collections import deque
+
+from clock import get_clock
+
+
+class TickStats:
+
+    def __init__(self, window=512):
+        self.window = window
+        self.reset()
+
+    def reset(self):
+        self.ticks = 0
+        self.overruns = 0
+        self.totals = {'capture': 0.0, 'decision': 0.0, 'input': 0.0}
+        self.peaks = {'capture': 0.0, 'decision': 0.0, 'input': 0.0}
+        self.jitter = deque(maxlen=self.window)
+
+    def record_jitter(self, jitter):
+        self.jitter.append(jitter)
+
+    def record(self, capture, decision, input_time):
+        self.ticks += 1
+        for key, value in (('capture', capture), ('decision', decision), ('input', input_time)):
+            self.totals[key] += value
+            if value > self.peaks[key]:
+                self.peaks[key] = value
+
+    def summary(self):
+        ticks = max(self.ticks, 1)
+        jitter = sorted(self.jitter)
+        result = {'ticks': self.ticks, 'overruns': self.overruns}
+        for key in self.totals:
+            result[f'{key}_mean_ms'] = self.totals[key] / ticks * 1000.0
+            result[f'{key}_max_ms'] = self.peaks[key] * 1000.0
+        result['jitter_mean_ms'] = sum(jitter) / len(jitter) * 1000.0 if jitter else 0.0
+        result['jitter_p95_ms'] = jitter[int(0.95 * (len(jitter) - 1))] * 1000.0 if jitter else 0.0
+        result['jitter_max_ms'] = jitter[-1] * 1000.0 if jitter else 0.0
+        return result
+
+
+class FixedRateLoop:
+
+    def __init__(self, hz=60.0, clock=None, sleep=None, spin=0.001):
+        self._clock = clock
+        self._sleep = sleep
+        self.spin = spin
+        self.stats = TickStats()
+        self.set_rate(hz)
+        self.next_deadline = None
+        self.tick_start = None
+
+    def clock(self):
+        return self._clock() if self._clock is not None else get_clock().perf_counter()
+
+    def sleep(self, seconds):
+        if self._sleep is not None:
+            self._sleep(seconds)
+        else:
+            get_clock().sleep(seconds)
+
+    def set_rate(self, hz):
+        self.hz = max(1.0, float(hz))
+        self.period = 1.0 / self.hz
+
+    def start(self):
+        self.stats.reset()
+        self.next_deadline = self.clock()
+        self.tick_start = None
+
+    def wait(self):
+        if self.next_deadline is None:
+            self.start()
+        deadline = self.next_deadline
+        remaining = deadline - self.clock()
+        precise = self._sleep is None and get_clock().precise
+        spin = 0.0 if precise else self.spin
+        if remaining > spin:
+            self.sleep(remaining - spin)
+        now = self.clock()
+        while now < deadline and not precise:
+            now = self.clock()
+        self.stats.record_jitter(now - deadline)
+        self.next_deadline = deadline + self.period
+        if now > self.next_deadline:
+            # A tick that ran past its slot is counted once and the schedule restarts from now,
+            # rather than firing a burst of catch-up ticks.
+            self.stats.overruns += 1
+            self.next_deadline = now + self.period
+        self.tick_start = now
+        return now
+
+    def record(self, capture, decision, input_time):
+        self.stats.record(capture, decision, input_time)
+
+    def summary(self):
+        result = self.stats.summary()
+        result['hz'] = self.hz
+        return result
+
+    def summary_line(self):
+        s = self.summary()
+        return f"{s['ticks']} ticks @ {s['hz']:.0f} Hz | capture {s['capture_mean_ms']:.2f}/{s['capture_max_ms']:.2f} ms | decision {s['decision_mean_ms']:.2f}/{s['decision_max_ms']:.2f} ms | input {s['input_mean_ms']:.2f}/{s['input_max_ms']:.2f} ms | jitter p95 {s['jitter_p95_ms']:.2f} ms | overruns {s['overruns']}"
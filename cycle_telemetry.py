@@ -0,0 +1,93 @@
+import threading
+from collections import deque
+
+from clock import get_clock
+
+CYCLE_STAGES = ['cast', 'bite_wait', 'reel', 'catch_wait', 'catch_capture', 'close']
+
+
+def percentile(values, fraction):
+    return values[int(fraction * (len(values) - 1))] if values else 0.0
+
+
+def outcome_label(outcome):
+    if isinstance(outcome, str):
+        return outcome
+    return 'completed' if outcome else 'failed'
+
+
+class CycleTelemetry:
+
+    def __init__(self, capacity=200, clock=None):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.cycles = deque(maxlen=capacity)
+        self.total_cycles = 0
+        self.current = None
+        self._mark = None
+
+    def clock(self):
+        return self._clock() if self._clock is not None else get_clock().perf_counter()
+
+    def start_cycle(self):
+        now = self.clock()
+        self.current = {'started': now, 'stages': {}}
+        self._mark = now
+
+    def mark(self, stage):
+        # Each mark closes the stage that ran since the previous one, so stages never overlap or leave gaps.
+        if self.current is None:
+            return 0.0
+        now = self.clock()
+        duration = now - self._mark
+        stages = self.current['stages']
+        stages[stage] = stages.get(stage, 0.0) + duration
+        self._mark = now
+        return duration
+
+    def finish_cycle(self, outcome=None):
+        if self.current is None:
+            return None
+        cycle = {'outcome': outcome_label(outcome), 'stages': self.current['stages'], 'total': self.clock() - self.current['started']}
+        with self._lock:
+            self.cycles.append(cycle)
+            self.total_cycles += 1
+        self.current = None
+        return cycle
+
+    def reset(self):
+        with self._lock:
+            self.cycles.clear()
+            self.total_cycles = 0
+        self.current = None
+
+    def recent_cycles(self):
+        # The GUI timer reads while the automation thread appends, so readers work on a copy.
+        with self._lock:
+            return list(self.cycles)
+
+    def durations(self, stage, cycles=None):
+        cycles = self.recent_cycles() if cycles is None else cycles
+        if stage == 'total':
+            return sorted(cycle['total'] for cycle in cycles)
+        return sorted(cycle['stages'][stage] for cycle in cycles if stage in cycle['stages'])
+
+    def summary(self):
+        cycles = self.recent_cycles()
+        result = {}
+        for stage in CYCLE_STAGES + ['total']:
+            values = self.durations(stage, cycles)
+            if values:
+                result[stage] = {'count': len(values), 'mean': sum(values) / len(values), 'p50': percentile(values, 0.5), 'p95': percentile(values, 0.95), 'max': values[-1]}
+        return result
+
+    def summary_lines(self):
+        return [f"{stage:<11}n={s['count']:<4} mean {s['mean']:6.2f}s  p50 {s['p50']:6.2f}s  p95 {s['p95']:6.2f}s  max {s['max']:6.2f}s" for stage, s in self.summary().items()]
+
+    def last_cycle_line(self):
+        cycles = self.recent_cycles()
+        if not cycles:
+            return 'no cycles recorded'
+        cycle = cycles[-1]
+        stages = ' | '.join(f'{stage} {cycle["stages"][stage]:.2f}s' for stage in CYCLE_STAGES if stage in cycle['stages'])
+        return f"{stages} | total {cycle['total']:.2f}s ({cycle['outcome']})"
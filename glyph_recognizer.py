@@ -0,0 +1,175 @@
+import json
+import os
+
+import numpy as np
+
+from ocr_preprocess import OcrPreprocessor
+
+GLYPH_SIZE = 16
+
+
+def find_runs(flags):
+    padded = np.concatenate(([False], flags, [False]))
+    edges = np.flatnonzero(padded[1:] != padded[:-1])
+    return list(zip(edges[::2], edges[1::2]))
+
+
+def split_lines(mask, max_gap=2):
+    # Small gaps are bridged so the dot of an i or j stays on its line.
+    lines = []
+    for start, end in find_runs(mask.any(axis=1)):
+        if lines and start - lines[-1][1] <= max_gap:
+            lines[-1] = (lines[-1][0], end)
+        else:
+            lines.append((start, end))
+    return [mask[start:end] for start, end in lines if end - start > 2]
+
+
+def segment_glyphs(mask, space_ratio=0.3):
+    # Returns one box per glyph and None wherever a word gap separates two glyphs.
+    glyphs = []
+    for line in split_lines(mask):
+        height = line.shape[0]
+        if glyphs:
+            glyphs.append(None)
+        previous = None
+        for start, end in find_runs(line.any(axis=0)):
+            if previous is not None and start - previous >= space_ratio * height:
+                glyphs.append(None)
+            glyphs.append((line[:, start:end], height))
+            previous = end
+    return glyphs
+
+
+def glyph_features(glyph, line_height, size=GLYPH_SIZE):
+    rows = np.flatnonzero(glyph.any(axis=1))
+    top, bottom = rows[0], rows[-1] + 1
+    glyph = glyph[top:bottom]
+    height, width = glyph.shape
+    ys = ((np.arange(size) + 0.5) * height / size).astype(int)
+    xs = ((np.arange(size) + 0.5) * width / size).astype(int)
+    bitmap = glyph[ys][:, xs].ravel()
+    # Where the glyph sits on the line tells apart shapes that scale to the same bitmap, like o and O or , and '.
+    geometry = np.array([top / line_height, bottom / line_height, min(width / line_height, 2.0)], dtype=np.float32)
+    return bitmap, geometry
+
+
+class GlyphAtlas:
+
+    def __init__(self, size=GLYPH_SIZE, max_per_char=6, geometry_weight=0.5):
+        self.size = size
+        self.max_per_char = max_per_char
+        self.geometry_weight = geometry_weight
+        self.chars = []
+        self.bitmaps = []
+        self.geometry = []
+        self.dirty = False
+        self._matrix = None
+
+    def __len__(self):
+        return len(self.chars)
+
+    def distances(self, bitmap, geometry):
+        if self._matrix is None:
+            self._matrix = (np.array(self.bitmaps, dtype=bool).reshape(len(self.chars), -1), np.array(self.geometry, dtype=np.float32).reshape(len(self.chars), 3))
+        bitmaps, geometries = self._matrix
+        return (bitmaps != bitmap).mean(axis=1) + self.geometry_weight * np.abs(geometries - geometry).sum(axis=1)
+
+    def match(self, bitmap, geometry):
+        if not self.chars:
+            return None, 0.0
+        distances = self.distances(bitmap, geometry)
+        best = int(np.argmin(distances))
+        return self.chars[best], max(0.0, 1.0 - float(distances[best]))
+
+    def add(self, char, bitmap, geometry):
+        same = [i for i, c in enumerate(self.chars) if c == char]
+        if same and self.distances(bitmap, geometry)[same].min() < 0.03:
+            return False
+        if len(same) >= self.max_per_char:
+            return False
+        self.chars.append(char)
+        self.bitmaps.append(bitmap)
+        self.geometry.append(geometry)
+        self._matrix = None
+        self.dirty = True
+        return True
+
+    def to_dict(self):
+        return {'size': self.size, 'glyphs': [{'char': char, 'bitmap': np.packbits(bitmap).tobytes().hex(), 'geometry': [round(float(v), 4) for v in geometry]} for char, bitmap, geometry in zip(self.chars, self.bitmaps, self.geometry)]}
+
+    @classmethod
+    def from_dict(cls, data, **kwargs):
+        atlas = cls(size=int(data.get('size', GLYPH_SIZE)), **kwargs)
+        count = atlas.size * atlas.size
+        for glyph in data.get('glyphs', []):
+            bitmap = np.unpackbits(np.frombuffer(bytes.fromhex(glyph['bitmap']), dtype=np.uint8))[:count].astype(bool)
+            atlas.add(glyph['char'], bitmap, np.array(glyph['geometry'], dtype=np.float32))
+        atlas.dirty = False
+        return atlas
+
+    def save(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f)
+        self.dirty = False
+
+    @classmethod
+    def load(cls, path, **kwargs):
+        if not os.path.exists(path):
+            return cls(**kwargs)
+        with open(path, 'r') as f:
+            return cls.from_dict(json.load(f), **kwargs)
+
+
+class GlyphRecognizer:
+
+    def __init__(self, atlas=None, preprocessor=None, min_confidence=0.85):
+        self.atlas = atlas if atlas is not None else GlyphAtlas()
+        self.preprocessor = preprocessor or OcrPreprocessor(scale=1, padding=0)
+        self.min_confidence = min_confidence
+        self.hits = 0
+        self.misses = 0
+        self.learned = 0
+
+    def features(self, pixels):
+        features = []
+        for glyph in segment_glyphs(self.preprocessor.text_mask(pixels)):
+            features.append(None if glyph is None else glyph_features(glyph[0], glyph[1], self.atlas.size))
+        return features
+
+    def recognize(self, pixels):
+        # The line is only as trustworthy as its least certain glyph.
+        features = self.features(pixels)
+        if not len(self.atlas) or not any(features):
+            return '', 0.0
+        text = []
+        confidence = 1.0
+        for feature in features:
+            if feature is None:
+                text.append(' ')
+                continue
+            char, score = self.atlas.match(*feature)
+            text.append(char)
+            confidence = min(confidence, score)
+        return ''.join(text), confidence
+
+    def learn(self, pixels, label):
+        chars = [c for c in label if not c.isspace()]
+        glyphs = [feature for feature in self.features(pixels) if feature is not None]
+        # Touching or broken glyphs make the alignment ambiguous, so such captures are skipped rather than mislabelled.
+        if not chars or len(glyphs) != len(chars):
+            return False
+        added = sum(self.atlas.add(char, *feature) for char, feature in zip(chars, glyphs))
+        self.learned += added
+        return True
+
+    def record(self, hit):
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    def summary_line(self):
+        total = self.hits + self.misses
+        rate = self.hits / total * 100 if total else 0.0
+        return f'{self.hits}/{total} catches read from glyph templates ({rate:.0f}%) | {len(self.atlas)} templates, {self.learned} learned this session'
@@ -0,0 +1,333 @@
+from collections import deque, namedtuple
+
+from clock import get_clock
+
+try:
+    import autoit
+    AUTOIT_AVAILABLE = True
+except Exception:
+    autoit = None
+    AUTOIT_AVAILABLE = False
+
+try:
+    from pynput.keyboard import Key, Controller as KeyboardController
+    from pynput.mouse import Button, Controller as MouseController
+    from mousekey import MouseKey
+    PYNPUT_AVAILABLE = True
+except Exception:
+    PYNPUT_AVAILABLE = False
+
+INPUT_BACKENDS = ['auto', 'autoit', 'pynput', 'recording']
+DEFAULT_ROLE_BACKENDS = {'paths': 'pynput'}
+
+AUTOIT_KEYS = {'alt': 'ALT', 'backspace': 'BACKSPACE', 'caps_lock': 'CAPSLOCK', 'ctrl': 'CTRL', 'delete': 'DELETE', 'down': 'DOWN', 'end': 'END', 'enter': 'ENTER', 'esc': 'ESC', 'home': 'HOME', 'insert': 'INSERT', 'left': 'LEFT', 'page_down': 'PGDN', 'page_up': 'PGUP', 'pause': 'PAUSE', 'print_screen': 'PRINTSCREEN', 'right': 'RIGHT', 'shift': 'SHIFT', 'space': 'SPACE', 'tab': 'TAB', 'up': 'UP', 'cmd': 'LWIN'}
+AUTOIT_KEYS.update({f'f{n}': f'F{n}' for n in range(1, 13)})
+AUTOIT_KEY_NAMES = {value: key for key, value in AUTOIT_KEYS.items()}
+
+InputAction = namedtuple('InputAction', ['timestamp', 'action', 'args', 'phase', 'duration'])
+
+
+def normalize_key(key):
+    key = str(key)
+    if key.startswith('Key.'):
+        key = key[4:]
+    for suffix in ('_l', '_r'):
+        if len(key) > 2 and key.endswith(suffix):
+            key = key[:-2]
+    return key
+
+
+def normalize_button(button):
+    button = str(button)
+    return button[7:] if button.startswith('Button.') else button
+
+
+class InputBackend:
+    name = 'base'
+
+    def set_phase(self, phase):
+        pass
+
+    def mouse_move(self, x, y, speed=-1):
+        raise NotImplementedError
+
+    def mouse_click(self, button='left', clicks=1):
+        raise NotImplementedError
+
+    def mouse_down(self, button='left'):
+        raise NotImplementedError
+
+    def mouse_up(self, button='left'):
+        raise NotImplementedError
+
+    def mouse_wheel(self, direction, clicks=1):
+        raise NotImplementedError
+
+    def scroll(self, dx, dy):
+        if dy:
+            self.mouse_wheel('up' if dy > 0 else 'down', abs(int(dy)))
+
+    def mouse_get_pos(self):
+        raise NotImplementedError
+
+    def send(self, keys):
+        raise NotImplementedError
+
+    def key_down(self, key):
+        raise NotImplementedError
+
+    def key_up(self, key):
+        raise NotImplementedError
+
+    def win_exists(self, title):
+        return True
+
+    def win_activate(self, title):
+        pass
+
+
+class AutoItInputBackend(InputBackend):
+    name = 'autoit'
+
+    def __init__(self):
+        if not AUTOIT_AVAILABLE:
+            raise RuntimeError('autoit is not available')
+
+    def mouse_move(self, x, y, speed=-1):
+        autoit.mouse_move(x=int(x), y=int(y), speed=speed)
+
+    def mouse_click(self, button='left', clicks=1):
+        autoit.mouse_click(button, clicks=clicks)
+
+    def mouse_down(self, button='left'):
+        autoit.mouse_down(button)
+
+    def mouse_up(self, button='left'):
+        autoit.mouse_up(button)
+
+    def mouse_wheel(self, direction, clicks=1):
+        autoit.mouse_wheel(direction, clicks)
+
+    def mouse_get_pos(self):
+        return autoit.mouse_get_pos()
+
+    def send(self, keys):
+        autoit.send(keys)
+
+    def _key(self, key, state):
+        key = normalize_key(key)
+        name = AUTOIT_KEYS.get(key.lower(), key)
+        autoit.send('{%s %s}' % (name, state))
+
+    def key_down(self, key):
+        self._key(key, 'down')
+
+    def key_up(self, key):
+        self._key(key, 'up')
+
+    def win_exists(self, title):
+        return autoit.win_exists(title)
+
+    def win_activate(self, title):
+        autoit.win_activate(title)
+
+
+class PynputInputBackend(InputBackend):
+    name = 'pynput'
+
+    def __init__(self):
+        if not PYNPUT_AVAILABLE:
+            raise RuntimeError('pynput/mousekey are not available')
+        self.keyboard = KeyboardController()
+        self.mouse = MouseController()
+        self.mousekey = MouseKey()
+
+    def _key(self, key):
+        key = normalize_key(key)
+        return getattr(Key, key, key) if len(key) > 1 else key
+
+    def _button(self, button):
+        return getattr(Button, normalize_button(button))
+
+    def mouse_move(self, x, y, speed=-1):
+        self.mousekey.move_to(int(x), int(y))
+
+    def mouse_click(self, button='left', clicks=1):
+        self.mouse.click(self._button(button), clicks)
+
+    def mouse_down(self, button='left'):
+        self.mouse.press(self._button(button))
+
+    def mouse_up(self, button='left'):
+        self.mouse.release(self._button(button))
+
+    def mouse_wheel(self, direction, clicks=1):
+        self.mouse.scroll(0, clicks if direction == 'up' else -clicks)
+
+    def scroll(self, dx, dy):
+        self.mouse.scroll(dx, dy)
+
+    def mouse_get_pos(self):
+        x, y = self.mouse.position
+        return (int(x), int(y))
+
+    def send(self, keys):
+        # Covers the AutoIt Send subset used here: {NAME} keys, ! for Alt and plain characters.
+        index = 0
+        while index < len(keys):
+            char = keys[index]
+            if char == '!' and index + 1 < len(keys):
+                with self.keyboard.pressed(Key.alt):
+                    index = self._send_one(keys, index + 1)
+                continue
+            index = self._send_one(keys, index)
+
+    def _send_one(self, keys, index):
+        if keys[index] == '{':
+            end = keys.index('}', index)
+            name = keys[index + 1:end]
+            self.keyboard.tap(self._key(AUTOIT_KEY_NAMES.get(name.upper(), name.lower())))
+            return end + 1
+        self.keyboard.tap(keys[index])
+        return index + 1
+
+    def key_down(self, key):
+        self.keyboard.press(self._key(key))
+
+    def key_up(self, key):
+        self.keyboard.release(self._key(key))
+
+
+class RecordingInputBackend(InputBackend):
+    name = 'recording'
+
+    def __init__(self, inner=None, clock=None, max_actions=100000):
+        self.inner = inner
+        self._clock = clock
+        self.actions = deque(maxlen=max_actions)
+        self.phase = None
+        self.phase_totals = {}
+        self.position = (0, 0)
+        self.listeners = []
+
+    def clock(self):
+        return self._clock() if self._clock is not None else get_clock().perf_counter()
+
+    def set_phase(self, phase):
+        self.phase = phase
+        if self.inner is not None:
+            self.inner.set_phase(phase)
+
+    def add_listener(self, callback):
+        self.listeners.append(callback)
+
+    def _record(self, action, *args):
+        started = self.clock()
+        result = getattr(self.inner, action)(*args) if self.inner is not None else None
+        entry = InputAction(started, action, args, self.phase, self.clock() - started)
+        self.actions.append(entry)
+        totals = self.phase_totals.setdefault(self.phase, [0, 0.0])
+        totals[0] += 1
+        totals[1] += entry.duration
+        for callback in self.listeners:
+            callback(entry)
+        return result
+
+    def mouse_move(self, x, y, speed=-1):
+        self.position = (int(x), int(y))
+        self._record('mouse_move', x, y, speed)
+
+    def mouse_click(self, button='left', clicks=1):
+        self._record('mouse_click', button, clicks)
+
+    def mouse_down(self, button='left'):
+        self._record('mouse_down', button)
+
+    def mouse_up(self, button='left'):
+        self._record('mouse_up', button)
+
+    def mouse_wheel(self, direction, clicks=1):
+        self._record('mouse_wheel', direction, clicks)
+
+    def scroll(self, dx, dy):
+        self._record('scroll', dx, dy)
+
+    def mouse_get_pos(self):
+        if self.inner is not None:
+            return self.inner.mouse_get_pos()
+        return self.position
+
+    def send(self, keys):
+        self._record('send', keys)
+
+    def key_down(self, key):
+        self._record('key_down', key)
+
+    def key_up(self, key):
+        self._record('key_up', key)
+
+    def win_exists(self, title):
+        result = self._record('win_exists', title)
+        return True if self.inner is None else result
+
+    def win_activate(self, title):
+        self._record('win_activate', title)
+
+    def count(self, action=None):
+        return sum(1 for entry in self.actions if action is None or entry.action == action)
+
+    def summary(self):
+        return {phase: {'actions': count, 'seconds': seconds} for phase, (count, seconds) in self.phase_totals.items()}
+
+    def clear(self):
+        self.actions.clear()
+        self.phase_totals.clear()
+
+
+def create_input_backend(name='auto'):
+    name = (name or 'auto').lower()
+    if name == 'recording':
+        return RecordingInputBackend()
+    if name == 'pynput':
+        if PYNPUT_AVAILABLE:
+            return PynputInputBackend()
+        print('Warning: pynput input backend is not available, falling back to auto')
+    elif name == 'autoit' and not AUTOIT_AVAILABLE:
+        print('Warning: autoit input backend is not available, falling back to auto')
+    if AUTOIT_AVAILABLE:
+        return AutoItInputBackend()
+    if PYNPUT_AVAILABLE:
+        return PynputInputBackend()
+    print('Warning: no input library available, input will only be recorded')
+    return RecordingInputBackend()
+
+
+_default_backend = None
+_role_backends = {}
+
+
+def register_default_roles():
+    for backend_role, name in DEFAULT_ROLE_BACKENDS.items():
+        if name == 'pynput' and PYNPUT_AVAILABLE:
+            _role_backends.setdefault(backend_role, create_input_backend(name))
+
+
+def get_input_backend(role=None):
+    global _default_backend
+    if _default_backend is None:
+        _default_backend = create_input_backend('auto')
+        register_default_roles()
+    return _role_backends.get(role, _default_backend)
+
+
+def set_input_backend(backend, role=None):
+    global _default_backend
+    if role is not None:
+        _role_backends[role] = backend
+        return backend
+    _default_backend = backend
+    _role_backends.clear()
+    # A recording backend has to see every action, so only it drops the role overrides; any other default keeps them.
+    if backend is not None and not isinstance(backend, RecordingInputBackend):
+        register_default_roles()
+    return backend
@@ -0,0 +1,138 @@
+import threading
+from collections import deque, namedtuple
+
+from clock import get_clock
+
+InputCommand = namedtuple('InputCommand', ['kind', 'args', 'kwargs', 'queued_at'])
+
+
+class InputDispatcher:
+
+    def __init__(self, handlers, synchronous=False, max_pending=8, clock=None):
+        self.handlers = dict(handlers)
+        self.synchronous = synchronous
+        self._clock = clock
+        self.max_pending = max(1, int(max_pending))
+        # deque append/popleft are atomic, so the producer never takes a lock; the event only wakes the worker.
+        self._queue = deque()
+        self._wake = threading.Event()
+        self._submitted = 0
+        self._completed = 0
+        self._running = False
+        self._thread = None
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.dispatched = 0
+        self.dropped = 0
+        self.errors = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.total_duration = 0.0
+        self.max_duration = 0.0
+
+    def clock(self):
+        return self._clock() if self._clock is not None else get_clock().perf_counter()
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name='InputDispatcher', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=1.0):
+        self._running = False
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+        self._thread = None
+        self._queue.clear()
+        self._completed = self._submitted
+
+    def submit(self, kind, *args, **kwargs):
+        command = InputCommand(kind, args, kwargs, self.clock())
+        if self.synchronous:
+            self._execute(command)
+            return command
+        if not self.running:
+            self.start()
+        if len(self._queue) >= self.max_pending:
+            self.dropped += 1
+            return None
+        self._submitted += 1
+        self._queue.append(command)
+        self._wake.set()
+        return command
+
+    def click(self, button='left', *args, **kwargs):
+        return self.submit('click', button, *args, **kwargs)
+
+    def move(self, x, y, *args, **kwargs):
+        return self.submit('move', x, y, *args, **kwargs)
+
+    def key(self, keys, *args, **kwargs):
+        return self.submit('key', keys, *args, **kwargs)
+
+    def flush(self, timeout=1.0):
+        deadline = self.clock() + timeout
+        while self.running and self._completed < self._submitted:
+            if self.clock() >= deadline:
+                return False
+            get_clock().sleep(0.001)
+        return True
+
+    def discard_pending(self):
+        discarded = 0
+        while True:
+            try:
+                self._queue.popleft()
+            except IndexError:
+                break
+            discarded += 1
+        self._submitted -= discarded
+        return discarded
+
+    def pending(self):
+        return len(self._queue)
+
+    def _execute(self, command):
+        started = self.clock()
+        try:
+            self.handlers[command.kind](*command.args, **command.kwargs)
+        except Exception as e:
+            self.errors += 1
+            print(f'Input dispatch error ({command.kind}): {e}')
+        finished = self.clock()
+        latency = started - command.queued_at
+        duration = finished - started
+        self.dispatched += 1
+        self.total_latency += latency
+        self.total_duration += duration
+        self.max_latency = max(self.max_latency, latency)
+        self.max_duration = max(self.max_duration, duration)
+
+    def _run(self):
+        while self._running:
+            self._wake.wait()
+            self._wake.clear()
+            while self._queue:
+                try:
+                    command = self._queue.popleft()
+                except IndexError:
+                    break
+                self._execute(command)
+                self._completed += 1
+
+    def summary(self):
+        count = max(self.dispatched, 1)
+        return {'dispatched': self.dispatched, 'dropped': self.dropped, 'errors': self.errors, 'latency_mean_ms': self.total_latency / count * 1000.0, 'latency_max_ms': self.max_latency * 1000.0, 'duration_mean_ms': self.total_duration / count * 1000.0, 'duration_max_ms': self.max_duration * 1000.0}
+
+    def summary_line(self):
+        s = self.summary()
+        mode = 'sync' if self.synchronous else 'async'
+        return f"{s['dispatched']} commands ({mode}) | queue latency {s['latency_mean_ms']:.2f}/{s['latency_max_ms']:.2f} ms | inject {s['duration_mean_ms']:.2f}/{s['duration_max_ms']:.2f} ms | dropped {s['dropped']} | errors {s['errors']}"
@@ -0,0 +1,134 @@
+import json
+import os
+
+LATENCY_STAGES = ['capture', 'decision', 'input', 'ocr', 'webhook']
+
+
+class LatencyHistogram:
+
+    def __init__(self, max_seconds=60.0, sub_bucket_bits=5, resolution=1e-6):
+        self.max_seconds = float(max_seconds)
+        self.sub_bucket_bits = int(sub_bucket_bits)
+        self.resolution = float(resolution)
+        self.sub_bucket_count = 1 << self.sub_bucket_bits
+        self.half_count = self.sub_bucket_count >> 1
+        self.max_units = max(self.sub_bucket_count, int(self.max_seconds / self.resolution))
+        self.counts = [0] * (self._index(self.max_units) + 1)
+        self.reset()
+
+    def reset(self):
+        for index in range(len(self.counts)):
+            self.counts[index] = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def _index(self, units):
+        # Values below sub_bucket_count are exact; above that each power of two is split into half_count
+        # linear buckets, which bounds the relative error at 1 / half_count with fixed memory.
+        if units < self.sub_bucket_count:
+            return units
+        shift = units.bit_length() - self.sub_bucket_bits
+        return self.sub_bucket_count + (shift - 1) * self.half_count + (units >> shift) - self.half_count
+
+    def _bounds(self, index):
+        if index < self.sub_bucket_count:
+            return index, index
+        shift = (index - self.sub_bucket_count) // self.half_count + 1
+        mantissa = (index - self.sub_bucket_count) % self.half_count + self.half_count
+        low = mantissa << shift
+        return low, low + (1 << shift) - 1
+
+    def record(self, seconds, count=1):
+        if seconds is None or seconds < 0:
+            return
+        units = min(int(seconds / self.resolution), self.max_units)
+        self.counts[self._index(units)] += count
+        self.count += count
+        self.total += seconds * count
+        if self.min is None or seconds < self.min:
+            self.min = seconds
+        if self.max is None or seconds > self.max:
+            self.max = seconds
+
+    def compatible(self, other):
+        return (self.max_seconds, self.sub_bucket_bits, self.resolution) == (other.max_seconds, other.sub_bucket_bits, other.resolution)
+
+    def merge(self, other):
+        if not self.compatible(other):
+            raise ValueError('cannot merge histograms with different bucket layouts')
+        for index, count in enumerate(other.counts):
+            if count:
+                self.counts[index] += count
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        if other.max is not None and (self.max is None or other.max > self.max):
+            self.max = other.max
+        return self
+
+    def percentile(self, fraction):
+        if not self.count:
+            return 0.0
+        rank = max(1, int(round(fraction * self.count)))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(self._bounds(index)[1] * self.resolution, self.max)
+        return self.max
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def summary(self):
+        return {'count': self.count, 'mean_ms': self.mean * 1000.0, 'p50_ms': self.percentile(0.5) * 1000.0, 'p90_ms': self.percentile(0.9) * 1000.0, 'p99_ms': self.percentile(0.99) * 1000.0, 'p999_ms': self.percentile(0.999) * 1000.0, 'max_ms': (self.max or 0.0) * 1000.0}
+
+    def summary_line(self):
+        s = self.summary()
+        return f"n={s['count']} mean {s['mean_ms']:.2f} | p50 {s['p50_ms']:.2f} | p90 {s['p90_ms']:.2f} | p99 {s['p99_ms']:.2f} | p99.9 {s['p999_ms']:.2f} | max {s['max_ms']:.2f} ms"
+
+    def to_dict(self):
+        return {'max_seconds': self.max_seconds, 'sub_bucket_bits': self.sub_bucket_bits, 'resolution': self.resolution, 'count': self.count, 'total': self.total, 'min': self.min, 'max': self.max, 'counts': {str(index): count for index, count in enumerate(self.counts) if count}}
+
+    @classmethod
+    def from_dict(cls, data):
+        histogram = cls(data.get('max_seconds', 60.0), data.get('sub_bucket_bits', 5), data.get('resolution', 1e-6))
+        for index, count in data.get('counts', {}).items():
+            histogram.counts[int(index)] += count
+        histogram.count = data.get('count', sum(histogram.counts))
+        histogram.total = data.get('total', 0.0)
+        histogram.min = data.get('min')
+        histogram.max = data.get('max')
+        return histogram
+
+
+def create_latency_histograms(stages=None):
+    return {stage: LatencyHistogram() for stage in (stages or LATENCY_STAGES)}
+
+
+def merge_histograms(target, source):
+    for stage, histogram in source.items():
+        if stage in target:
+            target[stage].merge(histogram)
+        else:
+            target[stage] = LatencyHistogram.from_dict(histogram.to_dict())
+    return target
+
+
+def dump_histograms(histograms, path, **metadata):
+    data = dict(metadata)
+    data['histograms'] = {stage: histogram.to_dict() for stage, histogram in histograms.items()}
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
+
+
+def load_histograms(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r') as f:
+        data = json.load(f)
+    return {stage: LatencyHistogram.from_dict(histogram) for stage, histogram in data.get('histograms', {}).items()}
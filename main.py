@@ -1,13 +1,13 @@
-import time 
+from clock import get_clock 
 import threading 
 import keyboard 
-from PIL import ImageGrab 
+from PIL import Image 
 import ctypes 
-import autoit 
 import json 
 import os 
 import sys 
 import concurrent .futures 
+import platform 
 from PyQt6 .QtWidgets import QApplication ,QMainWindow ,QVBoxLayout ,QHBoxLayout ,QWidget ,QPushButton ,QLabel ,QFrame ,QScrollArea ,QMessageBox ,QGroupBox ,QComboBox ,QCheckBox ,QLineEdit ,QSpinBox ,QTabWidget ,QDialog ,QRadioButton ,QButtonGroup 
 from PyQt6 .QtCore import Qt ,QTimer ,pyqtSignal ,QObject ,QPoint ,QUrl 
 from PyQt6 .QtGui import QFont ,QCursor ,QPainter ,QPen ,QColor ,QIcon ,QLinearGradient ,QBrush ,QDesktopServices 
@@ -15,6 +15,21 @@ from updater import AutoUpdater, CURRENT_VERSION
 from auto_sell import AutoSellManager 
 from reconnect import AutoReconnectManager 
 from calibration_manager import CalibrationManager 
+from screen_capture import FrameCapture ,RecordingCaptureBackend ,create_capture_backend ,normalize_region 
+from bar_detection import BarSearchWindow ,BarTracker ,ReelCompletionDetector ,ReelStripSampler ,create_color_matcher 
+from waiting import BiteTimeModel ,wait_for_condition 
+from reel_control import REEL_CONTROLLERS ,create_reel_controller 
+from control_loop import FixedRateLoop 
+from input_dispatch import InputDispatcher 
+from input_backend import INPUT_BACKENDS ,RecordingInputBackend ,create_input_backend ,get_input_backend ,set_input_backend 
+from cycle_telemetry import CycleTelemetry 
+from session_stats import SessionStats 
+from latency_histogram import create_latency_histograms ,dump_histograms ,load_histograms ,merge_histograms 
+from catch_processor import CatchProcessor 
+from ocr_engine import OCR_ENGINES ,create_ocr_engine ,find_tesseract 
+from ocr_preprocess import OCR_CHANNELS ,OcrPreprocessor 
+from glyph_recognizer import GlyphAtlas ,GlyphRecognizer 
+from catch_cache import CatchCache 
 import requests 
 from datetime import datetime ,timezone 
 from itertools import product 
@@ -51,46 +66,14 @@ _ARROW_GRAY = _create_combo_arrow_svg('#888888')
 _ARROW_BLUE = _create_combo_arrow_svg('#4a9eff')
 
 def setup_tesseract ():
-    try :
-        if shutil .which ('tesseract'):
-            return True 
-    except Exception :
-        pass 
-    if os .name =='nt':
-        common_paths =['C:\\Program Files\\Tesseract-OCR\\tesseract.exe','C:\\Program Files (x86)\\Tesseract-OCR\\tesseract.exe',os .path .expanduser ('~\\AppData\\Local\\Programs\\Tesseract-OCR\\tesseract.exe'),'C:\\tesseract\\tesseract.exe','D:\\Program Files\\Tesseract-OCR\\tesseract.exe','D:\\Program Files (x86)\\Tesseract-OCR\\tesseract.exe']
-    for path in common_paths :
-        if os .path .exists (path ):
-            pytesseract .pytesseract .tesseract_cmd =path 
-            try :
-                from PIL import Image 
-                import numpy as np 
-                test_img =Image .new ('RGB',(100 ,30 ),color ='white')
-                pytesseract .image_to_string (test_img )
-                return True 
-            except Exception as e :
-                continue 
-    try :
-        import glob 
-        program_files_paths =['C:\\Program Files\\*esseract*\\tesseract.exe','C:\\Program Files (x86)\\*esseract*\\tesseract.exe']
-        for pattern in program_files_paths :
-            matches =glob .glob (pattern )
-            for match in matches :
-                if os .path .exists (match ):
-                    pytesseract .pytesseract .tesseract_cmd =match 
-                    try :
-                        from PIL import Image 
-                        test_img =Image .new ('RGB',(100 ,30 ),color ='white')
-                        pytesseract .image_to_string (test_img )
-                        return True 
-                    except Exception as e :
-                        continue 
-    except Exception :
-        pass 
+    path =find_tesseract ()
+    if path :
+        pytesseract .pytesseract .tesseract_cmd =path 
+        return True 
     print ('Warning: Tesseract OCR not found in PATH or common installation directories.')
     print ("Please install Tesseract OCR or ensure it's in your PATH.")
     print ('Download from: https://github.com/UB-Mannheim/tesseract/wiki')
     return False 
-setup_tesseract ()
 try :
     from autoalign import auto_align_camera 
     from fishinglocation import run_macro as run_fishing_location_macro ,macro_actions as fishing_location_actions 
@@ -107,6 +90,8 @@ try :
 except ImportError :
     WIN32_AVAILABLE =False 
 
+FISH_MUTATIONS =['Ruffled','Crusted','Slick','Rough','Charred','Shimmering','Tainted','Hollow','Lucid','Fragmented']
+
 def generate_ao_variants (name ):
     ambiguous_positions =[i for i ,c in enumerate (name .lower ())if c in ('a','o')]
     variants =[]
@@ -151,12 +136,13 @@ def levenshtein (s1 ,s2 ):
 
 class MouseAutomation :
 
-    def __init__ (self ):
+    def __init__ (self ,config_file =None ,offline =False ):
         self .toggle =False 
         self .running =False 
         self .thread =None 
+        self .offline =offline 
         self .emergency_stop_event =threading .Event ()
-        self .config_file =self ._resolve_config_path ()
+        self .config_file =config_file or self ._resolve_config_path ()
         self ._config_existed =os .path .exists (self .config_file )
         self .first_loop =True 
         self .cycle_count =0 
@@ -175,15 +161,61 @@ class MouseAutomation :
         self .current_fish_count =0 
         self .auto_reconnect_manager =AutoReconnectManager (self )
         self .calibration_manager =CalibrationManager (verbose =False )
-        try :
-            success ,message ,calibration_data =self .calibration_manager .update_calibrations ()
-        except Exception as e :
-            pass 
+        if not offline :
+            try :
+                success ,message ,calibration_data =self .calibration_manager .update_calibrations ()
+            except Exception as e :
+                pass 
         self .automation_phase ='initialization'
         self .in_sell_cycle =False 
         self .external_script_running =False 
         self .first_launch_warning_shown =False 
         self .use_vip_paths =True 
+        self .capture_backend ='auto'
+        self .capture_replay_path =''
+        self .capture_recording =False 
+        self ._color_matcher =None 
+        self .bar_tracker =BarTracker ()
+        self .incremental_bar_search =True 
+        self .bar_search_margin =48 
+        self .bar_search_window =BarSearchWindow (self .bar_search_margin )
+        self .reel_sampling_mode ='rows'
+        self .reel_sample_rows =2 
+        self .reel_strip_sampler =ReelStripSampler (self .reel_sample_rows )
+        self ._reel_sampler_area =None 
+        self .adaptive_failsafe =True 
+        self .bite_poll_policy =BiteTimeModel (max_time =60.0 )
+        self .reel_bar_absent_timeout =5.0 
+        self .reel_controller_name ='classic'
+        self .reel_controller =None 
+        self .reel_control_hz =60 
+        self .reel_tick_loop =FixedRateLoop (self .reel_control_hz )
+        self .async_input =True 
+        self .async_catch_processing =True 
+        self .ocr_engine_name ='auto'
+        self .ocr_engine =None 
+        self .ocr_preprocess =True 
+        self .ocr_channel ='luma'
+        self .ocr_threshold ='auto'
+        self .ocr_scale =2 
+        self .ocr_denoise =False 
+        self .ocr_page_mode =7 
+        self .ocr_use_whitelist =True 
+        self ._ocr_whitelist =None 
+        self ._ocr_whitelist_source =None 
+        self .glyph_recognition =True 
+        self .glyph_learning =True 
+        self .glyph_min_confidence =0.85 
+        self .glyph_recognizer =None 
+        self .catch_cache_enabled =True 
+        self .catch_cache_size =512 
+        self .catch_cache =None 
+        self .input_backend_name ='auto'
+        self .cycle_telemetry =CycleTelemetry ()
+        self .cycle_telemetry_log_every =25 
+        self .session_stats =SessionStats ()
+        self .latency_histograms =create_latency_histograms ()
+        self .last_cycle_caught =False 
         self .screen_width ,self .screen_height =self .get_screen_dimensions ()
         self .current_resolution =self .detect_resolution ()
         self .coordinates ={'fish_button':(851 ,802 ),'white_diamond':(1176 ,805 ),'reel_bar':(757 ,728 ,1163 ,750 ),'completed_border':(1133 ,744 ),'close_button':(1108 ,337 ),'fish_caught_desc':(700 ,540 ,1035 ,685 ),'first_item':(830 ,409 ),'sell_button':(588 ,775 ),'confirm_button':(797 ,613 ),'mouse_idle_position':(999 ,190 ),'shaded_area':(951 ,731 ),'sell_fish_shop':(900 ,600 ),'collection_button':(950 ,650 ),'exit_collections':(1000 ,700 ),'exit_fish_shop':(1050 ,750 )}
@@ -212,6 +244,13 @@ class MouseAutomation :
         self .load_calibration ()
         if not self ._config_existed :
             self .save_calibration ()
+        self .frame_capture =FrameCapture (self .create_capture_backend ())
+        self .set_input_backend (self .input_backend_name )
+        self .reel_completion =ReelCompletionDetector (bar_absent_timeout =self .reel_bar_absent_timeout )
+        self .set_reel_controller (self .reel_controller_name )
+        self .input_dispatcher =InputDispatcher ({'click':lambda *args ,**kwargs :self .input .mouse_click (*args ,**kwargs ),'move':lambda *args ,**kwargs :self .input .mouse_move (*args ,**kwargs ),'key':lambda *args ,**kwargs :self .input .send (*args ,**kwargs )},synchronous =not self .async_input )
+        self .catch_processor =CatchProcessor (self .process_catch ,synchronous =not self .async_catch_processing )
+        self .stop_cleanup_thread =None 
         self .load_fish_data ()
         self .auto_sell_manager =AutoSellManager (coordinates =self .coordinates ,apply_mouse_delay_callback =self .apply_mouse_delay )
 
@@ -272,18 +311,23 @@ class MouseAutomation :
         self .auto_reconnect_manager .backslash_sequence_delay =max (20.0 ,float (value ))
 
     def run_with_timeout (self ,func ,timeout_seconds =5 ,default_result =None ,*args ,**kwargs ):
+        executor =None 
         try :
-            with concurrent .futures .ThreadPoolExecutor ()as executor :
-                future =executor .submit (func ,*args ,**kwargs )
-                try :
-                    result =future .result (timeout =timeout_seconds )
-                    return result 
-                except concurrent .futures .TimeoutError :
-                    print (f'Function {func .__name__ } timed out after {timeout_seconds } seconds, skipping...')
-                    return default_result 
+            executor =concurrent .futures .ThreadPoolExecutor (max_workers =1 )
+            future =executor .submit (func ,*args ,**kwargs )
+            try :
+                result =future .result (timeout =timeout_seconds )
+                return result 
+            except concurrent .futures .TimeoutError :
+                print (f'Function {func .__name__ } timed out after {timeout_seconds } seconds, skipping...')
+                return default_result 
         except Exception as e :
             print (f'Error running function {func .__name__ } with timeout: {e }')
             return default_result 
+        finally :
+            # Leaving a with block would join the executor and wait out the very call that timed out.
+            if executor is not None :
+                executor .shutdown (wait =False )
 
     def get_screen_dimensions (self ):
         try :
@@ -424,7 +468,7 @@ class MouseAutomation :
                 except Exception as e :
                     print (f'Warning: Could not create backup file: {e }')
             auto_reconnect_config =self .auto_reconnect_manager .get_config_dict ()
-            config_data ={'coordinates':self .coordinates ,'current_resolution':self .current_resolution ,'webhook_url':self .webhook_url ,'ignore_common':self .ignore_common_fish ,'ignore_uncommon':self .ignore_uncommon_fish ,'ignore_rare':self .ignore_rare_fish ,'ignore_trash':self .ignore_trash ,'mouse_delay_enabled':self .mouse_delay_enabled ,'mouse_delay_ms':self .mouse_delay_ms ,'failsafe_enabled':self .failsafe_enabled ,'failsafe_timeout':self .failsafe_timeout ,'failsafe_reconnect_threshold':self .failsafe_reconnect_threshold ,'failsafe_reconnect_enabled':self .failsafe_reconnect_enabled ,'bar_game_tolerance':self .bar_game_tolerance ,'auto_sell_enabled':self .auto_sell_enabled ,'auto_sell_configuration':self .auto_sell_configuration ,'fish_count_until_auto_sell':self .fish_count_until_auto_sell ,'first_launch_warning_shown':self .first_launch_warning_shown ,'use_vip_paths':self .use_vip_paths ,'webhook_roblox_detected':self .webhook_roblox_detected ,'webhook_roblox_reconnected':self .webhook_roblox_reconnected ,'webhook_macro_started':self .webhook_macro_started ,'webhook_macro_stopped':self .webhook_macro_stopped ,'webhook_auto_sell_started':self .webhook_auto_sell_started ,'webhook_back_to_fishing':self .webhook_back_to_fishing ,'webhook_failsafe_triggered':self .webhook_failsafe_triggered ,'webhook_error_notifications':self .webhook_error_notifications ,'webhook_phase_changes':self .webhook_phase_changes ,'webhook_cycle_completion':self .webhook_cycle_completion ,'config_version':'2.1','save_timestamp':datetime .now ().isoformat (),**auto_reconnect_config }
+            config_data ={'coordinates':self .coordinates ,'current_resolution':self .current_resolution ,'webhook_url':self .webhook_url ,'ignore_common':self .ignore_common_fish ,'ignore_uncommon':self .ignore_uncommon_fish ,'ignore_rare':self .ignore_rare_fish ,'ignore_trash':self .ignore_trash ,'mouse_delay_enabled':self .mouse_delay_enabled ,'mouse_delay_ms':self .mouse_delay_ms ,'failsafe_enabled':self .failsafe_enabled ,'failsafe_timeout':self .failsafe_timeout ,'failsafe_reconnect_threshold':self .failsafe_reconnect_threshold ,'failsafe_reconnect_enabled':self .failsafe_reconnect_enabled ,'bar_game_tolerance':self .bar_game_tolerance ,'auto_sell_enabled':self .auto_sell_enabled ,'auto_sell_configuration':self .auto_sell_configuration ,'fish_count_until_auto_sell':self .fish_count_until_auto_sell ,'first_launch_warning_shown':self .first_launch_warning_shown ,'use_vip_paths':self .use_vip_paths ,'webhook_roblox_detected':self .webhook_roblox_detected ,'webhook_roblox_reconnected':self .webhook_roblox_reconnected ,'webhook_macro_started':self .webhook_macro_started ,'webhook_macro_stopped':self .webhook_macro_stopped ,'webhook_auto_sell_started':self .webhook_auto_sell_started ,'webhook_back_to_fishing':self .webhook_back_to_fishing ,'webhook_failsafe_triggered':self .webhook_failsafe_triggered ,'webhook_error_notifications':self .webhook_error_notifications ,'webhook_phase_changes':self .webhook_phase_changes ,'webhook_cycle_completion':self .webhook_cycle_completion ,'capture_backend':self .capture_backend ,'capture_replay_path':self .capture_replay_path ,'capture_recording':self .capture_recording ,'incremental_bar_search':self .incremental_bar_search ,'bar_search_margin':self .bar_search_margin ,'reel_sampling_mode':self .reel_sampling_mode ,'reel_sample_rows':self .reel_sample_rows ,'adaptive_failsafe':self .adaptive_failsafe ,'reel_bar_absent_timeout':self .reel_bar_absent_timeout ,'reel_controller':self .reel_controller_name ,'reel_control_hz':self .reel_control_hz ,'async_input':self .async_input ,'async_catch_processing':self .async_catch_processing ,'ocr_engine':self .ocr_engine_name ,'ocr_preprocess':self .ocr_preprocess ,'ocr_channel':self .ocr_channel ,'ocr_threshold':self .ocr_threshold ,'ocr_scale':self .ocr_scale ,'ocr_denoise':self .ocr_denoise ,'ocr_page_mode':self .ocr_page_mode ,'ocr_use_whitelist':self .ocr_use_whitelist ,'glyph_recognition':self .glyph_recognition ,'glyph_learning':self .glyph_learning ,'glyph_min_confidence':self .glyph_min_confidence ,'catch_cache_enabled':self .catch_cache_enabled ,'catch_cache_size':self .catch_cache_size ,'input_backend':self .input_backend_name ,'config_version':'2.1','save_timestamp':datetime .now ().isoformat (),**auto_reconnect_config }
             if not isinstance (config_data ['coordinates'],dict ):
                 raise ValueError ('Coordinates data is not a dictionary')
             required_coords =['fish_button','white_diamond','reel_bar','completed_border','close_button','mouse_idle_position','shaded_area']
@@ -568,6 +612,60 @@ class MouseAutomation :
                     self .webhook_phase_changes =bool (saved_data ['webhook_phase_changes'])
                 if 'webhook_cycle_completion'in saved_data :
                     self .webhook_cycle_completion =bool (saved_data ['webhook_cycle_completion'])
+                if 'capture_backend'in saved_data :
+                    self .capture_backend =str (saved_data ['capture_backend'])
+                if 'capture_replay_path'in saved_data :
+                    self .capture_replay_path =str (saved_data ['capture_replay_path'])
+                if 'capture_recording'in saved_data :
+                    self .capture_recording =bool (saved_data ['capture_recording'])
+                if 'incremental_bar_search'in saved_data :
+                    self .incremental_bar_search =bool (saved_data ['incremental_bar_search'])
+                if 'bar_search_margin'in saved_data :
+                    self .bar_search_margin =max (8 ,int (saved_data ['bar_search_margin']))
+                if 'reel_sampling_mode'in saved_data and saved_data ['reel_sampling_mode']in ['full','rows']:
+                    self .reel_sampling_mode =saved_data ['reel_sampling_mode']
+                if 'reel_sample_rows'in saved_data :
+                    self .reel_sample_rows =max (1 ,int (saved_data ['reel_sample_rows']))
+                if 'adaptive_failsafe'in saved_data :
+                    self .adaptive_failsafe =bool (saved_data ['adaptive_failsafe'])
+                if 'reel_bar_absent_timeout'in saved_data :
+                    self .reel_bar_absent_timeout =max (0.5 ,float (saved_data ['reel_bar_absent_timeout']))
+                if 'reel_controller'in saved_data and saved_data ['reel_controller']in REEL_CONTROLLERS :
+                    self .reel_controller_name =saved_data ['reel_controller']
+                if 'reel_control_hz'in saved_data :
+                    self .reel_control_hz =min (240 ,max (10 ,int (saved_data ['reel_control_hz'])))
+                if 'async_input'in saved_data :
+                    self .async_input =bool (saved_data ['async_input'])
+                if 'async_catch_processing'in saved_data :
+                    self .async_catch_processing =bool (saved_data ['async_catch_processing'])
+                if 'ocr_engine'in saved_data and saved_data ['ocr_engine']in OCR_ENGINES :
+                    self .ocr_engine_name =saved_data ['ocr_engine']
+                if 'ocr_preprocess'in saved_data :
+                    self .ocr_preprocess =bool (saved_data ['ocr_preprocess'])
+                if 'ocr_channel'in saved_data and saved_data ['ocr_channel']in OCR_CHANNELS :
+                    self .ocr_channel =saved_data ['ocr_channel']
+                if 'ocr_threshold'in saved_data :
+                    self .ocr_threshold ='auto'if saved_data ['ocr_threshold']=='auto'else min (254 ,max (1 ,int (saved_data ['ocr_threshold'])))
+                if 'ocr_scale'in saved_data :
+                    self .ocr_scale =min (4 ,max (1 ,int (saved_data ['ocr_scale'])))
+                if 'ocr_denoise'in saved_data :
+                    self .ocr_denoise =bool (saved_data ['ocr_denoise'])
+                if 'ocr_page_mode'in saved_data :
+                    self .ocr_page_mode =min (13 ,max (0 ,int (saved_data ['ocr_page_mode'])))
+                if 'ocr_use_whitelist'in saved_data :
+                    self .ocr_use_whitelist =bool (saved_data ['ocr_use_whitelist'])
+                if 'glyph_recognition'in saved_data :
+                    self .glyph_recognition =bool (saved_data ['glyph_recognition'])
+                if 'glyph_learning'in saved_data :
+                    self .glyph_learning =bool (saved_data ['glyph_learning'])
+                if 'glyph_min_confidence'in saved_data :
+                    self .glyph_min_confidence =min (0.99 ,max (0.5 ,float (saved_data ['glyph_min_confidence'])))
+                if 'catch_cache_enabled'in saved_data :
+                    self .catch_cache_enabled =bool (saved_data ['catch_cache_enabled'])
+                if 'catch_cache_size'in saved_data :
+                    self .catch_cache_size =min (10000 ,max (16 ,int (saved_data ['catch_cache_size'])))
+                if 'input_backend'in saved_data and saved_data ['input_backend']in INPUT_BACKENDS :
+                    self .input_backend_name =saved_data ['input_backend']
             else :
                 coords_loaded =0 
                 for key ,coord in saved_data .items ():
@@ -614,41 +712,82 @@ class MouseAutomation :
                 pass 
 
     def get_mouse_position (self ):
-        return autoit .mouse_get_pos ()
+        return self .input .mouse_get_pos ()
+
+    def create_capture_backend (self ):
+        try :
+            backend =create_capture_backend (self .capture_backend ,self .capture_replay_path )
+        except Exception as e :
+            print (f"Error creating capture backend '{self .capture_backend }': {e }, falling back to GDI")
+            backend =create_capture_backend ('gdi')
+        if self .capture_recording and backend .name !='replay':
+            # Records the reel strip so a session can be fed back through the replay backend.
+            backend =RecordingCaptureBackend (backend ,normalize_region (self .coordinates ['reel_bar']))
+        return backend 
+
+    def get_capture_recording_path (self ):
+        return os .path .join (os .path .dirname (os .path .abspath (self .config_file )),'capture_recording.npz')
+
+    def save_capture_recording (self ):
+        backend =self .frame_capture .backend 
+        if not isinstance (backend ,RecordingCaptureBackend )or not backend .frames :
+            return 
+        try :
+            path =backend .save (self .get_capture_recording_path ())
+            print (f'Captured {len (backend .frames )} frames to {path }')
+            backend .clear ()
+        except Exception as e :
+            print (f'Error saving capture recording: {e }')
+
+    def set_capture_backend (self ,backend_name ,replay_path =None ):
+        self .capture_backend =backend_name 
+        if replay_path is not None :
+            self .capture_replay_path =replay_path 
+        self .frame_capture .set_backend (self .create_capture_backend ())
+        print (f'Capture backend set to: {self .frame_capture .backend .name }')
+
+    def grab_pixels (self ,bbox ):
+        return self .frame_capture .grab_pixels (bbox )
+
+    def capture_regions (self ,regions ):
+        try :
+            return self .frame_capture .grab (regions )
+        except Exception as e :
+            print (f'Error capturing frame: {e }')
+            return None 
 
-    def get_pixel_color (self ,x ,y ):
-        screenshot =ImageGrab .grab (bbox =(x ,y ,x +1 ,y +1 ))
-        return screenshot .getpixel ((0 ,0 ))
+    def get_pixel_color (self ,x ,y ,frame =None ):
+        if frame is not None and frame .contains ((x ,y )):
+            return frame .pixel (x ,y )
+        r ,g ,b =self .grab_pixels ((x ,y ,x +1 ,y +1 ))[0 ,0 ,:3 ]
+        return (int (r ),int (g ),int (b ))
 
     def is_white_pixel (self ,color ,tolerance =10 ):
         r ,g ,b =color [:3 ]
         return all ((c >=255 -tolerance for c in [r ,g ,b ]))
 
-    def pixel_search_white (self ,x ,y ,tolerance =10 ):
+    def pixel_search_white (self ,x ,y ,tolerance =10 ,frame =None ):
         try :
-            color =self .get_pixel_color (x ,y )
+            color =self .get_pixel_color (x ,y ,frame =frame )
             return color ==(255 ,255 ,255 )or self .is_white_pixel (color ,tolerance )
         except :
             return False 
 
-    def pixel_search_color (self ,x1 ,y1 ,x2 ,y2 ,target_color ,tolerance =5 ):
+    def pixel_search_color (self ,x1 ,y1 ,x2 ,y2 ,target_color ,tolerance =5 ,frame =None ):
         if self .numpy_available :
             try :
-                screenshot =ImageGrab .grab (bbox =(x1 ,y1 ,x2 ,y2 ))
-                img_array =self .np .array (screenshot )
-                target_r ,target_g ,target_b =target_color [:3 ]
-                r_diff =self .np .abs (img_array [:,:,0 ].astype (self .np .int16 )-target_r )<=tolerance 
-                g_diff =self .np .abs (img_array [:,:,1 ].astype (self .np .int16 )-target_g )<=tolerance 
-                b_diff =self .np .abs (img_array [:,:,2 ].astype (self .np .int16 )-target_b )<=tolerance 
-                matches =r_diff &g_diff &b_diff 
-                match_coords =self .np .where (matches )
-                if len (match_coords [0 ])>0 :
-                    return (x1 +match_coords [1 ][0 ],y1 +match_coords [0 ][0 ])
+                if frame is not None and frame .contains ((x1 ,y1 ,x2 ,y2 )):
+                    img_array =frame .view ((x1 ,y1 ,x2 ,y2 ))
+                else :
+                    img_array =self .grab_pixels ((x1 ,y1 ,x2 ,y2 ))
+                match =self .get_color_matcher (target_color ,tolerance ).first_match (img_array )
+                if match is not None :
+                    return (x1 +match [0 ],y1 +match [1 ])
                 return None 
             except :
                 pass 
         try :
-            screenshot =ImageGrab .grab (bbox =(x1 ,y1 ,x2 ,y2 ))
+            screenshot =Image .fromarray (self .grab_pixels ((x1 ,y1 ,x2 ,y2 )))
             width ,height =screenshot .size 
             sample_points =[(width //4 ,height //2 ),(width //2 ,height //2 ),(3 *width //4 ,height //2 ),(width //2 ,height //4 ),(width //2 ,3 *height //4 )]
             for x ,y in sample_points :
@@ -660,6 +799,87 @@ class MouseAutomation :
         except :
             return None 
 
+    def get_color_matcher (self ,target_color ,tolerance ):
+        matcher =self ._color_matcher 
+        if matcher is None or matcher .target_color !=tuple (target_color [:3 ])or matcher .tolerance !=tolerance :
+            matcher =create_color_matcher (target_color ,tolerance )
+            self ._color_matcher =matcher 
+        return matcher 
+
+    def get_reel_search_region (self ):
+        reel_area =normalize_region (self .coordinates ['reel_bar'])
+        now =get_clock ().perf_counter ()
+        search_region =reel_area 
+        if self .incremental_bar_search :
+            self .bar_search_window .margin =self .bar_search_margin 
+            search_region =self .bar_search_window .region (reel_area ,self .bar_tracker .last_state ,now )
+        if self .reel_sampling_mode =='rows':
+            sampler =self .reel_strip_sampler 
+            if self ._reel_sampler_area !=reel_area or sampler .rows !=self .reel_sample_rows :
+                sampler .rows =max (1 ,int (self .reel_sample_rows ))
+                sampler .reset ()
+                self ._reel_sampler_area =reel_area 
+            if not sampler .verification_due (now ):
+                search_region =sampler .apply (search_region ,reel_area )
+        return search_region 
+
+    @property 
+    def input (self ):
+        return get_input_backend ()
+
+    def set_input_backend (self ,name ):
+        if name not in INPUT_BACKENDS :
+            print (f'Unknown input backend {name }, using auto')
+            name ='auto'
+        self .input_backend_name =name 
+        return set_input_backend (create_input_backend (name ))
+
+    def set_reel_controller (self ,name ):
+        if name not in REEL_CONTROLLERS :
+            print (f'Unknown reel controller {name }, using classic')
+            name ='classic'
+        self .reel_controller_name =name 
+        self .reel_controller =create_reel_controller (name )
+        return self .reel_controller 
+
+    def get_catch_panel_region (self ):
+        x1 ,y1 ,x2 ,y2 =normalize_region (self .coordinates ['fish_caught_desc'])
+        row =y1 +(y2 -y1 )*3 //4 
+        return (x1 ,row ,x2 ,row +1 )
+
+    def catch_panel_visible (self ):
+        frame =self .capture_regions ({'catch_panel':self .get_catch_panel_region ()})
+        if frame is None :
+            return False 
+        return self .reel_completion .panel_changed (frame .view ('catch_panel'))
+
+    def track_reel_bar (self ,frame ,search_region =None ):
+        reel_area =normalize_region (self .coordinates ['reel_bar'])
+        search_region =normalize_region (search_region )if search_region else reel_area 
+        timestamp =frame .timestamp if frame is not None else get_clock ().perf_counter ()
+        measurement =None 
+        full_height =search_region [1 ]==reel_area [1 ]and search_region [3 ]==reel_area [3 ]
+        if frame is not None and frame .contains (search_region ):
+            measurement =self .bar_tracker .measure (frame .view (search_region ),search_region [0 ])
+        needs_full_scan =self .bar_search_window .needs_full_scan (measurement ,search_region ,reel_area )
+        if needs_full_scan :
+            self .bar_search_window .fallbacks +=1 
+        elif measurement is None and not full_height :
+            needs_full_scan =self .reel_strip_sampler .allow_miss_check (timestamp )
+            if not needs_full_scan and self .bar_tracker .last_state is not None :
+                # Only a full-strip grab can confirm the bar is gone; until the next one is allowed, hold the last reading.
+                return self .bar_tracker .last_state 
+        if needs_full_scan :
+            full_frame =self .capture_regions ({'reel_bar':reel_area })
+            measurement =None 
+            full_height =True 
+            if full_frame is not None :
+                measurement =self .bar_tracker .measure (full_frame .view (reel_area ),reel_area [0 ])
+                timestamp =full_frame .timestamp 
+        if full_height and measurement is not None and self .reel_sampling_mode =='rows':
+            self .reel_strip_sampler .select_band (self .bar_tracker .last_mask ,timestamp )
+        return self .bar_tracker .record (measurement ,timestamp )
+
     def color_match (self ,color1 ,color2 ,tolerance ):
         return all ((abs (c1 -c2 )<=tolerance for c1 ,c2 in zip (color1 ,color2 )))
 
@@ -674,6 +894,8 @@ class MouseAutomation :
             print(f"Error loading local fish-data.json: {e}")
             self.fish_data = {}
             local_data = None
+        if self.offline:
+            return
         try:
             response = requests.get(github_url, timeout=5)
             if response.status_code == 200:
@@ -700,22 +922,56 @@ class MouseAutomation :
                 count += 1
         return count
 
-    def extract_fish_name (self ):
-        if 'fish_caught_desc'not in self .coordinates :
+    def capture_catch_description (self ):
+        desc_x1 ,desc_y1 ,desc_x2 ,desc_y2 =self .coordinates ['fish_caught_desc']
+        return self .np .array (self .grab_pixels ((desc_x1 ,desc_y1 ,desc_x2 ,desc_y2 )))
+
+    def process_catch (self ,image ,context =None ):
+        started =get_clock ().perf_counter ()
+        fish_name ,mutation =self .run_with_timeout (self .extract_fish_name ,5 ,('Unknown Fish',None ),image )
+        recognized =get_clock ().perf_counter ()
+        self .latency_histograms ['ocr'].record (recognized -started )
+        if context and context .get ('caught'):
+            fish_info =self .fish_data .get (fish_name )
+            self .session_stats .record_rarity (fish_info .get ('rarity')if isinstance (fish_info ,dict )else None )
+        self .send_webhook_message (fish_name ,mutation )
+        self .latency_histograms ['webhook'].record (get_clock ().perf_counter ()-recognized )
+        print (f'Processed catch: {fish_name }'+(f' ({mutation })'if mutation else ''))
+        return (fish_name ,mutation )
+
+    def extract_fish_name (self ,image =None ):
+        if image is None and 'fish_caught_desc'not in self .coordinates :
             return ('Unknown Fish',None )
         try :
-            desc_x1 ,desc_y1 ,desc_x2 ,desc_y2 =self .coordinates ['fish_caught_desc']
-            screenshot =ImageGrab .grab (bbox =(desc_x1 ,desc_y1 ,desc_x2 ,desc_y2 ))
+            if image is None :
+                image =self .capture_catch_description ()
+            cache_key =None 
+            if self .catch_cache_enabled :
+                cache_key ,cached =self .lookup_catch_cache (image )
+                if cached :
+                    return cached 
+            if self .glyph_recognition :
+                result =self .recognize_fish_name_glyphs (image )
+                if result :
+                    self .store_catch_cache (cache_key ,result )
+                    return result 
+            screenshot =Image .fromarray (image )
             try :
                 screenshot .save ('debug_ocr_capture.png')
             except Exception as e :
                 pass 
-            fish_description =self .ocr_extract_tesseract (screenshot )
+            fish_description =self .ocr_extract_tesseract (self .preprocess_ocr_image (image )if self .ocr_preprocess else screenshot )
             if not fish_description .strip ():
                 return ('Unknown Fish',None )
-            fish_description =self .clean_ocr_text (fish_description )
+            ocr_text =fish_description 
+            fish_description =self .clean_ocr_text (ocr_text )
             fish_name ,mutation =self .search_for_fish_name (fish_description )
             if fish_name !='Unknown Fish':
+                # Only reads that resolve exactly to a known name are trusted to train the atlas or fill the cache.
+                if self .is_exact_fish_name (ocr_text ,fish_name ,mutation ):
+                    self .store_catch_cache (cache_key ,(fish_name ,mutation ))
+                    if self .glyph_recognition and self .glyph_learning :
+                        self .learn_fish_name_glyphs (image ,ocr_text )
                 return (fish_name ,mutation )
             return ('Unknown Fish',None )
         except Exception as e :
@@ -723,9 +979,8 @@ class MouseAutomation :
             return ('Unknown Fish',None )
 
     def search_for_fish_name (self ,fish_description ):
-        mutations =['Ruffled','Crusted','Slick','Rough','Charred','Shimmering','Tainted','Hollow','Lucid','Fragmented']
         mutation_found =None 
-        for mutation in mutations :
+        for mutation in FISH_MUTATIONS :
             if mutation .lower ()in fish_description .lower ():
                 mutation_found =mutation 
                 fish_description =fish_description .lower ().replace (mutation .lower (),'').strip ()
@@ -743,35 +998,128 @@ class MouseAutomation :
             text =text .replace (wrong ,right )
         return text 
 
+    def get_ocr_engine (self ):
+        # Created on first use, which is on the catch processor thread, and kept loaded for the whole session.
+        if self .ocr_engine is None :
+            self .ocr_engine =create_ocr_engine (self .ocr_engine_name )
+            print (f'OCR engine: {self .ocr_engine .name }')
+        return self .ocr_engine 
+
+    def preprocess_ocr_image (self ,image ):
+        try :
+            return OcrPreprocessor (self .ocr_channel ,self .ocr_threshold ,self .ocr_scale ,denoise =self .ocr_denoise ).apply (image )
+        except Exception as e :
+            print (f'OCR preprocessing failed, using the raw capture: {e }')
+            return image 
+
+    def get_ocr_whitelist (self ):
+        # Fish names and mutations only use a small alphabet; rebuilt whenever fish data is reloaded.
+        if self ._ocr_whitelist_source is not self .fish_data :
+            letters =set (''.join (list (self .fish_data )+FISH_MUTATIONS ))
+            letters |={c .swapcase ()for c in letters }
+            self ._ocr_whitelist =''.join (sorted (c for c in letters if not c .isspace ()))
+            self ._ocr_whitelist_source =self .fish_data 
+        return self ._ocr_whitelist 
+
     def ocr_extract_tesseract (self ,image ):
         try :
-            result =pytesseract .image_to_string (image )
-            return result 
-        except pytesseract .TesseractNotFoundError :
-            print ('Tesseract OCR not found. Attempting to reconfigure...')
-            if setup_tesseract ():
-                try :
-                    result =pytesseract .image_to_string (image )
-                    return result 
-                except Exception as e :
-                    pass 
-            return 'Unknown Fish'
+            return self .get_ocr_engine ().recognize (image ,self .ocr_page_mode ,self .get_ocr_whitelist ()if self .ocr_use_whitelist else None )
         except Exception as e :
+            print (f'OCR failed: {e }')
             return 'Unknown Fish'
 
-    def extract_fish_name_with_timeout (self ):
+    def get_glyph_atlas_path (self ):
+        return os .path .join (os .path .dirname (os .path .abspath (self .config_file )),'glyph_atlas.json')
+
+    def get_glyph_recognizer (self ):
+        if self .glyph_recognizer is None :
+            try :
+                atlas =GlyphAtlas .load (self .get_glyph_atlas_path ())
+            except Exception as e :
+                print (f'Error loading glyph atlas, starting a new one: {e }')
+                atlas =GlyphAtlas ()
+            self .glyph_recognizer =GlyphRecognizer (atlas ,OcrPreprocessor (self .ocr_channel ,self .ocr_threshold ,1 ,0 ,denoise =self .ocr_denoise ),self .glyph_min_confidence )
+        return self .glyph_recognizer 
+
+    def recognize_fish_name_glyphs (self ,image ):
         try :
-            result =self .run_with_timeout (self .extract_fish_name ,timeout_seconds =5 ,default_result =('Unknown Fish',None ))
-            return result 
+            recognizer =self .get_glyph_recognizer ()
+            text ,confidence =recognizer .recognize (image )
+            if text .strip ()and confidence >=recognizer .min_confidence :
+                fish_name ,mutation =self .search_for_fish_name (text .lower ())
+                # Templates for look-alikes such as i and l can still swap, so the fast path only takes exact names.
+                if fish_name !='Unknown Fish'and self .is_exact_fish_name (text ,fish_name ,mutation ):
+                    recognizer .record (True )
+                    return (fish_name ,mutation )
+            recognizer .record (False )
         except Exception as e :
-            print (f'Error in extract_fish_name_with_timeout: {e }')
-            return ('Unknown Fish',None )
+            print (f'Glyph recognition failed: {e }')
+        return None 
+
+    def is_exact_fish_name (self ,text ,fish_name ,mutation ):
+        remainder =' '.join (text .split ()).lower ()
+        if mutation :
+            remainder =' '.join (remainder .replace (mutation .lower (),'').split ())
+        return remainder ==fish_name .lower ()
+
+    def learn_fish_name_glyphs (self ,image ,text ):
+        try :
+            self .get_glyph_recognizer ().learn (image ,' '.join (text .split ()))
+        except Exception as e :
+            print (f'Error learning glyph templates: {e }')
+
+    def save_glyph_atlas (self ):
+        recognizer =self .glyph_recognizer 
+        if recognizer is None :
+            return 
+        if recognizer .hits or recognizer .misses :
+            print (f'Glyph recognition: {recognizer .summary_line ()}')
+        if recognizer .atlas .dirty :
+            try :
+                path =self .get_glyph_atlas_path ()
+                recognizer .atlas .save (path )
+                print (f'Glyph atlas saved to {path }')
+            except Exception as e :
+                print (f'Error saving glyph atlas: {e }')
 
-    def send_webhook_message_with_timeout (self ,fish_name ,mutation ):
+    def get_catch_cache_path (self ):
+        return os .path .join (os .path .dirname (os .path .abspath (self .config_file )),'catch_cache.json')
+
+    def get_catch_cache (self ):
+        if self .catch_cache is None :
+            self .catch_cache =CatchCache (self .catch_cache_size ,preprocessor =OcrPreprocessor (self .ocr_channel ,self .ocr_threshold ,1 ,0 ,denoise =self .ocr_denoise ))
+            try :
+                self .catch_cache .load (self .get_catch_cache_path ())
+            except Exception as e :
+                print (f'Error loading catch cache, starting a new one: {e }')
+        return self .catch_cache 
+
+    def lookup_catch_cache (self ,image ):
         try :
-            self .run_with_timeout (self .send_webhook_message ,5 ,None ,fish_name ,mutation )
+            cache =self .get_catch_cache ()
+            key =cache .key (image )
+            return (key ,cache .lookup (key ,lambda result :result [0 ]in self .fish_data ))
         except Exception as e :
-            print (f'Error in send_webhook_message_with_timeout: {e }')
+            print (f'Catch cache lookup failed: {e }')
+            return (None ,None )
+
+    def store_catch_cache (self ,key ,result ):
+        if key and self .catch_cache is not None :
+            self .catch_cache .store (key ,result )
+
+    def save_catch_cache (self ):
+        cache =self .catch_cache 
+        if cache is None :
+            return 
+        if cache .hits or cache .misses :
+            print (f'Catch cache: {cache .summary_line ()}')
+        if cache .dirty :
+            try :
+                path =self .get_catch_cache_path ()
+                cache .save (path )
+                print (f'Catch cache saved to {path }')
+            except Exception as e :
+                print (f'Error saving catch cache: {e }')
 
     def get_rarity_color (self ,rarity ):
         rarity_colors ={'Common':12566463 ,'Uncommon':5094750 ,'Rare':2063812, 'Legendary':0xA11313 }
@@ -897,7 +1245,7 @@ class MouseAutomation :
     def send_macro_stopped_notification (self ):
         elapsed_time =''
         if hasattr (self ,'start_time')and self .start_time :
-            elapsed =time .time ()-self .start_time 
+            elapsed =get_clock ().time ()-self .start_time 
             hours =int (elapsed //3600 )
             minutes =int (elapsed %3600 //60 )
             seconds =int (elapsed %60 )
@@ -1003,11 +1351,11 @@ class MouseAutomation :
             for _ in range (chunks ):
                 if self .check_emergency_stop ():
                     return False 
-                time .sleep (chunk_size )
+                get_clock ().sleep (chunk_size )
             if remainder >0 :
                 if self .check_emergency_stop ():
                     return False 
-                time .sleep (remainder )
+                get_clock ().sleep (remainder )
         return True 
 
     def perform_drag_up (self ):
@@ -1022,13 +1370,13 @@ class MouseAutomation :
             center_x =screen_width //2 
             start_y =int (screen_height *0.8 )
             end_y =int (screen_height *0.2 )
-            autoit .mouse_move (x =center_x ,y =start_y ,speed =0 )
-            time .sleep (0.1 )
-            autoit .mouse_down ('right')
-            time .sleep (0.1 )
-            autoit .mouse_move (x =center_x ,y =end_y ,speed =10 )
-            time .sleep (0.1 )
-            autoit .mouse_up ('right')
+            self .input .mouse_move (x =center_x ,y =start_y ,speed =0 )
+            get_clock ().sleep (0.1 )
+            self .input .mouse_down ('right')
+            get_clock ().sleep (0.1 )
+            self .input .mouse_move (x =center_x ,y =end_y ,speed =10 )
+            get_clock ().sleep (0.1 )
+            self .input .mouse_up ('right')
         except Exception as e :
             pass 
 
@@ -1090,15 +1438,15 @@ class MouseAutomation :
             coord =self .coordinates [coord_name ]
             if len (coord )>=2 :
                 x ,y =(coord [0 ],coord [1 ])
-                autoit .mouse_move (x ,y ,3 )
+                self .input .mouse_move (x ,y ,3 )
                 if not self .apply_mouse_delay ():
                     print (f'Emergency stop detected during mouse delay for {coord_name }')
                     return False 
-                time .sleep (0.3 )
+                get_clock ().sleep (0.3 )
                 if self .check_emergency_stop ():
                     print (f'Emergency stop detected before clicking {coord_name }')
                     return False 
-                autoit .mouse_click ('left')
+                self .input .mouse_click ('left')
                 if not self .apply_mouse_delay ():
                     print (f'Emergency stop detected during post-click delay for {coord_name }')
                     return False 
@@ -1109,7 +1457,7 @@ class MouseAutomation :
                         print (f'Emergency stop detected during {coord_name } delay')
                         return False 
                     sleep_time =min (chunk_size ,remaining_delay )
-                    time .sleep (sleep_time )
+                    get_clock ().sleep (sleep_time )
                     remaining_delay -=sleep_time 
                 return True 
             else :
@@ -1119,13 +1467,15 @@ class MouseAutomation :
             print (f'Error clicking {coord_name }: {e }')
             return False 
 
-    def execute_failsafe (self ):
+    def execute_failsafe (self ,counted =True ):
         if self .auto_reconnect_in_progress :
             print ('Skipping failsafe - auto reconnect in progress')
             return False 
-        self .failsafe_consecutive_count +=1 
+        if counted :
+            self .failsafe_consecutive_count +=1 
+        self .session_stats .record_failsafe ()
         print (f'Failsafe activated ({self .failsafe_consecutive_count }/{self .failsafe_reconnect_threshold }) - attempting to recover from soft lock...')
-        if self .failsafe_reconnect_enabled and self .failsafe_consecutive_count >=self .failsafe_reconnect_threshold :
+        if counted and self .failsafe_reconnect_enabled and self .failsafe_consecutive_count >=self .failsafe_reconnect_threshold :
             print (f'Failsafe threshold reached ({self .failsafe_consecutive_count } consecutive triggers) - initiating auto-reconnect...')
             self .send_failsafe_reconnect_notification (self .failsafe_consecutive_count )
             self .failsafe_consecutive_count =0 
@@ -1139,28 +1489,44 @@ class MouseAutomation :
                 return False 
         self .send_failsafe_triggered_notification ('White diamond timeout - attempting recovery',consecutive_count =self .failsafe_consecutive_count )
         close_x ,close_y =self .coordinates ['close_button']
-        autoit .mouse_move (close_x ,close_y ,3 )
-        time .sleep (0.3 )
-        autoit .mouse_click ('left')
+        self .input .mouse_move (close_x ,close_y ,3 )
+        get_clock ().sleep (0.3 )
+        self .input .mouse_click ('left')
         self .apply_mouse_delay ()
-        time .sleep (0.3 )
+        get_clock ().sleep (0.3 )
         confirm_x ,confirm_y =self .coordinates ['confirm_button']
-        autoit .mouse_move (confirm_x ,confirm_y ,3 )
-        time .sleep (0.15 )
-        autoit .mouse_click ('left')
+        self .input .mouse_move (confirm_x ,confirm_y ,3 )
+        get_clock ().sleep (0.15 )
+        self .input .mouse_click ('left')
         self .apply_mouse_delay ()
-        time .sleep (0.3 )
+        get_clock ().sleep (0.3 )
         fish_x ,fish_y =self .coordinates ['fish_button']
-        autoit .mouse_move (fish_x ,fish_y ,3 )
-        time .sleep (0.15 )
-        autoit .mouse_click ('left')
+        self .input .mouse_move (fish_x ,fish_y ,3 )
+        get_clock ().sleep (0.15 )
+        self .input .mouse_click ('left')
         self .apply_mouse_delay ()
-        time .sleep (0.15 )
+        get_clock ().sleep (0.15 )
         return False 
 
     def should_auto_reconnect (self ):
         return self .auto_reconnect_manager .should_auto_reconnect ()
 
+    def get_wait_cancel_reason (self ):
+        if self .check_emergency_stop ():
+            return 'emergency_stop'
+        if self .should_auto_reconnect ():
+            return 'auto_reconnect'
+        return None 
+
+    def get_failsafe_timeout (self ):
+        if self .adaptive_failsafe :
+            return self .bite_poll_policy .deadline (self .failsafe_timeout )
+        return self .failsafe_timeout 
+
+    def wait_for_condition (self ,predicate ,timeout =None ,poll_policy =None ):
+        deadline =get_clock ().perf_counter ()+timeout if timeout is not None else None 
+        return wait_for_condition (predicate ,deadline ,poll_policy ,(self .emergency_stop_event ,self .get_wait_cancel_reason ))
+
     def get_auto_reconnect_time_remaining (self ):
         return self .auto_reconnect_manager .get_auto_reconnect_time_remaining ()
 
@@ -1179,8 +1545,9 @@ class MouseAutomation :
                 if self .check_emergency_stop ():
                     print ('Emergency stop detected in main loop, exiting...')
                     break 
+                self .input .set_phase (self .automation_phase )
                 if self .auto_reconnect_in_progress :
-                    time .sleep (0.5 )
+                    get_clock ().sleep (0.5 )
                     continue 
                 if self .should_auto_reconnect ():
                     if self .perform_auto_reconnect ():
@@ -1196,16 +1563,16 @@ class MouseAutomation :
                         if not self .click_coordinate ('collection_button',1.0 ):
                             print ('Failed to click collection button, retrying...')
                             continue 
-                        time .sleep (1.0 )
+                        get_clock ().sleep (1.0 )
                         if not self .click_coordinate ('exit_collections',1.0 ):
                             print ('Failed to click exit collections, retrying...')
                             continue 
                         if not self .run_external_script ('autoalign',delay =2 ):
                             print ('Failed to run autoalign script')
-                        time .sleep (1.0 )
+                        get_clock ().sleep (1.0 )
                         if not self .run_external_script ('fishinglocation',delay =2 ):
                             print ('Failed to run fishing location script')
-                        time .sleep (1.0 )
+                        get_clock ().sleep (1.0 )
                         self .current_fish_count =0 
                         self .automation_phase ='fishing'
                     if self .automation_phase =='fishing':
@@ -1216,6 +1583,7 @@ class MouseAutomation :
                         elif not self .auto_sell_enabled :
                             pass 
                         fish_caught =self .perform_single_fishing_cycle ()
+                        self .record_cycle (fish_caught )
                         if fish_caught =='auto_reconnect':
                             if self .perform_auto_reconnect ():
                                 self .current_fish_count =0 
@@ -1234,25 +1602,25 @@ class MouseAutomation :
                         if not self .click_coordinate ('collection_button',1.0 ):
                             print ('Failed to click collection button for sell phase')
                             continue 
-                        time .sleep (1.0 )
+                        get_clock ().sleep (1.0 )
                         if not self .click_coordinate ('exit_collections',1.0 ):
                             print ('Failed to click exit collections for sell phase')
                             continue 
                         if not self .run_external_script ('autoalign',delay =2 ):
                             print ('Failed to run autoalign script for sell phase')
-                        time .sleep (1.0 )
+                        get_clock ().sleep (1.0 )
                         if not self .run_external_script ('shoppath',delay =2 ):
                             pass 
-                        time .sleep (1.0 )
+                        get_clock ().sleep (1.0 )
                         if not self .toggle or not self .running :
                             break 
                         self .perform_drag_up ()
-                        time .sleep (4.0 )
+                        get_clock ().sleep (4.0 )
                         if not self .toggle or not self .running :
                             break 
                         if not self .click_coordinate ('sell_fish_shop',1.0 ):
                             continue 
-                        time .sleep (1.0 )
+                        get_clock ().sleep (1.0 )
                         self .automation_phase ='selling'
                     elif self .automation_phase =='selling':
                         if self .auto_sell_configuration =='Sell All (Recommended)':
@@ -1271,14 +1639,14 @@ class MouseAutomation :
                                     pass 
                             else :
                                 break 
-                            time .sleep (0.5 )
-                        time .sleep (1.0 )
+                            get_clock ().sleep (0.5 )
+                        get_clock ().sleep (1.0 )
                         if not self .click_coordinate ('exit_fish_shop',1.0 ):
                             pass 
-                        time .sleep (1.0 )
+                        get_clock ().sleep (1.0 )
                         self .send_cycle_completion_notification ('selling',sell_count )
                         self .send_back_to_fishing_notification ()
-                        self .automation_phase ='initialization'
+                        self .automation_phase ='post_sell'
                 except Exception as e :
                     print (f"Error in macro phase '{self .automation_phase }': {e }")
                     self .send_error_notification (f'Macro Phase Error',f'Error in {self .automation_phase }: {str (e )}')
@@ -1301,96 +1669,179 @@ class MouseAutomation :
         finally :
             print ('Macro loop ended')
 
+    def get_latency_histogram_path (self ):
+        return os .path .join (os .path .dirname (os .path .abspath (self .config_file )),'latency_histograms.json')
+
+    def save_latency_histograms (self ):
+        if not any (histogram .count for histogram in self .latency_histograms .values ()):
+            return 
+        for stage ,histogram in self .latency_histograms .items ():
+            if histogram .count :
+                print (f'Latency {stage }: {histogram .summary_line ()}')
+        try :
+            path =self .get_latency_histogram_path ()
+            histograms =merge_histograms (load_histograms (path ),self .latency_histograms )
+            dump_histograms (histograms ,path ,machine =platform .node ())
+            print (f'Latency histograms saved to {path }')
+        except Exception as e :
+            print (f'Error saving latency histograms: {e }')
+        for histogram in self .latency_histograms .values ():
+            histogram .reset ()
+
+    def record_cycle (self ,outcome ):
+        telemetry =self .cycle_telemetry 
+        cycle =telemetry .finish_cycle (outcome )
+        if cycle is None :
+            return 
+        if isinstance (outcome ,bool )and not self .check_emergency_stop ():
+            self .session_stats .record_cycle (cycle ['total'],outcome and self .last_cycle_caught )
+        print (f'Cycle timing: {telemetry .last_cycle_line ()}')
+        if self .cycle_telemetry_log_every and telemetry .total_cycles %self .cycle_telemetry_log_every ==0 :
+            print (f'Cycle timing over the last {len (telemetry .cycles )} cycles:')
+            for line in telemetry .summary_lines ():
+                print (f'  {line }')
+            print (f'Session stats: {self .session_stats .summary_line ()}')
+
     def perform_single_fishing_cycle (self ):
+        telemetry =self .cycle_telemetry 
+        telemetry .start_cycle ()
+        self .last_cycle_caught =False 
         try :
+            self .input .set_phase ('fishing:cast')
             fish_x ,fish_y =self .coordinates ['fish_button']
-            autoit .mouse_move (fish_x ,fish_y ,3 )
-            time .sleep (0.15 )
-            autoit .mouse_click ('left')
+            self .input .mouse_move (fish_x ,fish_y ,3 )
+            get_clock ().sleep (0.15 )
+            self .input .mouse_click ('left')
             self .apply_mouse_delay ()
-            time .sleep (0.15 )
-            bar_color =None 
-            white_diamond_start_time =time .time ()
+            get_clock ().sleep (0.15 )
+            telemetry .mark ('cast')
+            check_x ,check_y =self .coordinates ['white_diamond']
+            white_diamond_start_time =get_clock ().perf_counter ()
+            clean_wait =True 
             while True :
-                if self .check_emergency_stop ():
+                failsafe_timeout =self .get_failsafe_timeout ()
+                result =self .wait_for_condition (lambda :self .pixel_search_white (check_x ,check_y ),failsafe_timeout if self .failsafe_enabled else None ,self .bite_poll_policy )
+                if result .met :
+                    break 
+                if result .cancelled :
+                    if result .reason =='auto_reconnect':
+                        return 'auto_reconnect'
                     print ('Emergency stop detected during white diamond wait')
                     return False 
-                if self .should_auto_reconnect ():
-                    return 'auto_reconnect'
-                check_x ,check_y =self .coordinates ['white_diamond']
-                if self .pixel_search_white (check_x ,check_y ):
-                    self .failsafe_consecutive_count =0 
-                    idle_x ,idle_y =self .coordinates ['mouse_idle_position']
-                    autoit .mouse_move (idle_x ,idle_y ,3 )
-                    time .sleep (0.025 )
-                    shaded_x ,shaded_y =self .coordinates ['shaded_area']
-                    bar_color =self .get_pixel_color (shaded_x ,shaded_y )
-                    print (f'Detected bar color: {bar_color }')
-                    break 
-                elapsed_time =time .time ()-white_diamond_start_time 
-                if self .failsafe_enabled and elapsed_time >self .failsafe_timeout :
-                    if self .auto_reconnect_in_progress :
-                        print (f'Failsafe check: Auto reconnect in progress, skipping failsafe (elapsed: {elapsed_time :.1f}s)')
-                    else :
-                        print (f'Failsafe triggered: No white diamond detected within {self .failsafe_timeout } seconds (elapsed: {elapsed_time :.1f}s)')
-                        reconnect_happened =self .execute_failsafe ()
-                        if reconnect_happened :
-                            return 'auto_reconnect_after_failsafe'
-                        else :
-                            white_diamond_start_time =time .time ()
-                            continue 
-                time .sleep (0.05 )
-            start_time =time .time ()
-            loop_count =0 
-            ready_to_stop =False 
-            extra_clicks_after_ready =0 
+                elapsed_time =get_clock ().perf_counter ()-white_diamond_start_time 
+                clean_wait =False 
+                if self .auto_reconnect_in_progress :
+                    print (f'Failsafe check: Auto reconnect in progress, skipping failsafe (elapsed: {elapsed_time :.1f}s)')
+                    continue 
+                print (f'Failsafe triggered: No white diamond detected within {failsafe_timeout :.1f} seconds (elapsed: {elapsed_time :.1f}s)')
+                if self .adaptive_failsafe :
+                    self .bite_poll_policy .timed_out ()
+                # Only a wait that also outlasted the configured timeout counts towards reconnecting; a short learned deadline alone is not a soft lock.
+                if self .execute_failsafe (counted =elapsed_time >=self .failsafe_timeout ):
+                    return 'auto_reconnect_after_failsafe'
+                white_diamond_start_time =get_clock ().perf_counter ()
+            telemetry .mark ('bite_wait')
+            if clean_wait :
+                self .bite_poll_policy .observe (get_clock ().perf_counter ()-white_diamond_start_time )
+            self .failsafe_consecutive_count =0 
+            idle_x ,idle_y =self .coordinates ['mouse_idle_position']
+            self .input .mouse_move (idle_x ,idle_y ,3 )
+            get_clock ().sleep (0.025 )
+            shaded_x ,shaded_y =self .coordinates ['shaded_area']
+            bar_color =self .get_pixel_color (shaded_x ,shaded_y )
+            print (f'Detected bar color: {bar_color }')
+            self .bar_tracker .set_matcher (self .get_color_matcher (bar_color ,self .bar_game_tolerance ))
+            completion =self .reel_completion 
+            completion .bar_absent_timeout =self .reel_bar_absent_timeout 
+            completion .start (get_clock ().perf_counter ())
+            completed_x ,completed_y =self .coordinates ['completed_border']
+            panel_region =self .get_catch_panel_region ()
+            # The panel row is a separate one-pixel grab; folding it into the reel union would stretch every capture up to the panel.
+            panel_frame =self .capture_regions ({'catch_panel':panel_region })
+            if panel_frame is not None :
+                completion .panel_changed (panel_frame .view ('catch_panel'))
+            controller =self .reel_controller 
+            controller .reset (normalize_region (self .coordinates ['reel_bar']),shaded_x )
+            tick_loop =self .reel_tick_loop 
+            tick_loop .set_rate (self .reel_control_hz )
+            tick_loop .start ()
+            self .input .set_phase ('fishing:reel')
+            dispatcher =self .input_dispatcher 
+            dispatcher .synchronous =not self .async_input 
+            histograms =self .latency_histograms 
+            dispatcher .reset_stats ()
             while True :
+                tick_loop .wait ()
                 if self .check_emergency_stop ():
                     print ('Emergency stop detected during reeling')
                     break 
-                if time .time ()-start_time >9 :
-                    break 
                 if self .should_auto_reconnect ():
                     return 'auto_reconnect'
-                loop_count +=1 
-                if loop_count %50 ==0 :
-                    completed_x ,completed_y =self .coordinates ['completed_border']
-                    if self .pixel_search_white (completed_x ,completed_y ,tolerance =15 ):
-                        time .sleep (1.0 )
-                        break 
-                search_area =self .coordinates ['reel_bar']
-                found_pos =self .pixel_search_color (*search_area ,bar_color ,tolerance =5 )
-                if found_pos is None :
-
-                    autoit .mouse_click ('left')
-                    ready_to_stop =False 
-                    extra_clicks_after_ready =0 
-                else :
-
-                    if not ready_to_stop or extra_clicks_after_ready <1 :
-                        autoit .mouse_click ('left')
-                        if ready_to_stop :
-                            extra_clicks_after_ready +=1 
-                        else :
-                            ready_to_stop =True 
-            time .sleep (0.5 )
+                capture_start =get_clock ().perf_counter ()
+                check_completed =completion .checks_due (capture_start )
+                search_region =self .get_reel_search_region ()
+                frame =self .capture_regions ({'reel_bar':search_region })
+                bar_state =self .track_reel_bar (frame ,search_region )
+                border_white =None 
+                panel_pixels =None 
+                if check_completed :
+                    # Like the panel row, the border pixel is its own grab so the reel capture keeps the search window's shape.
+                    border_frame =self .capture_regions ({'completed_border':(completed_x ,completed_y )})
+                    if border_frame is not None :
+                        border_white =self .pixel_search_white (completed_x ,completed_y ,tolerance =15 ,frame =border_frame )
+                if check_completed and not bar_state .found :
+                    panel_frame =self .capture_regions ({'catch_panel':panel_region })
+                    if panel_frame is not None :
+                        panel_pixels =panel_frame .view ('catch_panel')
+                end_reason =completion .update (get_clock ().perf_counter (),bar_state .found ,border_white ,panel_pixels )
+                if end_reason :
+                    print (f'Reeling finished ({end_reason }) after {get_clock ().perf_counter ()-completion .started :.2f}s')
+                    break 
+                decision_start =get_clock ().perf_counter ()
+                click =controller .decide (bar_state ,decision_start )
+                input_start =get_clock ().perf_counter ()
+                if click :
+                    dispatcher .click ('left')
+                input_end =get_clock ().perf_counter ()
+                tick_loop .record (decision_start -capture_start ,input_start -decision_start ,input_end -input_start )
+                histograms ['capture'].record (decision_start -capture_start )
+                histograms ['decision'].record (input_start -decision_start )
+                histograms ['input'].record (input_end -input_start )
+            if not dispatcher .flush (0.5 ):
+                # Late reel clicks must not land once the close sequence starts clicking the catch panel.
+                discarded =dispatcher .discard_pending ()
+                dispatcher .flush (0.2 )
+                print (f'Input queue did not drain after reeling, discarded {discarded } pending clicks')
+            telemetry .mark ('reel')
+            print (f'Reel loop: {tick_loop .summary_line ()}')
+            print (f'Reel input: {dispatcher .summary_line ()}')
+            self .input .set_phase ('fishing:catch')
+            if completion .reason =='border':
+                self .wait_for_condition (self .catch_panel_visible ,1.0 )
+            get_clock ().sleep (0.5 )
+            telemetry .mark ('catch_wait')
+            self .last_cycle_caught =completion .reason in ('border','panel')
             try :
-                fish_name ,mutation =self .extract_fish_name_with_timeout ()
-                self .send_webhook_message_with_timeout (fish_name ,mutation )
+                if 'fish_caught_desc'in self .coordinates :
+                    # Only the crop is taken here; OCR and the webhook run on the catch processor while the panel closes.
+                    self .catch_processor .synchronous =not self .async_catch_processing 
+                    self .catch_processor .submit (self .capture_catch_description (),{'caught':self .last_cycle_caught })
             except Exception as e :
-                print (f'Error in fish name extraction or webhook: {e }')
+                print (f'Error queueing catch for processing: {e }')
                 print ('Continuing with macro execution...')
-            time .sleep (0.3 )
+            telemetry .mark ('catch_capture')
+            get_clock ().sleep (0.3 )
             try :
                 close_x ,close_y =self .coordinates ['close_button']
-                autoit .mouse_move (close_x ,close_y ,3 )
-                time .sleep (0.7 )
-                autoit .mouse_click ('left')
+                self .input .mouse_move (close_x ,close_y ,3 )
+                get_clock ().sleep (0.7 )
+                self .input .mouse_click ('left')
                 self .apply_mouse_delay ()
-                time .sleep (0.15 )
+                get_clock ().sleep (0.15 )
                 print ('Close button clicked successfully')
             except Exception as e :
                 print (f'Error clicking close button: {e }')
+            telemetry .mark ('close')
             self .failsafe_consecutive_count =0 
             return True 
         except Exception as e :
@@ -1402,11 +1853,16 @@ class MouseAutomation :
             print("FishScope is already running, cancelling start...")
             return 
         if not self .toggle :
+            if self .stop_cleanup_thread is not None and self .stop_cleanup_thread .is_alive ():
+                print ('Waiting for the previous session to finish saving...')
+                self .stop_cleanup_thread .join (timeout =5 )
             self .toggle =True 
             self .running =True 
+            self .emergency_stop_event .clear ()
             self .first_loop =True 
             self .cycle_count =0 
-            self .start_time =time .time ()
+            self .start_time =get_clock ().time ()
+            self .session_stats .reset ()
             self .auto_reconnect_manager .start_timer ()
             self .current_fish_count =0 
             self .automation_phase ='initialization'
@@ -1441,6 +1897,7 @@ class MouseAutomation :
         print ('STOP ACTIVATED - Stopping macro...')
         self .toggle =False 
         self .running =False 
+        self .emergency_stop_event .set ()
         self .first_loop =True 
         self .automation_phase ='initialization'
         self .current_fish_count =0 
@@ -1461,6 +1918,31 @@ class MouseAutomation :
                     print ('Automation thread stopped successfully')
             except Exception as e :
                 print (f'Error during thread cleanup: {e }')
+        self .input_dispatcher .stop ()
+        # Draining queued catches and writing the session files can take seconds, which would freeze the UI if done here.
+        self .stop_cleanup_thread =threading .Thread (target =self .finish_stop ,name ='StopCleanup')
+        self .stop_cleanup_thread .start ()
+
+    def finish_stop (self ):
+        self .catch_processor .stop (timeout =3.0 )
+        print (f'Catch processing: {self .catch_processor .summary_line ()}')
+        if self .cycle_telemetry .cycles :
+            print (f'Cycle timing over the last {len (self .cycle_telemetry .cycles )} cycles:')
+            for line in self .cycle_telemetry .summary_lines ():
+                print (f'  {line }')
+        if self .session_stats .lifetime_cycles :
+            print (f'Session stats: {self .session_stats .summary_line ()}')
+        self .save_latency_histograms ()
+        if self .catch_processor .running :
+            # The worker may still be adding glyphs or cache entries; both stay dirty and are saved on the next stop.
+            print ('Skipping glyph atlas and catch cache saves while a catch is still being processed')
+        else :
+            self .save_glyph_atlas ()
+            self .save_catch_cache ()
+        self .save_capture_recording ()
+        if isinstance (self .input ,RecordingInputBackend ):
+            for phase ,totals in self .input .summary ().items ():
+                print (f"Input in {phase }: {totals ['actions']} actions, {totals ['seconds']*1000 :.1f} ms")
         print ('Stop completed')
 
 class CalibrationOverlay (QWidget ):
@@ -1846,6 +2328,7 @@ class CalibrationUI (QMainWindow ):
         self .auto_updater =AutoUpdater (self )
         self .ui_update_timer =QTimer ()
         self .ui_update_timer .timeout .connect (self .update_auto_reconnect_display )
+        self .ui_update_timer .timeout .connect (self .update_stats_display )
         self .ui_update_timer .start (1000 )
         try :
             success ,message ,calibration_data =self .automation .calibration_manager .update_calibrations (force_update =True )
@@ -2181,6 +2664,21 @@ class CalibrationUI (QMainWindow ):
                 self .link_status_label .setStyleSheet ('color: #dc3545; font-size: 10px; font-weight: 500;')
             self .link_status_label .show ()
 
+    def update_stats_display (self ):
+        if not hasattr (self ,'stats_labels'):
+            return 
+        stats =self .automation .session_stats .snapshot ()
+        self .stats_labels ['fish_per_hour'].setText (f"{stats ['fish_per_hour']:.1f}")
+        self .stats_labels ['fish'].setText (f"{stats ['fish']} in the last {stats ['window_seconds']/60 :.0f} min ({stats ['lifetime_fish']} this session)")
+        self .stats_labels ['cycle_time'].setText (f"{stats ['mean_cycle']:.2f}s mean, {stats ['p95_cycle']:.2f}s p95")
+        self .stats_labels ['catch_rate'].setText (f"{stats ['catch_rate']*100 :.0f}% of {stats ['cycles']} cycles")
+        self .stats_labels ['failsafe_rate'].setText (f"{stats ['failsafe_rate']*100 :.1f}% ({stats ['failsafes']} failsafes)")
+        rarities =sorted (stats ['rarities'].items (),key =lambda item :-item [1 ])
+        self .rarity_label .setText ('\n'.join (f'{rarity :<12}{share *100 :5.1f}%'for rarity ,share in rarities )or 'No catches yet')
+        telemetry =self .automation .cycle_telemetry 
+        self .cycle_timing_last_label .setText (f'Last cycle: {telemetry .last_cycle_line ()}')
+        self .cycle_timing_label .setText ('\n'.join (telemetry .summary_lines ()))
+
     def update_auto_reconnect_display (self ):
         if not hasattr (self ,'timer_label'):
             return 
@@ -2468,6 +2966,7 @@ class CalibrationUI (QMainWindow ):
         self .create_calibrations_tab ()
         self .create_webhook_tab ()
         self .create_settings_tab ()
+        self .create_stats_tab ()
         self .tab_widget .currentChanged .connect (self .on_tab_changed )
         main_layout .addWidget (self .tab_widget )
 
@@ -3087,6 +3586,60 @@ class CalibrationUI (QMainWindow ):
         tab_layout .setContentsMargins (0 ,0 ,0 ,0 )
         tab_layout .addWidget (scroll_area )
 
+    def create_stats_tab (self ):
+        stats_tab =QWidget ()
+        self .tab_widget .addTab (stats_tab ,'Stats')
+        scroll_area =QScrollArea ()
+        scroll_area .setWidgetResizable (True )
+        scroll_area .setVerticalScrollBarPolicy (Qt .ScrollBarPolicy .ScrollBarAsNeeded )
+        scroll_area .setHorizontalScrollBarPolicy (Qt .ScrollBarPolicy .ScrollBarAlwaysOff )
+        scroll_widget =QWidget ()
+        scroll_layout =QVBoxLayout (scroll_widget )
+        scroll_layout .setSpacing (15 )
+        scroll_layout .setContentsMargins (10 ,10 ,10 ,10 )
+        session_group =QGroupBox ('Session (rolling hour)')
+        session_layout =QVBoxLayout (session_group )
+        session_layout .setContentsMargins (12 ,15 ,12 ,12 )
+        session_layout .setSpacing (6 )
+        self .stats_labels ={}
+        for key ,title in (('fish_per_hour','Fish per hour'),('fish','Fish caught'),('cycle_time','Cycle time'),('catch_rate','Catch rate'),('failsafe_rate','Failsafe rate')):
+            row_layout =QHBoxLayout ()
+            title_label =QLabel (f'{title }:')
+            title_label .setStyleSheet ('color: #cccccc; font-size: 11px; font-weight: 500;')
+            title_label .setFixedWidth (110 )
+            row_layout .addWidget (title_label )
+            value_label =QLabel ('--')
+            value_label .setStyleSheet ('color: #4a9eff; font-size: 11px; font-weight: 500;')
+            row_layout .addWidget (value_label )
+            row_layout .addStretch ()
+            session_layout .addLayout (row_layout )
+            self .stats_labels [key ]=value_label 
+        scroll_layout .addWidget (session_group )
+        rarity_group =QGroupBox ('Catches by Rarity')
+        rarity_layout =QVBoxLayout (rarity_group )
+        rarity_layout .setContentsMargins (12 ,15 ,12 ,12 )
+        self .rarity_label =QLabel ('No catches yet')
+        self .rarity_label .setStyleSheet ("color: #888888; font-size: 10px; font-family: 'Consolas', monospace;")
+        rarity_layout .addWidget (self .rarity_label )
+        scroll_layout .addWidget (rarity_group )
+        timing_group =QGroupBox ('Cycle Timing')
+        timing_layout =QVBoxLayout (timing_group )
+        timing_layout .setContentsMargins (12 ,15 ,12 ,12 )
+        timing_layout .setSpacing (6 )
+        self .cycle_timing_last_label =QLabel ('Last cycle: no cycles recorded')
+        self .cycle_timing_last_label .setWordWrap (True )
+        self .cycle_timing_last_label .setStyleSheet ('color: #cccccc; font-size: 11px;')
+        timing_layout .addWidget (self .cycle_timing_last_label )
+        self .cycle_timing_label =QLabel ('')
+        self .cycle_timing_label .setStyleSheet ("color: #888888; font-size: 10px; font-family: 'Consolas', monospace;")
+        timing_layout .addWidget (self .cycle_timing_label )
+        scroll_layout .addWidget (timing_group )
+        scroll_layout .addStretch ()
+        scroll_area .setWidget (scroll_widget )
+        tab_layout =QVBoxLayout (stats_tab )
+        tab_layout .setContentsMargins (0 ,0 ,0 ,0 )
+        tab_layout .addWidget (scroll_area )
+
     def apply_premade_calibration (self ,config_name =None ):
         if config_name :
             selected_text =config_name 
@@ -0,0 +1,224 @@
+import ctypes
+import ctypes.util
+import glob
+import os
+import shutil
+import threading
+
+import numpy as np
+from PIL import Image
+
+try:
+    import pytesseract
+    PYTESSERACT_AVAILABLE = True
+except Exception:
+    pytesseract = None
+    PYTESSERACT_AVAILABLE = False
+
+try:
+    import tesserocr
+    TESSEROCR_AVAILABLE = True
+except Exception:
+    tesserocr = None
+    TESSEROCR_AVAILABLE = False
+
+OCR_ENGINES = ['auto', 'tesserocr', 'tessapi', 'pytesseract']
+
+WINDOWS_TESSERACT_PATHS = ['C:\\Program Files\\Tesseract-OCR\\tesseract.exe', 'C:\\Program Files (x86)\\Tesseract-OCR\\tesseract.exe', os.path.expanduser('~\\AppData\\Local\\Programs\\Tesseract-OCR\\tesseract.exe'), 'C:\\tesseract\\tesseract.exe', 'D:\\Program Files\\Tesseract-OCR\\tesseract.exe', 'D:\\Program Files (x86)\\Tesseract-OCR\\tesseract.exe']
+WINDOWS_TESSERACT_PATTERNS = ['C:\\Program Files\\*esseract*\\tesseract.exe', 'C:\\Program Files (x86)\\*esseract*\\tesseract.exe']
+
+
+def find_tesseract():
+    # Only looks at the filesystem; nothing is spawned to test the binary.
+    try:
+        found = shutil.which('tesseract')
+        if found:
+            return found
+    except Exception:
+        pass
+    if os.name != 'nt':
+        return None
+    for path in WINDOWS_TESSERACT_PATHS:
+        if os.path.exists(path):
+            return path
+    for pattern in WINDOWS_TESSERACT_PATTERNS:
+        for match in glob.glob(pattern):
+            if os.path.exists(match):
+                return match
+    return None
+
+
+def find_tessdata(tesseract_path=None):
+    if os.getenv('TESSDATA_PREFIX'):
+        return None
+    tesseract_path = tesseract_path or find_tesseract()
+    if tesseract_path:
+        tessdata = os.path.join(os.path.dirname(os.path.realpath(tesseract_path)), 'tessdata')
+        if os.path.isdir(tessdata):
+            return tessdata
+    return None
+
+
+def find_tesseract_library(tesseract_path=None):
+    tesseract_path = tesseract_path or find_tesseract()
+    if tesseract_path:
+        folder = os.path.dirname(os.path.realpath(tesseract_path))
+        for pattern in ('libtesseract*.dll', 'tesseract*.dll', 'libtesseract*.so*', 'libtesseract*.dylib'):
+            matches = sorted(glob.glob(os.path.join(folder, pattern)))
+            if matches:
+                return matches[-1]
+    return ctypes.util.find_library('tesseract') or ctypes.util.find_library('libtesseract-5')
+
+
+def to_pixels(image):
+    if isinstance(image, Image.Image):
+        image = image.convert('L') if image.mode in ('L', '1') else image.convert('RGB')
+    pixels = np.asarray(image)
+    if pixels.ndim == 3:
+        pixels = pixels[:, :, :3]
+    return np.ascontiguousarray(pixels, dtype=np.uint8)
+
+
+class OcrEngine:
+    name = 'base'
+
+    def recognize(self, image, page_mode=None, whitelist=None):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class TesserocrEngine(OcrEngine):
+    name = 'tesserocr'
+
+    def __init__(self, lang='eng'):
+        if not TESSEROCR_AVAILABLE:
+            raise RuntimeError('tesserocr is not available')
+        tessdata = find_tessdata()
+        self.api = tesserocr.PyTessBaseAPI(path=tessdata, lang=lang) if tessdata else tesserocr.PyTessBaseAPI(lang=lang)
+        self._lock = threading.Lock()
+
+    def recognize(self, image, page_mode=None, whitelist=None):
+        if not isinstance(image, Image.Image):
+            image = Image.fromarray(to_pixels(image))
+        with self._lock:
+            self.api.SetPageSegMode(tesserocr.PSM.AUTO if page_mode is None else page_mode)
+            self.api.SetVariable('tessedit_char_whitelist', whitelist or '')
+            self.api.SetImage(image)
+            return self.api.GetUTF8Text()
+
+    def close(self):
+        self.api.End()
+
+
+class TessApiEngine(OcrEngine):
+    name = 'tessapi'
+
+    def __init__(self, lang='eng'):
+        tesseract_path = find_tesseract()
+        library = find_tesseract_library(tesseract_path)
+        if not library:
+            raise RuntimeError('libtesseract was not found')
+        if os.name == 'nt' and hasattr(os, 'add_dll_directory') and os.path.dirname(library):
+            # The Windows installer keeps leptonica and friends next to libtesseract.
+            os.add_dll_directory(os.path.dirname(library))
+        lib = ctypes.CDLL(library)
+        lib.TessBaseAPICreate.restype = ctypes.c_void_p
+        lib.TessBaseAPIInit3.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_char_p]
+        lib.TessBaseAPIInit3.restype = ctypes.c_int
+        lib.TessBaseAPISetImage.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int]
+        lib.TessBaseAPISetPageSegMode.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        lib.TessBaseAPISetVariable.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_char_p]
+        lib.TessBaseAPISetVariable.restype = ctypes.c_int
+        lib.TessBaseAPIGetUTF8Text.argtypes = [ctypes.c_void_p]
+        lib.TessBaseAPIGetUTF8Text.restype = ctypes.c_void_p
+        lib.TessDeleteText.argtypes = [ctypes.c_void_p]
+        lib.TessBaseAPIEnd.argtypes = [ctypes.c_void_p]
+        lib.TessBaseAPIDelete.argtypes = [ctypes.c_void_p]
+        self.lib = lib
+        self.handle = lib.TessBaseAPICreate()
+        tessdata = find_tessdata(tesseract_path)
+        if lib.TessBaseAPIInit3(self.handle, tessdata.encode() if tessdata else None, lang.encode()) != 0:
+            lib.TessBaseAPIDelete(self.handle)
+            self.handle = None
+            raise RuntimeError(f'could not load the {lang} Tesseract model')
+        self._lock = threading.Lock()
+
+    def recognize(self, image, page_mode=None, whitelist=None):
+        pixels = to_pixels(image)
+        height, width = pixels.shape[:2]
+        channels = 1 if pixels.ndim == 2 else pixels.shape[2]
+        with self._lock:
+            self.lib.TessBaseAPISetPageSegMode(self.handle, 3 if page_mode is None else int(page_mode))
+            self.lib.TessBaseAPISetVariable(self.handle, b'tessedit_char_whitelist', (whitelist or '').encode())
+            self.lib.TessBaseAPISetImage(self.handle, pixels.ctypes.data, width, height, channels, width * channels)
+            text = self.lib.TessBaseAPIGetUTF8Text(self.handle)
+            if not text:
+                return ''
+            try:
+                return ctypes.string_at(text).decode('utf-8', 'replace')
+            finally:
+                self.lib.TessDeleteText(text)
+
+    def close(self):
+        if self.handle is not None:
+            self.lib.TessBaseAPIEnd(self.handle)
+            self.lib.TessBaseAPIDelete(self.handle)
+            self.handle = None
+
+
+class PytesseractEngine(OcrEngine):
+    name = 'pytesseract'
+
+    def __init__(self, lang='eng'):
+        if not PYTESSERACT_AVAILABLE:
+            raise RuntimeError('pytesseract is not available')
+        self.lang = lang
+        self.locate()
+
+    def locate(self):
+        path = find_tesseract()
+        if path:
+            pytesseract.pytesseract.tesseract_cmd = path
+        return path
+
+    def recognize(self, image, page_mode=None, whitelist=None):
+        if not isinstance(image, Image.Image):
+            image = Image.fromarray(to_pixels(image))
+        options = []
+        if page_mode is not None:
+            options.append(f'--psm {int(page_mode)}')
+        if whitelist:
+            # The config string is split like a shell command line, so quotes and spaces cannot be passed through.
+            whitelist = ''.join(c for c in whitelist if c not in '\'" \\')
+            options.append(f'-c tessedit_char_whitelist={whitelist}')
+        config = ' '.join(options)
+        try:
+            return pytesseract.image_to_string(image, lang=self.lang, config=config)
+        except pytesseract.TesseractNotFoundError:
+            if not self.locate():
+                raise
+            return pytesseract.image_to_string(image, lang=self.lang, config=config)
+
+
+OCR_ENGINE_TYPES = {'tesserocr': TesserocrEngine, 'tessapi': TessApiEngine, 'pytesseract': PytesseractEngine}
+
+
+def create_ocr_engine(name='auto', lang='eng'):
+    name = (name or 'auto').lower()
+    order = ['tesserocr', 'tessapi', 'pytesseract']
+    if name in OCR_ENGINE_TYPES:
+        order.remove(name)
+        order.insert(0, name)
+    errors = []
+    for candidate in order:
+        try:
+            engine = OCR_ENGINE_TYPES[candidate](lang)
+        except Exception as e:
+            errors.append(f'{candidate}: {e}')
+            continue
+        if candidate != name and name != 'auto':
+            print(f'Warning: {name} OCR engine is not available, using {candidate}')
+        return engine
+    raise RuntimeError('no OCR engine available (' + '; '.join(errors) + ')')
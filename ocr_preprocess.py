@@ -0,0 +1,73 @@
+import numpy as np
+
+OCR_CHANNELS = ['luma', 'max']
+
+
+def to_gray(pixels, channel='luma'):
+    pixels = np.asarray(pixels)
+    if pixels.ndim == 2:
+        return pixels.astype(np.uint8, copy=False)
+    rgb = pixels[:, :, :3]
+    if channel == 'max':
+        return rgb.max(axis=2)
+    return ((rgb[:, :, 0].astype(np.uint32) * 299 + rgb[:, :, 1].astype(np.uint32) * 587 + rgb[:, :, 2].astype(np.uint32) * 114) // 1000).astype(np.uint8)
+
+
+def otsu_threshold(gray):
+    hist = np.bincount(gray.ravel(), minlength=256).astype(np.float64)
+    total = hist.sum()
+    if not total:
+        return 128
+    levels = np.arange(256, dtype=np.float64)
+    weight_low = np.cumsum(hist)
+    weight_high = total - weight_low
+    mean_low = np.cumsum(hist * levels)
+    mean_total = mean_low[-1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        between = (mean_total * weight_low / total - mean_low) ** 2 / (weight_low * weight_high)
+    between[~np.isfinite(between)] = 0
+    return int(np.argmax(between))
+
+
+def remove_specks(mask, min_neighbours=1):
+    padded = np.pad(mask, 1).astype(np.uint8)
+    height, width = mask.shape
+    neighbours = sum(padded[1 + dy:1 + dy + height, 1 + dx:1 + dx + width] for dy in (-1, 0, 1) for dx in (-1, 0, 1) if dy or dx)
+    return mask & (neighbours >= min_neighbours)
+
+
+class OcrPreprocessor:
+
+    def __init__(self, channel='luma', threshold='auto', scale=2, padding=4, crop=True, denoise=False):
+        self.channel = channel
+        self.threshold = threshold
+        self.scale = max(1, int(scale))
+        self.padding = max(0, int(padding))
+        self.crop = crop
+        self.denoise = denoise
+
+    def text_mask(self, pixels):
+        gray = to_gray(pixels, self.channel)
+        level = otsu_threshold(gray) if self.threshold == 'auto' else int(self.threshold)
+        mask = gray > level
+        # Text covers less of the panel than its background, so the minority side of the threshold is the text.
+        if mask.mean() > 0.5:
+            mask = ~mask
+        if self.denoise:
+            mask = remove_specks(mask)
+        return mask
+
+    def apply(self, pixels):
+        mask = self.text_mask(pixels)
+        if self.crop:
+            rows = np.flatnonzero(mask.any(axis=1))
+            cols = np.flatnonzero(mask.any(axis=0))
+            if rows.size and cols.size:
+                mask = mask[rows[0]:rows[-1] + 1, cols[0]:cols[-1] + 1]
+        if self.scale > 1:
+            mask = mask.repeat(self.scale, axis=0).repeat(self.scale, axis=1)
+        # Tesseract expects dark text on a light page with some margin around it.
+        out = np.where(mask, 0, 255).astype(np.uint8)
+        if self.padding:
+            out = np.pad(out, self.padding * self.scale, constant_values=255)
+        return out
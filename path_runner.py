@@ -1,44 +1,13 @@
-from pynput.keyboard import Key, Controller as KeyboardController
-from pynput.mouse import Button, Controller as MouseController
-from mousekey import MouseKey
-from time import sleep, perf_counter
+from clock import get_clock
 from screeninfo import get_monitors
-
-kc = KeyboardController()
-mc = MouseController()
-mkey = MouseKey()
-
-pynput_special_keys = {
-    'Key.alt': Key.alt, 'Key.alt_l': Key.alt_l, 'Key.alt_r': Key.alt_r,
-    'Key.backspace': Key.backspace, 'Key.caps_lock': Key.caps_lock,
-    'Key.cmd': Key.cmd, 'Key.cmd_l': Key.cmd_l, 'Key.cmd_r': Key.cmd_r,
-    'Key.ctrl': Key.ctrl, 'Key.ctrl_l': Key.ctrl_l, 'Key.ctrl_r': Key.ctrl_r,
-    'Key.delete': Key.delete, 'Key.down': Key.down, 'Key.end': Key.end,
-    'Key.enter': Key.enter, 'Key.esc': Key.esc, 'Key.f1': Key.f1,
-    'Key.f2': Key.f2, 'Key.f3': Key.f3, 'Key.f4': Key.f4,
-    'Key.f5': Key.f5, 'Key.f6': Key.f6, 'Key.f7': Key.f7,
-    'Key.f8': Key.f8, 'Key.f9': Key.f9, 'Key.f10': Key.f10,
-    'Key.f11': Key.f11, 'Key.f12': Key.f12, 'Key.home': Key.home,
-    'Key.insert': Key.insert, 'Key.left': Key.left, 'Key.menu': Key.menu,
-    'Key.num_lock': Key.num_lock, 'Key.page_down': Key.page_down,
-    'Key.page_up': Key.page_up, 'Key.pause': Key.pause,
-    'Key.print_screen': Key.print_screen, 'Key.right': Key.right,
-    'Key.scroll_lock': Key.scroll_lock, 'Key.shift': Key.shift,
-    'Key.shift_l': Key.shift_l, 'Key.shift_r': Key.shift_r,
-    'Key.space': Key.space, 'Key.tab': Key.tab, 'Key.up': Key.up,
-}
-
-pynput_special_buttons = {
-    'Button.left': Button.left,
-    'Button.right': Button.right,
-    'Button.middle': Button.middle,
-}
+from input_backend import get_input_backend, normalize_button
 
 def run_macro(macro, delay=2, emergency_stop_check=None):
+    backend = get_input_backend('paths')
     for _ in range(int(delay * 10)):
         if emergency_stop_check and emergency_stop_check():
             return
-        sleep(0.1)
+        get_clock().sleep(0.1)
     for action in macro:
         if emergency_stop_check and emergency_stop_check():
             return
@@ -50,29 +19,28 @@ def run_macro(macro, delay=2, emergency_stop_check=None):
                 for _ in range(chunks):
                     if emergency_stop_check and emergency_stop_check():
                         return
-                    sleep(0.1)
+                    get_clock().sleep(0.1)
                 if remainder > 0:
                     if emergency_stop_check and emergency_stop_check():
                         return
-                    sleep(remainder)
+                    get_clock().sleep(remainder)
             case 'key_press':
-                key = action['key']
-                kc.press(pynput_special_keys.get(key, key))
+                backend.key_down(action['key'])
             case 'key_release':
-                key = action['key']
-                kc.release(pynput_special_keys.get(key, key))
+                backend.key_up(action['key'])
             case 'mouse_movement':
-                mkey.move_to(int(action['x']), int(action['y']))
+                backend.mouse_move(int(action['x']), int(action['y']), 0)
             case 'mouse_press':
-                mc.press(pynput_special_buttons[action['button']])
+                backend.mouse_down(normalize_button(action['button']))
             case 'mouse_release':
-                mc.release(pynput_special_buttons[action['button']])
+                backend.mouse_up(normalize_button(action['button']))
             case 'mouse_scroll':
                 if 'x' in action:
-                    mkey.move_to(int(action['x']), int(action['y']))
-                mc.scroll(action['dx'], action['dy'])
+                    backend.mouse_move(int(action['x']), int(action['y']), 0)
+                backend.scroll(action['dx'], action['dy'])
 
 def drag_camera_up():
+    backend = get_input_backend('paths')
     try:
         monitor = get_monitors()[0]
         screen_width = monitor.width
@@ -83,10 +51,10 @@ def drag_camera_up():
     center_x = screen_width // 2
     start_y = int(screen_height * 0.8)
     end_y = int(screen_height * 0.2)
-    mkey.move_to(center_x, start_y)
-    sleep(0.1)
-    mc.press(Button.right)
-    sleep(0.1)
-    mkey.move_to(center_x, end_y)
-    sleep(0.1)
-    mc.release(Button.right)
+    backend.mouse_move(center_x, start_y, 0)
+    get_clock().sleep(0.1)
+    backend.mouse_down('right')
+    get_clock().sleep(0.1)
+    backend.mouse_move(center_x, end_y, 0)
+    get_clock().sleep(0.1)
+    backend.mouse_up('right')
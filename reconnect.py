@@ -1,9 +1,9 @@
-import time 
+from clock import get_clock 
 import os 
 import sys 
 import subprocess 
 import webbrowser 
-import autoit 
+from input_backend import get_input_backend 
 import ctypes 
 from ctypes import wintypes 
 try :
@@ -84,22 +84,22 @@ class AutoReconnectManager :
             if hasattr (self .automation ,'in_sell_cycle')and self .automation .in_sell_cycle :
                 print ('Auto reconnect blocked: in sell cycle')
                 return False 
-        elapsed_time =time .time ()-self .auto_reconnect_timer_start 
+        elapsed_time =get_clock ().time ()-self .auto_reconnect_timer_start 
         return elapsed_time >=self .auto_reconnect_time 
 
     def get_auto_reconnect_time_remaining (self ):
         if not self .auto_reconnect_enabled or not self .auto_reconnect_timer_start :
             return None 
-        elapsed_time =time .time ()-self .auto_reconnect_timer_start 
+        elapsed_time =get_clock ().time ()-self .auto_reconnect_timer_start 
         total_time =self .auto_reconnect_time 
         remaining =total_time -elapsed_time 
         return max (0 ,remaining )
 
     def start_timer (self ):
-        self .auto_reconnect_timer_start =time .time ()
+        self .auto_reconnect_timer_start =get_clock ().time ()
 
     def reset_timer (self ):
-        self .auto_reconnect_timer_start =time .time ()
+        self .auto_reconnect_timer_start =get_clock ().time ()
 
     def stop_timer (self ):
         self .auto_reconnect_timer_start =None 
@@ -111,7 +111,7 @@ class AutoReconnectManager :
                 return False 
             if self .should_auto_reconnect ():
                 return 'auto_reconnect'
-            time .sleep (0.1 )
+            get_clock ().sleep (0.1 )
         return True 
 
     def perform_auto_reconnect (self ,toggle_callback =None ):
@@ -123,7 +123,7 @@ class AutoReconnectManager :
                 self .automation .send_webhook_notification ('roblox_reconnected','Auto Reconnect Triggered',f'Reconnecting after {self .auto_reconnect_time } seconds...',color =1548984 )
             print ('Closing Roblox instances...')
             self .close_roblox_instances ()
-            time .sleep (5 )
+            get_clock ().sleep (5 )
             launch_success =False 
             if self .roblox_private_server_link .strip ():
                 print ('Attempting to launch private server...')
@@ -165,7 +165,7 @@ class AutoReconnectManager :
         for i in range (seconds *10 ):
             if toggle_callback and (not toggle_callback ()):
                 return False 
-            time .sleep (0.1 )
+            get_clock ().sleep (0.1 )
         return True 
 
     def _execute_reconnect_sequence (self ,toggle_callback ):
@@ -175,7 +175,7 @@ class AutoReconnectManager :
         if not self ._wait_with_checks (60 ,toggle_callback ):
             return False 
         self .press_backslash_sequence ()
-        time .sleep (2 )
+        get_clock ().sleep (2 )
         return True 
 
     def close_roblox_instances (self ):
@@ -293,7 +293,7 @@ class AutoReconnectManager :
                         import threading 
 
                         def cleanup ():
-                            time .sleep (2 )
+                            get_clock ().sleep (2 )
                             try :
                                 os .unlink (temp_file .name )
                             except :
@@ -337,16 +337,16 @@ class AutoReconnectManager :
         total_delay =max (30.0 ,self .backslash_sequence_delay )
         try :
             self .focus_roblox_window ()
-            time .sleep (0.5 )
+            get_clock ().sleep (0.5 )
             self ._prepare_and_wait (total_delay )
             print ('Wait complete, now executing key sequence...')
             print ('Now actions are → \\ → Enter → Down Arrow → \\ then continue')
-            self ._send_backslash_sequence (autoit .send )
+            self ._send_backslash_sequence (get_input_backend ().send )
             print (f'Backslash sequence completed after {total_delay } second delay + key execution')
         except Exception as e :
             try :
                 self .focus_roblox_window ()
-                time .sleep (0.5 )
+                get_clock ().sleep (0.5 )
                 self ._prepare_and_wait (total_delay )
                 print ('Wait complete, now executing key sequence (fallback)...')
                 print ('Now actions are → \\ → Enter → Down Arrow → \\ then continue')
@@ -362,15 +362,15 @@ class AutoReconnectManager :
     def _prepare_and_wait (self ,total_delay ):
         if self .automation and hasattr (self .automation ,'send_webhook_notification'):
             self .automation .send_webhook_notification ('roblox_detected','RobloxPlayerBeta.exe Detected',f'Now waiting {total_delay } seconds before executing key sequence...',color =2664261 )
-        time .sleep (total_delay )
+        get_clock ().sleep (total_delay )
 
     def _send_backslash_sequence (self ,send_func ):
         send_func ('\\')
-        time .sleep (2.0 )
+        get_clock ().sleep (2.0 )
         send_func ('{DOWN}')
-        time .sleep (2.0 )
+        get_clock ().sleep (2.0 )
         send_func ('{ENTER}')
-        time .sleep (2.0 )
+        get_clock ().sleep (2.0 )
         send_func ('\\')
 
     def focus_roblox_window (self ):
@@ -434,13 +434,13 @@ class AutoReconnectManager :
             if toggle_callback and (not toggle_callback ()):
                 return False 
             if self .is_roblox_running ():
-                time .sleep (3 )
+                get_clock ().sleep (3 )
                 if self .roblox_window_mode =='windowed':
                     self .set_roblox_windowed ()
                 else :
                     self .set_roblox_fullscreen ()
                 return True 
-            time .sleep (0.5 )
+            get_clock ().sleep (0.5 )
         print ('Timeout waiting for RobloxPlayerBeta.exe to start')
         return False 
 
@@ -459,11 +459,11 @@ class AutoReconnectManager :
                 for hwnd in windows :
                     try :
                         win32gui .SetForegroundWindow (hwnd )
-                        time .sleep (0.5 )
+                        get_clock ().sleep (0.5 )
                         win32gui .ShowWindow (hwnd ,win32con .SW_RESTORE )
-                        time .sleep (0.5 )
+                        get_clock ().sleep (0.5 )
                         win32gui .ShowWindow (hwnd ,win32con .SW_MAXIMIZE )
-                        time .sleep (0.5 )
+                        get_clock ().sleep (0.5 )
                         print ('Set Roblox to windowed mode (maximized)')
                         return 
                     except Exception as window_error :
@@ -472,17 +472,17 @@ class AutoReconnectManager :
             else :
                 print ('Win32 not available, using keyboard shortcut fallback for windowed mode...')
                 try :
-                    time .sleep (1 )
-                    autoit .win_activate ('Roblox')
-                    time .sleep (0.5 )
-                    autoit .send ('{F11}')
-                    time .sleep (0.5 )
-                    autoit .send ('{F11}')
-                    time .sleep (0.5 )
-                    autoit .send ('!{SPACE}')
-                    time .sleep (0.3 )
-                    autoit .send ('x')
-                    time .sleep (0.5 )
+                    get_clock ().sleep (1 )
+                    get_input_backend ().win_activate ('Roblox')
+                    get_clock ().sleep (0.5 )
+                    get_input_backend ().send ('{F11}')
+                    get_clock ().sleep (0.5 )
+                    get_input_backend ().send ('{F11}')
+                    get_clock ().sleep (0.5 )
+                    get_input_backend ().send ('!{SPACE}')
+                    get_clock ().sleep (0.3 )
+                    get_input_backend ().send ('x')
+                    get_clock ().sleep (0.5 )
                     print ('Applied windowed mode using keyboard shortcuts')
                 except Exception as fallback_error :
                     print (f'Fallback windowed mode failed: {fallback_error }')
@@ -505,10 +505,10 @@ class AutoReconnectManager :
                 for hwnd in windows :
                     try :
                         win32gui .SetForegroundWindow (hwnd )
-                        time .sleep (0.5 )
+                        get_clock ().sleep (0.5 )
                         print ('Attempting to set Roblox to fullscreen using F11 key...')
-                        autoit .send ('{F11}')
-                        time .sleep (1.5 )
+                        get_input_backend ().send ('{F11}')
+                        get_clock ().sleep (1.5 )
                         placement =win32gui .GetWindowPlacement (hwnd )
                         if placement [1 ]==win32con .SW_MAXIMIZE or placement [1 ]==win32con .SW_SHOWMAXIMIZED :
                             print ('Set Roblox to fullscreen mode')
@@ -528,11 +528,11 @@ class AutoReconnectManager :
             else :
                 print ('Win32 not available, using F11 key fallback for fullscreen...')
                 try :
-                    time .sleep (1 )
-                    autoit .win_activate ('Roblox')
-                    time .sleep (0.5 )
-                    autoit .send ('{F11}')
-                    time .sleep (1.5 )
+                    get_clock ().sleep (1 )
+                    get_input_backend ().win_activate ('Roblox')
+                    get_clock ().sleep (0.5 )
+                    get_input_backend ().send ('{F11}')
+                    get_clock ().sleep (1.5 )
                     print ('Applied fullscreen mode using F11 key')
                 except Exception as fallback_error :
                     print (f'Fallback fullscreen mode failed: {fallback_error }')
@@ -547,7 +547,7 @@ class AutoReconnectManager :
         original_timer =self .auto_reconnect_timer_start 
         try :
             self .auto_reconnect_enabled =True 
-            self .auto_reconnect_timer_start =time .time ()-(self .auto_reconnect_time +1 )
+            self .auto_reconnect_timer_start =get_clock ().time ()-(self .auto_reconnect_time +1 )
             success =self .perform_auto_reconnect (lambda :True if self .automation else True )
             return success 
         except Exception as e :
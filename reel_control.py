@@ -0,0 +1,123 @@
+from collections import deque
+
+from bar_detection import fit_line
+
+
+class ReelController:
+    name = 'base'
+
+    def reset(self, strip, setpoint=None):
+        pass
+
+    def decide(self, state, now):
+        raise NotImplementedError
+
+
+class ClassicController(ReelController):
+    name = 'classic'
+
+    def __init__(self, extra_clicks=1):
+        self.extra_clicks = extra_clicks
+        self.ready_to_stop = False
+        self.extra_clicks_after_ready = 0
+
+    def reset(self, strip, setpoint=None):
+        self.ready_to_stop = False
+        self.extra_clicks_after_ready = 0
+
+    def decide(self, state, now):
+        if not state.found:
+            self.ready_to_stop = False
+            self.extra_clicks_after_ready = 0
+            return True
+        if not self.ready_to_stop:
+            self.ready_to_stop = True
+            return True
+        if self.extra_clicks_after_ready < self.extra_clicks:
+            self.extra_clicks_after_ready += 1
+            return True
+        return False
+
+
+class PredictiveController(ReelController):
+    name = 'predictive'
+
+    def __init__(self, input_latency=0.03, horizon=0.05, deadband=4.0, min_click_interval=0.0, max_lead=0.25, track_zone=False, zone_window=0.2, min_zone_samples=3):
+        self.input_latency = input_latency
+        self.horizon = horizon
+        self.deadband = deadband
+        self.min_click_interval = min_click_interval
+        self.max_lead = max_lead
+        self.track_zone = track_zone
+        self.zone_window = zone_window
+        self.min_zone_samples = min_zone_samples
+        self.setpoint = None
+        self.last_click = float('-inf')
+        self.sightings = deque()
+        self.last_timestamp = None
+        self.exit_velocity = -1.0
+
+    def reset(self, strip, setpoint=None):
+        x1, _, x2, _ = strip
+        self.setpoint = float(setpoint) if setpoint is not None else (x1 + x2) / 2.0
+        self.last_click = float('-inf')
+        self.sightings.clear()
+        self.last_timestamp = None
+        self.exit_velocity = -1.0
+
+    def lead(self, state, now):
+        # The state describes the frame at capture time; the click lands after input latency,
+        # so project the bar across the whole gap plus a short control horizon.
+        return min(max(now - state.timestamp, 0.0) + self.input_latency + self.horizon, self.max_lead)
+
+    def predict(self, state, now):
+        return state.center + state.velocity * self.lead(state, now)
+
+    def observe(self, state):
+        # Held readings repeat the previous frame, so only a newer timestamp counts as a new sighting.
+        if self.last_timestamp is not None and state.timestamp <= self.last_timestamp:
+            return
+        self.last_timestamp = state.timestamp
+        if state.found:
+            self.sightings.append((state.timestamp, state.center))
+            self.exit_velocity = state.velocity
+        while self.sightings and state.timestamp - self.sightings[0][0] > self.zone_window:
+            self.sightings.popleft()
+
+    def target(self, state, now):
+        if not self.track_zone or len(self.sightings) < self.min_zone_samples:
+            return self.setpoint
+        # Where the zone will be when the click lands, extrapolated from recent sightings.
+        velocity, position = fit_line(self.sightings)
+        return position + velocity * (state.timestamp - self.sightings[-1][0] + self.lead(state, now))
+
+    def decide(self, state, now):
+        if self.track_zone:
+            self.observe(state)
+        if now - self.last_click < self.min_click_interval:
+            return False
+        if not state.found or self.setpoint is None:
+            # A bar that left the zone moving right comes back under gravity; one that left moving left needs clicks.
+            click = not self.track_zone or self.exit_velocity <= 0
+        else:
+            click = self.predict(state, now) < self.target(state, now) - self.deadband
+        if click:
+            self.last_click = now
+        return click
+
+
+class ZoneTrackingController(PredictiveController):
+    name = 'zone_tracking'
+
+    def __init__(self, **kwargs):
+        # Assumes the bar only shows in its own colour while it overlaps the zone, so every sighting is a zone sample.
+        kwargs.setdefault('track_zone', True)
+        kwargs.setdefault('deadband', 10.0)
+        super().__init__(**kwargs)
+
+
+REEL_CONTROLLERS = {'classic': ClassicController, 'predictive': PredictiveController, 'zone_tracking': ZoneTrackingController}
+
+
+def create_reel_controller(name='classic', **kwargs):
+    return REEL_CONTROLLERS.get(name, ClassicController)(**kwargs)
@@ -0,0 +1,164 @@
+import json
+import math
+import random
+
+import numpy as np
+
+from bar_detection import BarTracker, create_color_matcher
+from screen_capture import normalize_region
+
+DEFAULT_COORDINATES = {'white_diamond': (1176, 805), 'reel_bar': (757, 728, 1163, 750), 'completed_border': (1133, 744), 'fish_caught_desc': (700, 540, 1035, 685), 'shaded_area': (951, 731)}
+DEFAULT_BAR_COLOR = (92, 164, 212)
+
+
+def load_calibration_coordinates(path=None):
+    coordinates = dict(DEFAULT_COORDINATES)
+    if path:
+        with open(path, 'r') as f:
+            data = json.load(f)
+        saved = data.get('coordinates', data)
+        for key in coordinates:
+            if key in saved:
+                coordinates[key] = tuple(saved[key])
+    return coordinates
+
+
+class ReelPhysics:
+
+    def __init__(self, gravity=600.0, click_impulse=110.0, max_speed=450.0, bar_fraction=0.16, zone_fraction=0.2, zone_speed=(40.0, 120.0), zone_turn_rate=0.5, progress_start=0.3, gain_rate=0.35, loss_rate=0.15, max_duration=9.0):
+        self.gravity = gravity
+        self.click_impulse = click_impulse
+        self.max_speed = max_speed
+        self.bar_fraction = bar_fraction
+        self.zone_fraction = zone_fraction
+        self.zone_speed = zone_speed
+        self.zone_turn_rate = zone_turn_rate
+        self.progress_start = progress_start
+        self.gain_rate = gain_rate
+        self.loss_rate = loss_rate
+        self.max_duration = max_duration
+
+
+class ReelGame:
+
+    def __init__(self, strip, physics=None, seed=0, bar_color=DEFAULT_BAR_COLOR, idle_color=(70, 70, 80), zone_color=(35, 35, 40), background=(18, 18, 22), noise=3, visible_when='in_zone'):
+        self.strip = normalize_region(strip)
+        self.physics = physics if physics is not None else ReelPhysics()
+        self.rng = random.Random(seed)
+        self.visible_when = visible_when
+        x1, y1, x2, y2 = self.strip
+        self.width = x2 - x1
+        self.bar_width = max(4, int(self.width * self.physics.bar_fraction))
+        self.zone_width = max(4, int(self.width * self.physics.zone_fraction))
+        # Each colour is pre-rendered with noise over twice the strip width; frames copy a randomly offset slice.
+        noise_rng = np.random.default_rng(seed)
+        grain = noise_rng.integers(-noise, noise + 1, (y2 - y1, self.width * 2, 3), dtype=np.int16) if noise else np.zeros((y2 - y1, self.width * 2, 3), dtype=np.int16)
+        self.layers = {name: np.clip(grain + np.array(color[:3], dtype=np.int16), 0, 255).astype(np.uint8) for name, color in (('bar', bar_color), ('idle', idle_color), ('zone', zone_color), ('background', background))}
+        self._canvas = np.empty((y2 - y1, self.width, 3), dtype=np.uint8)
+        self.time = 0.0
+        self.bar_x = (self.width - self.bar_width) / 2.0
+        self.velocity = 0.0
+        # Games open with the zone under the bar, which is where the bar colour is sampled from.
+        self.zone_x = self.bar_x + (self.bar_width - self.zone_width) / 2.0 + self.rng.uniform(-0.25, 0.25) * self.zone_width
+        self.zone_velocity = self.rng.choice((-1, 1)) * self.rng.uniform(*self.physics.zone_speed)
+        self.progress = self.physics.progress_start
+        self.pending_clicks = []
+        self.clicks = 0
+        self.result = None
+
+    @property
+    def finished(self):
+        return self.result is not None
+
+    def click(self, arrival_time=None):
+        self.pending_clicks.append(self.time if arrival_time is None else arrival_time)
+        self.clicks += 1
+
+    def bar_in_zone(self):
+        return self.bar_x < self.zone_x + self.zone_width and self.zone_x < self.bar_x + self.bar_width
+
+    def bar_visible(self):
+        if self.visible_when == 'always':
+            return True
+        return self.bar_in_zone()
+
+    def step(self, dt):
+        if self.finished:
+            return
+        physics = self.physics
+        end = self.time + dt
+        due = [t for t in self.pending_clicks if t <= end]
+        if due:
+            self.pending_clicks = [t for t in self.pending_clicks if t > end]
+            self.velocity += physics.click_impulse * len(due)
+        self.velocity = max(-physics.max_speed, min(physics.max_speed, self.velocity - physics.gravity * dt))
+        self.bar_x += self.velocity * dt
+        if self.bar_x <= 0:
+            self.bar_x, self.velocity = 0.0, max(self.velocity, 0.0)
+        elif self.bar_x >= self.width - self.bar_width:
+            self.bar_x, self.velocity = float(self.width - self.bar_width), min(self.velocity, 0.0)
+        if self.rng.random() < physics.zone_turn_rate * dt:
+            self.zone_velocity = math.copysign(self.rng.uniform(*physics.zone_speed), -self.zone_velocity)
+        self.zone_x += self.zone_velocity * dt
+        if self.zone_x <= 0 or self.zone_x >= self.width - self.zone_width:
+            self.zone_x = min(max(self.zone_x, 0.0), float(self.width - self.zone_width))
+            self.zone_velocity = -self.zone_velocity
+        rate = physics.gain_rate if self.bar_in_zone() else -physics.loss_rate
+        self.progress = min(1.0, max(0.0, self.progress + rate * dt))
+        self.time = end
+        if self.progress >= 1.0:
+            self.result = 'won'
+        elif self.progress <= 0.0:
+            self.result = 'lost'
+        elif self.time >= physics.max_duration:
+            self.result = 'timeout'
+
+    def advance(self, until, dt=1 / 240.0):
+        while not self.finished and self.time < until:
+            self.step(min(dt, until - self.time))
+
+    def render_strip(self):
+        canvas = self._canvas
+        offset = self.rng.randrange(self.width)
+        canvas[:] = self.layers['background'][:, offset:offset + self.width]
+        zone_left = int(self.zone_x)
+        canvas[:, zone_left:zone_left + self.zone_width] = self.layers['zone'][:, offset + zone_left:offset + zone_left + self.zone_width]
+        bar_left = int(self.bar_x)
+        bar_layer = self.layers['bar' if self.bar_visible() else 'idle']
+        canvas[:, bar_left:bar_left + self.bar_width] = bar_layer[:, offset + bar_left:offset + bar_left + self.bar_width]
+        return canvas
+
+    def render(self, bbox, out=None):
+        x1, y1, x2, y2 = normalize_region(bbox)
+        if out is None:
+            out = np.empty((y2 - y1, x2 - x1, 3), dtype=np.uint8)
+        out.fill(0)
+        sx1, sy1, sx2, sy2 = self.strip
+        ix1, iy1, ix2, iy2 = max(x1, sx1), max(y1, sy1), min(x2, sx2), min(y2, sy2)
+        if ix2 > ix1 and iy2 > iy1:
+            strip = self.render_strip()
+            out[iy1 - y1:iy2 - y1, ix1 - x1:ix2 - x1] = strip[iy1 - sy1:iy2 - sy1, ix1 - sx1:ix2 - sx1]
+        return out
+
+
+def run_game(controller, seed=0, coordinates=None, tolerance=5, matcher='packed', physics=None, tick_rate=60.0, capture_latency=0.01, input_latency=0.03, noise=3, visible_when='in_zone', bar_color=DEFAULT_BAR_COLOR):
+    coordinates = coordinates or DEFAULT_COORDINATES
+    strip = normalize_region(coordinates['reel_bar'])
+    game = ReelGame(strip, physics, seed, bar_color=bar_color, noise=noise, visible_when=visible_when)
+    tracker = BarTracker(create_color_matcher(bar_color, tolerance, matcher))
+    controller.reset(strip, coordinates['shaded_area'][0])
+    tick = 1.0 / tick_rate
+    now = 0.0
+    ticks = 0
+    while True:
+        game.advance(now)
+        if game.finished:
+            break
+        state = tracker.update(game.render_strip(), strip[0], now)
+        # Capture and processing delay the decision; the click then takes input_latency to land.
+        decided = now + capture_latency
+        if controller.decide(state, decided):
+            game.click(decided + input_latency)
+        ticks += 1
+        now += tick
+    return {'result': game.result, 'duration': game.time, 'clicks': game.clicks, 'ticks': ticks, 'progress': game.progress}
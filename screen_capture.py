@@ -0,0 +1,307 @@
+import bisect
+import glob
+import os
+from collections import OrderedDict
+
+import numpy as np
+from PIL import Image, ImageGrab
+
+from clock import get_clock
+
+try:
+    import win32con
+    import win32gui
+    import win32ui
+    WIN32_CAPTURE_AVAILABLE = True
+except ImportError:
+    WIN32_CAPTURE_AVAILABLE = False
+
+CAPTURE_BACKENDS = ['auto', 'gdi', 'win32', 'replay']
+
+
+def normalize_region(coord):
+    if len(coord) == 2:
+        x, y = int(coord[0]), int(coord[1])
+        return (x, y, x + 1, y + 1)
+    x1, y1, x2, y2 = (int(v) for v in coord[:4])
+    return (min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2))
+
+
+def union_region(regions):
+    regions = [normalize_region(r) for r in regions]
+    if not regions:
+        return None
+    return (min(r[0] for r in regions), min(r[1] for r in regions), max(r[2] for r in regions), max(r[3] for r in regions))
+
+
+class CaptureBackend:
+    name = 'base'
+
+    def grab(self, bbox):
+        raise NotImplementedError
+
+    def grab_into(self, bbox, out):
+        np.copyto(out, self.grab(bbox)[:, :, :3])
+        return out
+
+    def close(self):
+        pass
+
+
+class GdiCaptureBackend(CaptureBackend):
+    name = 'gdi'
+
+    def grab(self, bbox):
+        screenshot = ImageGrab.grab(bbox=bbox)
+        if screenshot.mode != 'RGB':
+            screenshot = screenshot.convert('RGB')
+        return np.asarray(screenshot)
+
+
+class Win32CaptureBackend(CaptureBackend):
+    name = 'win32'
+
+    def __init__(self):
+        if not WIN32_CAPTURE_AVAILABLE:
+            raise RuntimeError('pywin32 is not available')
+        self._hwnd = win32gui.GetDesktopWindow()
+        self._window_dc = win32gui.GetWindowDC(self._hwnd)
+        self._src_dc = win32ui.CreateDCFromHandle(self._window_dc)
+        self._mem_dc = self._src_dc.CreateCompatibleDC()
+        self._bitmap = None
+        self._size = None
+
+    def _ensure_bitmap(self, width, height):
+        if self._size == (width, height):
+            return
+        if self._bitmap is not None:
+            win32gui.DeleteObject(self._bitmap.GetHandle())
+        self._bitmap = win32ui.CreateBitmap()
+        self._bitmap.CreateCompatibleBitmap(self._src_dc, width, height)
+        self._mem_dc.SelectObject(self._bitmap)
+        self._size = (width, height)
+
+    def grab(self, bbox):
+        x1, y1, x2, y2 = bbox
+        width, height = x2 - x1, y2 - y1
+        self._ensure_bitmap(width, height)
+        self._mem_dc.BitBlt((0, 0), (width, height), self._src_dc, (x1, y1), win32con.SRCCOPY)
+        raw = self._bitmap.GetBitmapBits(True)
+        bgra = np.frombuffer(raw, dtype=np.uint8).reshape(height, width, 4)
+        return bgra[:, :, 2::-1]
+
+    def grab_into(self, bbox, out):
+        np.copyto(out, self.grab(bbox))
+        return out
+
+    def close(self):
+        try:
+            if self._bitmap is not None:
+                win32gui.DeleteObject(self._bitmap.GetHandle())
+            self._mem_dc.DeleteDC()
+            self._src_dc.DeleteDC()
+            win32gui.ReleaseDC(self._hwnd, self._window_dc)
+        except Exception:
+            pass
+        self._bitmap = None
+        self._size = None
+
+
+def load_recording(source):
+    if os.path.isdir(source):
+        paths = sorted(glob.glob(os.path.join(source, '*.png')))
+        if not paths:
+            raise ValueError(f'No PNG frames found in {source}')
+        frames = [np.asarray(Image.open(path).convert('RGB')) for path in paths]
+        return (frames, (0, 0), None)
+    with np.load(source) as data:
+        frames = list(data['frames'])
+        origin = tuple(int(v) for v in data['origin']) if 'origin' in data else (0, 0)
+        timestamps = data['timestamps'].tolist() if 'timestamps' in data else None
+    return (frames, origin, timestamps)
+
+
+class ReplayCaptureBackend(CaptureBackend):
+    name = 'replay'
+
+    def __init__(self, source, loop=False, origin=None):
+        self.source = source
+        self.frames, recorded_origin, self.timestamps = load_recording(source)
+        self.origin = tuple(origin) if origin is not None else recorded_origin
+        self.loop = loop
+        self.index = 0
+        self.started = None
+
+    def seek(self, index):
+        self.index = max(0, min(int(index), len(self.frames) - 1))
+        self.started = None
+
+    def current_frame(self):
+        return self.frames[self.index]
+
+    def next_frame(self):
+        if self.timestamps:
+            # Recorded timestamps are replayed against the clock, so a slow reader skips frames instead of slowing the game down.
+            now = get_clock().perf_counter()
+            first = self.timestamps[0]
+            if self.started is None:
+                self.started = now - (self.timestamps[self.index] - first)
+            elapsed = now - self.started
+            count = len(self.timestamps)
+            period = (self.timestamps[-1] - first) * count / (count - 1) if count > 1 else 0.0
+            if self.loop and period > 0:
+                elapsed %= period
+            self.index = max(0, bisect.bisect_right(self.timestamps, first + elapsed) - 1)
+            return self.frames[self.index]
+        frame = self.frames[self.index]
+        if self.index + 1 < len(self.frames):
+            self.index += 1
+        elif self.loop:
+            self.index = 0
+        return frame
+
+    def grab(self, bbox):
+        x1, y1, x2, y2 = bbox
+        return self.grab_into(bbox, np.empty((y2 - y1, x2 - x1, 3), dtype=np.uint8))
+
+    def grab_into(self, bbox, out):
+        frame = self.next_frame()
+        x1, y1, x2, y2 = bbox
+        ox, oy = self.origin
+        out.fill(0)
+        sx1, sy1 = max(x1 - ox, 0), max(y1 - oy, 0)
+        sx2, sy2 = min(x2 - ox, frame.shape[1]), min(y2 - oy, frame.shape[0])
+        if sx2 > sx1 and sy2 > sy1:
+            dx, dy = sx1 - (x1 - ox), sy1 - (y1 - oy)
+            out[dy:dy + sy2 - sy1, dx:dx + sx2 - sx1] = frame[sy1:sy2, sx1:sx2, :3]
+        return out
+
+
+class RecordingCaptureBackend(CaptureBackend):
+
+    def __init__(self, inner, record_bbox, max_frames=2000):
+        self.inner = inner
+        self.record_bbox = normalize_region(record_bbox)
+        self.max_frames = max_frames
+        self.name = f'recording:{inner.name}'
+        self.frames = []
+        self.timestamps = []
+
+    def grab(self, bbox):
+        rx1, ry1, rx2, ry2 = self.record_bbox
+        x1, y1, x2, y2 = bbox
+        if x1 < rx1 or y1 < ry1 or x2 > rx2 or y2 > ry2 or len(self.frames) >= self.max_frames:
+            return self.inner.grab(bbox)
+        pixels = np.array(self.inner.grab(self.record_bbox))
+        self.frames.append(pixels)
+        self.timestamps.append(get_clock().perf_counter())
+        return pixels[y1 - ry1:y2 - ry1, x1 - rx1:x2 - rx1]
+
+    def save(self, path):
+        np.savez_compressed(path, frames=np.stack(self.frames), origin=np.array(self.record_bbox[:2]), timestamps=np.array(self.timestamps))
+        return path
+
+    def clear(self):
+        self.frames = []
+        self.timestamps = []
+
+    def close(self):
+        self.inner.close()
+
+
+def create_capture_backend(name='auto', replay_path=None):
+    name = (name or 'auto').lower()
+    if name == 'replay':
+        if not replay_path:
+            raise ValueError('Replay capture backend requires a recording path')
+        return ReplayCaptureBackend(replay_path)
+    if name in ('auto', 'win32') and WIN32_CAPTURE_AVAILABLE:
+        try:
+            return Win32CaptureBackend()
+        except Exception as e:
+            print(f'Warning: could not initialise win32 capture backend, falling back to GDI: {e}')
+    elif name == 'win32':
+        print('Warning: win32 capture backend requires pywin32, falling back to GDI')
+    return GdiCaptureBackend()
+
+
+class FrameRing:
+
+    def __init__(self, slots=4, max_shapes=8):
+        self.slots = max(2, int(slots))
+        self.max_shapes = max(1, int(max_shapes))
+        self._pools = OrderedDict()
+
+    def acquire(self, shape):
+        shape = tuple(shape)
+        pool = self._pools.get(shape)
+        if pool is None:
+            if len(self._pools) >= self.max_shapes:
+                self._pools.popitem(last=False)
+            pool = [[np.empty(shape, dtype=np.uint8) for _ in range(self.slots)], 0]
+            self._pools[shape] = pool
+        else:
+            self._pools.move_to_end(shape)
+        buffers, index = pool
+        pool[1] = (index + 1) % self.slots
+        return buffers[index]
+
+
+class CapturedFrame:
+
+    def __init__(self, pixels, bbox, regions=None, timestamp=None):
+        self.pixels = pixels
+        self.bbox = bbox
+        self.left, self.top = bbox[0], bbox[1]
+        self.regions = dict(regions or {})
+        self.timestamp = get_clock().perf_counter() if timestamp is None else timestamp
+
+    def contains(self, coord):
+        x1, y1, x2, y2 = normalize_region(coord)
+        return x1 >= self.bbox[0] and y1 >= self.bbox[1] and x2 <= self.bbox[2] and y2 <= self.bbox[3]
+
+    def view(self, coord):
+        if isinstance(coord, str):
+            coord = self.regions[coord]
+        x1, y1, x2, y2 = normalize_region(coord)
+        return self.pixels[y1 - self.top:y2 - self.top, x1 - self.left:x2 - self.left]
+
+    def pixel(self, x, y):
+        r, g, b = self.pixels[int(y) - self.top, int(x) - self.left, :3]
+        return (int(r), int(g), int(b))
+
+
+class FrameCapture:
+
+    def __init__(self, backend=None, ring_slots=4):
+        self.backend = backend if backend is not None else GdiCaptureBackend()
+        self.ring = FrameRing(ring_slots)
+        self.grab_count = 0
+        self.last_frame = None
+
+    def set_backend(self, backend):
+        old_backend = self.backend
+        self.backend = backend
+        self.last_frame = None
+        if old_backend is not None and old_backend is not backend:
+            old_backend.close()
+
+    def grab_pixels(self, bbox):
+        return self.backend.grab(normalize_region(bbox))
+
+    def grab(self, regions):
+        if not isinstance(regions, dict):
+            regions = {index: region for index, region in enumerate(regions)}
+        bbox = union_region(regions.values())
+        if bbox is None:
+            return None
+        # Frames live in ring slots and are overwritten ring_slots grabs later,
+        # so callers must not hold on to views past that point.
+        pixels = self.ring.acquire((bbox[3] - bbox[1], bbox[2] - bbox[0], 3))
+        self.backend.grab_into(bbox, pixels)
+        self.grab_count += 1
+        self.last_frame = CapturedFrame(pixels, bbox, regions)
+        return self.last_frame
+
+    def close(self):
+        self.backend.close()
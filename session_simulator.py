@@ -0,0 +1,202 @@
+import contextlib
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from clock import SimulatedClock, set_clock
+from input_backend import RecordingInputBackend, set_input_backend
+from reel_simulator import DEFAULT_BAR_COLOR, ReelGame
+from screen_capture import CaptureBackend, normalize_region
+
+PANEL_COLOR = (225, 220, 205)
+FISH_DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fish-data.json')
+
+
+def paint(out, bbox, region, color):
+    x1, y1, x2, y2 = bbox
+    rx1, ry1, rx2, ry2 = normalize_region(region) if len(region) == 4 else (region[0], region[1], region[0] + 1, region[1] + 1)
+    ix1, iy1, ix2, iy2 = max(x1, rx1), max(y1, ry1), min(x2, rx2), min(y2, ry2)
+    if ix2 > ix1 and iy2 > iy1:
+        out[iy1 - y1:iy2 - y1, ix1 - x1:ix2 - x1] = color
+
+
+class FakeFishingGame(CaptureBackend):
+    name = 'fake-game'
+
+    def __init__(self, coordinates, clock, seed=0, bite_time=(1.5, 8.0), soft_lock_rate=0.02, physics=None, input_latency=0.03, capture_latency=0.004, noise=3, visible_when='in_zone', bar_color=DEFAULT_BAR_COLOR, fish_names=None, hit_radius=6):
+        self.coordinates = coordinates
+        self.clock = clock
+        self.rng = random.Random(seed)
+        self.bite_time = bite_time
+        self.soft_lock_rate = soft_lock_rate
+        self.physics = physics
+        self.input_latency = input_latency
+        self.capture_latency = capture_latency
+        self.noise = noise
+        self.visible_when = visible_when
+        self.bar_color = bar_color
+        self.fish_names = list(fish_names or [])
+        self.hit_radius = hit_radius
+        self.backend = None
+        self.state = 'idle'
+        self.bite_at = None
+        self.reel = None
+        self.reel_started = None
+        self.last_fish = None
+        self.stats = {'casts': 0, 'soft_locks': 0, 'bites': 0, 'won': 0, 'lost': 0, 'timeout': 0, 'closed': 0, 'reel_clicks': 0}
+
+    def attach(self, backend):
+        self.backend = backend
+        backend.add_listener(self.on_input)
+
+    def hit(self, coord_name):
+        x, y = self.coordinates[coord_name][:2]
+        px, py = self.backend.position
+        return abs(px - x) <= self.hit_radius and abs(py - y) <= self.hit_radius
+
+    def cast(self, now):
+        self.stats['casts'] += 1
+        if self.rng.random() < self.soft_lock_rate:
+            # A soft lock never bites; only the failsafe recast gets the rod back.
+            self.stats['soft_locks'] += 1
+            self.state = 'stuck'
+            return
+        self.state = 'waiting'
+        self.bite_at = now + self.rng.uniform(*self.bite_time)
+
+    def on_input(self, entry):
+        if entry.action != 'mouse_click':
+            return
+        now = self.clock.perf_counter()
+        self.update(now)
+        if self.state == 'reeling':
+            self.stats['reel_clicks'] += 1
+            self.reel.click(now - self.reel_started + self.input_latency)
+        elif self.state in ('idle', 'waiting', 'stuck') and self.hit('fish_button'):
+            self.cast(now)
+        elif self.state == 'caught' and self.hit('close_button'):
+            self.stats['closed'] += 1
+            self.state = 'idle'
+
+    def update(self, now):
+        if self.state == 'waiting' and now >= self.bite_at:
+            self.stats['bites'] += 1
+            self.state = 'reeling'
+            self.reel_started = self.bite_at
+            self.reel = ReelGame(self.coordinates['reel_bar'], self.physics, self.rng.randrange(1 << 30), bar_color=self.bar_color, noise=self.noise, visible_when=self.visible_when)
+        if self.state == 'reeling':
+            self.reel.advance(now - self.reel_started)
+            if self.reel.finished:
+                self.stats[self.reel.result] += 1
+                if self.reel.result == 'won':
+                    self.state = 'caught'
+                    self.last_fish = self.rng.choice(self.fish_names) if self.fish_names else 'Unknown Fish'
+                else:
+                    self.state = 'idle'
+
+    def grab(self, bbox):
+        self.update(self.clock.perf_counter())
+        x1, y1, x2, y2 = bbox
+        if self.state == 'reeling':
+            out = self.reel.render(bbox)
+            paint(out, bbox, self.coordinates['white_diamond'], 255)
+        else:
+            out = np.zeros((y2 - y1, x2 - x1, 3), dtype=np.uint8)
+            if self.state == 'caught':
+                paint(out, bbox, self.coordinates['fish_caught_desc'], PANEL_COLOR)
+                paint(out, bbox, self.coordinates['completed_border'], 255)
+        if self.capture_latency:
+            self.clock.advance(self.capture_latency)
+        return out
+
+
+class PhaseTimer:
+
+    def __init__(self, backend, now):
+        self.backend = backend
+        self.last = now
+        self.phase = None
+        self.totals = {}
+        self.entries = {}
+
+    def update(self, now):
+        # Time that passes while a phase is set is spent in that phase, so the current phase gets it.
+        phase = self.backend.phase
+        self.totals[phase] = self.totals.get(phase, 0.0) + now - self.last
+        self.last = now
+        if phase != self.phase:
+            self.entries[phase] = self.entries.get(phase, 0) + 1
+            self.phase = phase
+
+
+def run_session(hours=1.0, seed=0, settings=None, game_options=None, config_file=None, verbose=False):
+    from main import MouseAutomation
+    clock = set_clock(SimulatedClock())
+    workdir = tempfile.mkdtemp(prefix='fishscope-session-')
+    try:
+        path = os.path.join(workdir, 'fishscopeconfig.json')
+        if config_file:
+            shutil.copy(config_file, path)
+        output = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(open(os.devnull, 'w'))
+        with output:
+            automation = MouseAutomation(config_file=path, offline=True)
+            if not automation.fish_data:
+                with open(FISH_DATA_PATH, 'r', encoding='utf-8') as f:
+                    automation.fish_data = json.load(f)
+            for key, value in (settings or {}).items():
+                if key == 'reel_controller':
+                    automation.set_reel_controller(value)
+                else:
+                    setattr(automation, key, value)
+            # The session runs on this thread against simulated time: no reconnects, webhooks or worker threads.
+            automation.async_input = False
+            automation.async_catch_processing = False
+            automation.failsafe_reconnect_enabled = False
+            automation.auto_reconnect_enabled = False
+            automation.webhook_url = ''
+            recorder = set_input_backend(RecordingInputBackend(clock=clock.perf_counter, max_actions=1000))
+            game = FakeFishingGame(automation.coordinates, clock, seed, fish_names=list(automation.fish_data), **(game_options or {}))
+            game.attach(recorder)
+            automation.frame_capture.set_backend(game)
+            automation.extract_fish_name = lambda image=None: (game.last_fish or 'Unknown Fish', None)
+            failsafes = [0]
+            execute_failsafe = automation.execute_failsafe
+
+            def counted_failsafe(counted=True):
+                failsafes[0] += 1
+                return execute_failsafe(counted)
+            automation.execute_failsafe = counted_failsafe
+            timer = PhaseTimer(recorder, clock.perf_counter())
+            end = hours * 3600.0
+
+            def on_advance(now):
+                timer.update(now)
+                if now >= end and automation.toggle:
+                    automation.toggle = False
+                    automation.emergency_stop_event.set()
+            clock.add_listener(on_advance)
+            automation.toggle = automation.running = True
+            automation.emergency_stop_event.clear()
+            started = time.perf_counter()
+            automation.mouse_automation_loop()
+            wall = time.perf_counter() - started
+            automation.running = False
+            automation.input_dispatcher.stop()
+    finally:
+        set_clock(None)
+        set_input_backend(None)
+        shutil.rmtree(workdir, ignore_errors=True)
+    elapsed = max(clock.perf_counter(), 1e-9)
+    stages = {}
+    for phase, seconds in timer.totals.items():
+        stage = (phase or 'idle').split(':')[0]
+        stages[stage] = stages.get(stage, 0.0) + seconds
+    sell_time = sum(stages.get(stage, 0.0) for stage in ('pre_sell', 'selling', 'post_sell'))
+    sells = timer.entries.get('selling', 0)
+    stats = dict(game.stats)
+    return {'hours': elapsed / 3600.0, 'wall_seconds': wall, 'stats': stats, 'failsafes': failsafes[0], 'sells': sells, 'fish_per_hour': stats['won'] / (elapsed / 3600.0), 'failsafe_rate': failsafes[0] / max(stats['casts'], 1), 'sell_overhead': sell_time / elapsed, 'seconds_per_sell': sell_time / sells if sells else 0.0, 'stage_share': {stage: seconds / elapsed for stage, seconds in stages.items()}, 'phase_share': {phase or 'idle': seconds / elapsed for phase, seconds in timer.totals.items()}}
@@ -0,0 +1,129 @@
+import threading
+from collections import deque
+
+from clock import get_clock
+
+
+class StatsBucket:
+
+    def __init__(self, start):
+        self.start = start
+        self.cycles = 0
+        self.fish = 0
+        self.failsafes = 0
+        self.cycle_time = 0.0
+        self.rarities = {}
+        self.rarity_count = 0
+        self.bins = {}
+
+
+class SessionStats:
+
+    def __init__(self, window=3600.0, bucket_seconds=60.0, bin_width=0.25, clock=None):
+        self.window = float(window)
+        self.bucket_seconds = float(bucket_seconds)
+        self.bin_width = float(bin_width)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.reset()
+
+    def clock(self):
+        return self._clock() if self._clock is not None else get_clock().perf_counter()
+
+    def reset(self, now=None):
+        now = self.clock() if now is None else now
+        with self._lock:
+            self.started = now
+            self.buckets = deque()
+            self.totals = StatsBucket(now)
+            self.lifetime_fish = 0
+            self.lifetime_cycles = 0
+            self.lifetime_failsafes = 0
+
+    def _expire(self, now):
+        # Whole buckets leave the window and are subtracted from the running totals, so no event is ever rescanned.
+        totals = self.totals
+        while self.buckets and self.buckets[0].start + self.bucket_seconds <= now - self.window:
+            old = self.buckets.popleft()
+            totals.cycles -= old.cycles
+            totals.fish -= old.fish
+            totals.failsafes -= old.failsafes
+            totals.cycle_time -= old.cycle_time
+            totals.rarity_count -= old.rarity_count
+            for key, count in old.rarities.items():
+                totals.rarities[key] -= count
+                if not totals.rarities[key]:
+                    del totals.rarities[key]
+            for key, count in old.bins.items():
+                totals.bins[key] -= count
+                if not totals.bins[key]:
+                    del totals.bins[key]
+
+    def _bucket(self, now):
+        self._expire(now)
+        if not self.buckets or now >= self.buckets[-1].start + self.bucket_seconds:
+            start = self.started + (now - self.started) // self.bucket_seconds * self.bucket_seconds
+            self.buckets.append(StatsBucket(start))
+        return self.buckets[-1]
+
+    def record_cycle(self, duration, caught=True, rarity=None, now=None):
+        now = self.clock() if now is None else now
+        index = int(duration / self.bin_width)
+        with self._lock:
+            bucket = self._bucket(now)
+            for target in (bucket, self.totals):
+                target.cycles += 1
+                target.cycle_time += duration
+                target.bins[index] = target.bins.get(index, 0) + 1
+                if caught:
+                    target.fish += 1
+            self.lifetime_cycles += 1
+            if caught:
+                self.lifetime_fish += 1
+        if caught and rarity is not None:
+            self.record_rarity(rarity, now)
+
+    def record_rarity(self, rarity, now=None):
+        # Rarity usually arrives after the cycle, once the catch processor has read the fish name.
+        now = self.clock() if now is None else now
+        key = rarity or 'Unknown'
+        with self._lock:
+            for target in (self._bucket(now), self.totals):
+                target.rarities[key] = target.rarities.get(key, 0) + 1
+                target.rarity_count += 1
+
+    def record_failsafe(self, now=None):
+        now = self.clock() if now is None else now
+        with self._lock:
+            self._bucket(now).failsafes += 1
+            self.totals.failsafes += 1
+            self.lifetime_failsafes += 1
+
+    def cycle_time_percentile(self, fraction):
+        bins = self.totals.bins
+        count = sum(bins.values())
+        if not count:
+            return 0.0
+        rank = fraction * (count - 1)
+        seen = 0
+        for index in sorted(bins):
+            seen += bins[index]
+            if seen > rank:
+                return (index + 1) * self.bin_width
+        return (max(bins) + 1) * self.bin_width
+
+    def snapshot(self, now=None):
+        now = self.clock() if now is None else now
+        with self._lock:
+            self._expire(now)
+            return self._snapshot(now)
+
+    def _snapshot(self, now):
+        totals = self.totals
+        span = max(min(self.window, now - self.started), 1e-9)
+        casts = totals.cycles + totals.failsafes
+        return {'window_seconds': span, 'cycles': totals.cycles, 'fish': totals.fish, 'failsafes': totals.failsafes, 'fish_per_hour': totals.fish * 3600.0 / span, 'mean_cycle': totals.cycle_time / totals.cycles if totals.cycles else 0.0, 'p95_cycle': self.cycle_time_percentile(0.95), 'catch_rate': totals.fish / totals.cycles if totals.cycles else 0.0, 'failsafe_rate': totals.failsafes / casts if casts else 0.0, 'rarities': {key: count / totals.rarity_count for key, count in totals.rarities.items()} if totals.rarity_count else {}, 'lifetime_fish': self.lifetime_fish, 'lifetime_cycles': self.lifetime_cycles, 'lifetime_failsafes': self.lifetime_failsafes, 'runtime': now - self.started}
+
+    def summary_line(self, now=None):
+        s = self.snapshot(now)
+        return f"{s['fish_per_hour']:.1f} fish/h over {s['window_seconds'] / 60:.0f} min | cycle mean {s['mean_cycle']:.2f}s p95 {s['p95_cycle']:.2f}s | catch rate {s['catch_rate'] * 100:.0f}% | failsafe rate {s['failsafe_rate'] * 100:.1f}%"
@@ -0,0 +1,216 @@
+import math
+from collections import deque
+
+from clock import get_clock
+
+WAIT_MET = 'met'
+WAIT_TIMEOUT = 'timeout'
+WAIT_CANCELLED = 'cancelled'
+
+
+class WaitResult:
+
+    def __init__(self, status, value=None, elapsed=0.0, polls=0, reason=None):
+        self.status = status
+        self.value = value
+        self.elapsed = elapsed
+        self.polls = polls
+        self.reason = reason
+
+    @property
+    def met(self):
+        return self.status == WAIT_MET
+
+    @property
+    def timed_out(self):
+        return self.status == WAIT_TIMEOUT
+
+    @property
+    def cancelled(self):
+        return self.status == WAIT_CANCELLED
+
+    def __bool__(self):
+        return self.met
+
+    def __repr__(self):
+        return f'WaitResult({self.status!r}, elapsed={self.elapsed:.3f}, polls={self.polls}, reason={self.reason!r})'
+
+
+class FixedPollPolicy:
+
+    def __init__(self, interval=0.05):
+        self.poll_interval = interval
+
+    def interval(self, elapsed):
+        return self.poll_interval
+
+    def observe(self, elapsed):
+        pass
+
+
+class AdaptivePollPolicy:
+
+    def __init__(self, fast_interval=0.01, fast_period=0.5, slow_interval=0.1, backoff_period=3.0, near_interval=0.01, near_margin=0.5, history_size=20, min_history=3):
+        self.fast_interval = fast_interval
+        self.fast_period = fast_period
+        self.slow_interval = slow_interval
+        self.backoff_period = max(backoff_period, 1e-06)
+        self.near_interval = near_interval
+        self.near_margin = near_margin
+        self.min_history = max(1, int(min_history))
+        self.history = deque(maxlen=max(self.min_history, int(history_size)))
+
+    def observe(self, elapsed):
+        if elapsed is not None and elapsed >= 0:
+            self.history.append(float(elapsed))
+
+    def expected_range(self):
+        if len(self.history) < self.min_history:
+            return None
+        ordered = sorted(self.history)
+        low = ordered[int(0.1 * (len(ordered) - 1))]
+        high = ordered[int(round(0.9 * (len(ordered) - 1)))]
+        return (low - self.near_margin, high + self.near_margin)
+
+    def interval(self, elapsed):
+        if elapsed < self.fast_period:
+            return self.fast_interval
+        expected = self.expected_range()
+        if expected is not None and expected[0] <= elapsed <= expected[1]:
+            return self.near_interval
+        progress = min((elapsed - self.fast_period) / self.backoff_period, 1.0)
+        return self.fast_interval + (self.slow_interval - self.fast_interval) * progress
+
+
+class BiteTimeModel:
+
+    def __init__(self, bin_width=0.1, max_time=60.0, window=200, min_samples=10, dense_interval=0.02, sparse_interval=0.25, tail_interval=0.05, low_quantile=0.05, high_quantile=0.95, deadline_quantile=0.99, deadline_margin=3.0, min_deadline=8.0, fallback=None):
+        self.bin_width = bin_width
+        self.counts = [0] * (int(math.ceil(max_time / bin_width)) + 1)
+        self.samples = deque(maxlen=max(int(min_samples), int(window)))
+        self.min_samples = max(1, int(min_samples))
+        self.dense_interval = dense_interval
+        self.sparse_interval = sparse_interval
+        self.tail_interval = tail_interval
+        self.low_quantile = low_quantile
+        self.high_quantile = high_quantile
+        self.deadline_quantile = deadline_quantile
+        self.deadline_margin = deadline_margin
+        self.min_deadline = min_deadline
+        self.fallback = fallback if fallback is not None else AdaptivePollPolicy()
+        self.backoff = 0
+        self._window = None
+
+    def _bin(self, elapsed):
+        return min(int(elapsed / self.bin_width), len(self.counts) - 1)
+
+    @property
+    def ready(self):
+        return len(self.samples) >= self.min_samples
+
+    def observe(self, elapsed):
+        if elapsed is None or elapsed < 0:
+            return
+        if len(self.samples) == self.samples.maxlen:
+            self.counts[self._bin(self.samples[0])] -= 1
+        self.samples.append(float(elapsed))
+        self.counts[self._bin(elapsed)] += 1
+        self._window = None
+        self.backoff = 0
+        self.fallback.observe(elapsed)
+
+    def timed_out(self):
+        # A wait that hit the learned deadline never reaches observe, so without this the deadline could only shrink.
+        self.backoff = min(self.backoff + 1, 8)
+
+    def quantile(self, q):
+        if not self.samples:
+            return None
+        target = q * len(self.samples)
+        total = 0
+        for index, count in enumerate(self.counts):
+            total += count
+            if count and total >= target:
+                return index * self.bin_width
+        return (len(self.counts) - 1) * self.bin_width
+
+    def window(self):
+        if self._window is None:
+            self._window = (self.quantile(self.low_quantile), self.quantile(self.high_quantile) + self.bin_width)
+        return self._window
+
+    def interval(self, elapsed):
+        if not self.ready:
+            return self.fallback.interval(elapsed)
+        start, end = self.window()
+        if elapsed < start:
+            # Land the next poll on the start of the likely bite window rather than overshooting it.
+            return max(self.dense_interval, min(self.sparse_interval, start - elapsed))
+        if elapsed <= end:
+            return self.dense_interval
+        return self.tail_interval
+
+    def deadline(self, limit):
+        if not self.ready:
+            return limit
+        learned = self.quantile(self.deadline_quantile) + self.bin_width + self.deadline_margin
+        return min(limit, max(self.min_deadline, learned) * 2 ** self.backoff)
+
+    def summary(self):
+        if not self.samples:
+            return None
+        return {'samples': len(self.samples), 'p50': self.quantile(0.5), 'p95': self.quantile(0.95), 'p99': self.quantile(0.99)}
+
+
+def _cancel_sources(cancel_event):
+    if cancel_event is None:
+        return ()
+    if isinstance(cancel_event, (list, tuple)):
+        return tuple(source for source in cancel_event if source is not None)
+    return (cancel_event,)
+
+
+def _cancel_reason(sources):
+    for source in sources:
+        if hasattr(source, 'is_set'):
+            if source.is_set():
+                return WAIT_CANCELLED
+        else:
+            reason = source()
+            if reason:
+                return reason
+    return None
+
+
+def _sleep(sources, delay):
+    if delay <= 0:
+        return
+    clock = get_clock()
+    for source in sources:
+        if hasattr(source, 'wait'):
+            clock.wait(source, delay)
+            return
+    clock.sleep(delay)
+
+
+def wait_for_condition(predicate, deadline=None, poll_policy=None, cancel_event=None, clock=None):
+    clock = clock if clock is not None else get_clock().perf_counter
+    policy = poll_policy if poll_policy is not None else FixedPollPolicy()
+    sources = _cancel_sources(cancel_event)
+    start = clock()
+    polls = 0
+    while True:
+        reason = _cancel_reason(sources)
+        if reason:
+            return WaitResult(WAIT_CANCELLED, elapsed=clock() - start, polls=polls, reason=reason)
+        value = predicate()
+        polls += 1
+        now = clock()
+        if value:
+            return WaitResult(WAIT_MET, value, now - start, polls)
+        if deadline is not None and now >= deadline:
+            return WaitResult(WAIT_TIMEOUT, elapsed=now - start, polls=polls)
+        delay = policy.interval(now - start)
+        if deadline is not None:
+            delay = min(delay, deadline - now)
+        _sleep(sources, delay)